@@ -1,14 +1,21 @@
+import hashlib
 import json
 import os
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
 from agno.memory import MemoryManager
-from agno.models.ollama import Ollama
 from utils import get_config
 from utils.agent_config_loader import get_agent_config
+from utils.agent_runner import AgentRunner
+from utils.java_chunker import estimate_tokens, split_java_class
+from utils.json_extractor import extract_json
+from utils.priming_snapshot import prime_identity
+from utils.resource_registry import create_model, get_sqlite_db
 from utils.code_analysis_visualizer import CodeAnalysisVisualizer
+from utils.package_mapper import PackageMapper
+from utils.source_index import get_source_index
+from utils.telemetry import get_telemetry
 
 class CodeAnalyzerAgent:
     
@@ -17,10 +24,12 @@ class CodeAnalyzerAgent:
         config = get_config()
         model_name = config.get_model_name()
         db_file = db_file or config.get_database_file()
+        self.db_file = db_file
         self.agent_config = get_agent_config('code_analyzer')
         self.analysis_results = {}
         self.visualizer = CodeAnalysisVisualizer()
         self.agent = self._create_agent(model_name, db_file, config)
+        self.runner = AgentRunner(self.agent, self.agent_config)
         self.analysis_results = {}
         
         if prime_identity:
@@ -28,12 +37,8 @@ class CodeAnalyzerAgent:
 
     def _create_agent(self, model_name: str, db_file: str, config) -> Agent:
         basic_config = self.agent_config.get_basic_config()
-        db = SqliteDb(db_file=db_file)
-        model = Ollama(
-            id=model_name,
-            api_key=config.get_model_api_key(),
-            options={"temperature": config.get_model_temperature()}
-        )
+        db = get_sqlite_db(db_file)
+        model = create_model(model_name)
         return Agent(
             name=basic_config['name'],
             tools=[self.get_project_structure],
@@ -48,77 +53,249 @@ class CodeAnalyzerAgent:
         )
 
     def _prime_identity(self):
-        agent_name = self.agent_config.get_basic_config()['name']
-        try:
-            priming_config = self.agent_config.get_identity_priming_config()
-            
-            if not priming_config.get('enabled', True):
-                return True
-            
-            layers = priming_config.get('layers', [])
-
-            for i, layer in enumerate(layers, 1):
-                message = layer.get('message', '')
-                if message:
-                    response = self.agent.run(message)
-
-            print(f"✅ {agent_name} identity successfully established!")
-            return True
-                
-        except Exception as e:
-            print(f"❌ {agent_name if 'agent_name' in locals() else 'Agent'} priming failed: {e}")
-            return False
+        return prime_identity(self.agent, self.agent_config, self.db_file)
     
     def analyze_project_structure(self, source_path: str) -> Dict[str, Any]:
-        prompt = self._get_externalized_prompt(
-            'analyze_project_structure', src=source_path
-        )
+        self._map_project_structure(source_path)
+        max_retries = get_config().get_analysis_max_retries()
 
-        while True:
+        for attempt in range(1, max_retries + 1):
+            prompt = self._project_structure_prompt(source_path)
+            if prompt is None:
+                break
+            if attempt > 1:
+                get_telemetry().record_retry()
             try:
-                response = self.agent.run(prompt)
-                self.analysis_results['project_structure'] = json.loads(response.content)
-                if len(self.analysis_results['project_structure']['files']) <= 0:
-                    continue
+                # Retries bypass the cache so a bad cached answer is not replayed
+                response = self.runner.run(prompt, use_cache=attempt == 1, expect_json=True)
+                if self._store_project_structure(response.content):
+                    break
+            except Exception as e:
+                print(f"   ⚠️ Project structure attempt {attempt}/{max_retries} failed: {e}")
+
+        return self._project_structure_result(source_path)
+
+    async def aanalyze_project_structure(self, source_path: str) -> Dict[str, Any]:
+        self._map_project_structure(source_path)
+        max_retries = get_config().get_analysis_max_retries()
+
+        for attempt in range(1, max_retries + 1):
+            prompt = self._project_structure_prompt(source_path)
+            if prompt is None:
                 break
-            except:
-                continue
-        
+            if attempt > 1:
+                get_telemetry().record_retry()
+            try:
+                response = await self.runner.arun(prompt, use_cache=attempt == 1, expect_json=True)
+                if self._store_project_structure(response.content):
+                    break
+            except Exception as e:
+                print(f"   ⚠️ Project structure attempt {attempt}/{max_retries} failed: {e}")
+
+        return self._project_structure_result(source_path)
+
+    def _map_project_structure(self, source_path: str):
+        """Place files with the local rules, leaving the rest for the model"""
+        config = get_config()
+        self.analysis_results['project_structure'] = {"files": {}}
+        self.analysis_results['unmapped_files'] = []
+        self.analysis_results['skipped_files'] = []
+
+        index = get_source_index(source_path)
+        self.analysis_results['source_index'] = index.summary()
+        if not config.use_local_package_mapper():
+            return
+
+        mapping = PackageMapper(source_path, config.get_base_package(), index=index).map()
+        self.analysis_results['project_structure']['files'] = mapping.files
+        self.analysis_results['mapping_rules'] = mapping.rules
+        self.analysis_results['unmapped_files'] = mapping.unmapped
+        self.analysis_results['skipped_files'] = mapping.skipped
+        print(f"   🧭 {len(mapping.files)} files placed by local rules, {len(mapping.unmapped)} left for the model, "
+              f"{len(mapping.skipped)} skipped")
+
+    def _project_structure_prompt(self, source_path: str) -> Optional[str]:
+        """Prompt for the files still to be placed (None if nothing is left)"""
+        files = self.analysis_results['project_structure']['files']
+        if not get_config().use_local_package_mapper():
+            if files:
+                return None
+            return self._get_externalized_prompt(
+                'analyze_project_structure', src=source_path
+            )
+
+        unmapped = self.analysis_results['unmapped_files']
+        if not unmapped:
+            return None
+
+        packages = sorted({info['package_suggestion'] for info in files.values()})
+        return self._get_externalized_prompt(
+            'analyze_unmapped_files',
+            src=source_path,
+            packages="\n".join(f"- {package or '<project root>'}" for package in packages),
+            files="\n".join(f"- {file_path}" for file_path in unmapped)
+        )
+
+    def _store_project_structure(self, content: str) -> bool:
+        """Merge model suggestions, returning True once every file is placed"""
+        suggested = extract_json(content)['files']
+        files = self.analysis_results['project_structure']['files']
+        unmapped = self.analysis_results['unmapped_files']
+
+        if not get_config().use_local_package_mapper():
+            files.update(suggested)
+            return len(files) > 0
+
+        # Only accept answers for the files the rules could not place
+        pending = {os.path.normpath(file_path): file_path for file_path in unmapped}
+        for file_path, file_info in suggested.items():
+            original = pending.pop(os.path.normpath(file_path), None)
+            if original is not None:
+                files[original] = file_info
+        self.analysis_results['unmapped_files'] = list(pending.values())
+        return not pending
+
+    def _project_structure_result(self, source_path: str) -> Dict[str, Any]:
+        # The local mapper and cached responses skip the get_project_structure tool call
+        if self.structure is None:
+            self.structure = self._scan_directory(source_path)
+
+        unmapped = self.analysis_results['unmapped_files']
+        if unmapped:
+            print(f"   ⚠️ {len(unmapped)} files could not be placed and will not be migrated: {unmapped}")
+
         return {
             "structure": self.structure,
             "files": self.analysis_results['project_structure']['files']
         }
 
     def analyze_java_class(self, file_path: str, code_content: str) -> Dict[str, Any]:
+        chunk_prompts = self._chunk_analysis_prompts(file_path, code_content)
+        if chunk_prompts:
+            # Map: analyze the chunks concurrently; reduce: merge them into one analysis
+            responses = self.runner.run_many(
+                chunk_prompts, get_config().get_chunking_max_parallel(),
+                self._chunk_session_prefix(file_path), expect_json=True
+            )
+            response = self.runner.run(self._merge_analyses_prompt(file_path, responses), expect_json=True)
+            return {
+                "file_path": file_path,
+                "analysis": response.content,
+                "chunks": len(chunk_prompts)
+            }
+
         prompt = self._get_externalized_prompt(
             'analyze_java_class',
             file_path=file_path,
             code_content=code_content
         )
         
-        response = self.agent.run(prompt)
+        response = self.runner.run(prompt)
         
         return {
             "file_path": file_path,
             "analysis": response.content
         }
+
+    async def aanalyze_java_class(self, file_path: str, code_content: str) -> Dict[str, Any]:
+        chunk_prompts = self._chunk_analysis_prompts(file_path, code_content)
+        if chunk_prompts:
+            responses = await self.runner.arun_many(
+                chunk_prompts, get_config().get_chunking_max_parallel(),
+                self._chunk_session_prefix(file_path), expect_json=True
+            )
+            response = await self.runner.arun(self._merge_analyses_prompt(file_path, responses), expect_json=True)
+            return {
+                "file_path": file_path,
+                "analysis": response.content,
+                "chunks": len(chunk_prompts)
+            }
+
+        prompt = self._get_externalized_prompt(
+            'analyze_java_class',
+            file_path=file_path,
+            code_content=code_content
+        )
+
+        response = await self.runner.arun(prompt)
+
+        return {
+            "file_path": file_path,
+            "analysis": response.content
+        }
+
+    def _chunk_analysis_prompts(self, file_path: str, code_content: str) -> List[str]:
+        """One prompt per chunk of a class too large for a single prompt (empty otherwise)"""
+        config = get_config()
+        if estimate_tokens(code_content) <= config.get_chunking_file_threshold():
+            return []
+        chunked = split_java_class(code_content, config.get_chunking_max_chunk_tokens())
+        if chunked is None or not chunked.chunks:
+            return []
+
+        print(f"   ✂️ {file_path}: analyzing {len(chunked.chunks)} chunk(s)")
+        return [
+            self._get_externalized_prompt(
+                'analyze_java_class_chunk',
+                file_path=file_path,
+                header=chunked.header,
+                kind=chunk.kind,
+                start_line=chunk.start_line,
+                end_line=chunk.end_line,
+                code_content=chunk.text
+            )
+            for chunk in chunked.chunks
+        ]
+
+    def _merge_analyses_prompt(self, file_path: str, responses: List[Any]) -> str:
+        analyses = []
+        for response in responses:
+            try:
+                analyses.append(extract_json(response.content))
+            except ValueError:
+                analyses.append({"raw_analysis": response.content})
+        return self._get_externalized_prompt(
+            'merge_java_class_analyses',
+            file_path=file_path,
+            analyses=json.dumps(analyses, indent=2)
+        )
+
+    @staticmethod
+    def _chunk_session_prefix(file_path: str) -> str:
+        return "analysis-chunk-" + hashlib.sha1(file_path.encode("utf-8")).hexdigest()[:16]
     
     def analyze_dependencies(self, source_path: str) -> Dict[str, Any]:
         dependencies = self._extract_dependencies(source_path)
         response = None
-        if dependencies:
+        if dependencies['imports'] or dependencies['static_imports']:
             prompt = self._get_externalized_prompt(
                 'analyze_dependencies',
                 dependencies=json.dumps(dependencies, indent=2)
             )
 
-            response = self.agent.run(prompt)
+            response = self.runner.run(prompt)
         
         return {
             "dependencies": dependencies,
             "analysis": response.content if response else None
         }
 
+    async def aanalyze_dependencies(self, source_path: str) -> Dict[str, Any]:
+        dependencies = self._extract_dependencies(source_path)
+        response = None
+        if dependencies['imports'] or dependencies['static_imports']:
+            prompt = self._get_externalized_prompt(
+                'analyze_dependencies',
+                dependencies=json.dumps(dependencies, indent=2)
+            )
+
+            response = await self.runner.arun(prompt)
+
+        return {
+            "dependencies": dependencies,
+            "analysis": response.content if response else None
+        }
+
     @staticmethod
     def _scan_directory(path: str) -> Dict[str, Any]:
         result = {
@@ -149,32 +326,23 @@ class CodeAnalyzerAgent:
         
         return result
 
-    @staticmethod
-    def _extract_dependencies(path: str) -> dict[str, set[Any] | list[Any]] | None:
+    def _extract_dependencies(self, path: str) -> Dict[str, Any]:
+        """Collect project imports from the on-disk source index"""
         dependencies = {
-            "imports": set(),
+            "imports": [],
+            "static_imports": [],
             "build_dependencies": []
         }
 
         if not os.path.exists(path):
             return dependencies
 
-        for root, _, files in os.walk(path):
-            for file in files:
-                if file.endswith('.java'):
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            for line in f:
-                                line = line.strip()
-                                if line.startswith('import '):
-                                    import_stmt = line[7:].rstrip(';').strip()
-                                    dependencies['imports'].add(import_stmt)
-                    except:
-                        pass
-
-        dependencies['imports'] = sorted(list(dependencies['imports']))
-        return None
+        index = get_source_index(path)
+        dependencies['imports'] = index.imports()
+        dependencies['static_imports'] = index.static_imports()
+        self.analysis_results['source_index'] = index.summary()
+        self.analysis_results['dependencies'] = dependencies
+        return dependencies
 
     def generate_enhanced_analysis_report(self, include_visualizations: bool = True) -> str:
         """Generate an enhanced analysis report with visual elements"""
@@ -227,6 +395,11 @@ class CodeAnalyzerAgent:
             enhanced_report.append("**Other Files**: 0")
             enhanced_report.append("")
         
+        # Add source index overview
+        if 'source_index' in self.analysis_results:
+            enhanced_report.append(self.visualizer.generate_source_index_summary(self.analysis_results['source_index']))
+            enhanced_report.append("")
+
         # Add dependencies analysis with visualization
         enhanced_report.append("## Dependencies Analysis")
         enhanced_report.append("")
@@ -336,9 +509,22 @@ class CodeAnalyzerAgent:
             analysis_results=json.dumps(self.analysis_results, indent=2)
         )
 
-        response = self.agent.run(prompt)
+        response = self.runner.run(prompt)
+        return response.content
+
+    async def agenerate_analysis_report(self) -> str:
+        prompt = self._get_externalized_prompt(
+            'generate_analysis_report',
+            analysis_results=json.dumps(self.analysis_results, indent=2)
+        )
+
+        response = await self.runner.arun(prompt)
         return response.content
 
     def run_chat(self, message: str) -> str:
-        response = self.agent.run(message)
+        response = self.runner.run(message, use_cache=False)
+        return response.content
+
+    async def arun_chat(self, message: str) -> str:
+        response = await self.runner.arun(message, use_cache=False)
         return response.content
\ No newline at end of file
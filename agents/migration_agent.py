@@ -1,13 +1,21 @@
-import json
-from typing import Dict, Any, Optional
+import hashlib
+import os
+from typing import Dict, Any, List, Optional, Tuple
 
 from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
-from agno.models.ollama import Ollama
-from agno.tools.file import FileTools
 
 from utils import get_config
 from utils.agent_config_loader import get_agent_config
+from utils.agent_runner import AgentRunner
+from utils.file_batcher import SKIPPED_MARKER, fence_language, render_file_section, split_batch_response
+from utils.java_chunker import CHARS_PER_TOKEN, extract_code_block, reassemble_java_class, split_java_class
+from utils.java_rewriter import LocalRewrite, RewriteEngine
+from utils.json_extractor import extract_json
+from utils.migration_manifest import expected_output_path
+from utils.model_router import ModelRouter, ModelTier
+from utils.output_writer import StagedFileTools, get_output_writer
+from utils.priming_snapshot import prime_identity
+from utils.resource_registry import create_model, get_sqlite_db
 
 
 class MigrationAgent:
@@ -20,25 +28,28 @@ class MigrationAgent:
         config = get_config()
         model_name = config.get_model_name()
         db_file = db_file or config.get_database_file()
+        self.db_file = db_file
         self.agent_config = get_agent_config('migration_specialist')
+        self.output_writer = get_output_writer()
         self.agent = self._create_agent(model_name, db_file, config)
+        self.runner = AgentRunner(self.agent, self.agent_config)
+        self.router = ModelRouter(self._create_tier_runner) if config.is_routing_enabled() else None
+        self.rewriter = RewriteEngine(self.agent_config.get_local_rewrites_config())
+        self.inline_sources = self.agent_config.get_inline_sources_config().get('enabled', False)
         self.migration_results = {}
+        self.primed = prime_identity
         
         if prime_identity:
             self._prime_identity()
         
-    def _create_agent(self, model_name: str, db_file: str, config) -> Agent:
+    def _create_agent(self, model_name: str, db_file: str, config, host: Optional[str] = None) -> Agent:
         basic_config = self.agent_config.get_basic_config()
         return Agent(
             name=basic_config['name'],
             description=basic_config['description'],
-            tools=[FileTools()],
-            model=Ollama(
-                id=model_name,
-                api_key=config.get_model_api_key(),
-                options={"temperature": config.get_model_temperature()}
-            ),
-            db=SqliteDb(db_file=db_file),
+            tools=[StagedFileTools(self.output_writer)],
+            model=create_model(model_name, host or None),
+            db=get_sqlite_db(db_file),
             role=basic_config['role'],
             system_message="\n".join(self.agent_config.get_system_message()),
             instructions=self.agent_config.get_identity_instructions(),
@@ -47,26 +58,26 @@ class MigrationAgent:
             markdown=basic_config['markdown']
         )
     def _prime_identity(self):
-        agent_name = self.agent_config.get_basic_config()['name']
-        try:
-            priming_config = self.agent_config.get_identity_priming_config()
-            
-            if not priming_config.get('enabled', True):
-                return True
-            
-            layers = priming_config.get('layers', [])
-
-            for i, layer in enumerate(layers, 1):
-                message = layer.get('message', '')
-                if message:
-                    response = self.agent.run(message)
-
-            print(f"✅ {agent_name} identity successfully established!")
-            return True
-                
-        except Exception as e:
-            print(f"❌ {agent_name if 'agent_name' in locals() else 'Agent'} priming failed: {e}")
-            return False
+        return prime_identity(self.agent, self.agent_config, self.db_file)
+
+    def _create_tier_runner(self, tier: ModelTier) -> AgentRunner:
+        """Agent of a routing tier, primed like the main one"""
+        agent = self._create_agent(tier.model, self.db_file, get_config(), tier.host)
+        if self.primed:
+            prime_identity(agent, self.agent_config, self.db_file)
+        return AgentRunner(agent, self.agent_config, tier=tier.name)
+
+    def _run_routed(self, file_paths: List[str], call):
+        """Run a per-file call on the model tier of the files (the agent's own model without routing)"""
+        if self.router is None:
+            return call(self.runner)
+        return self.router.run(file_paths, call)
+
+    async def _arun_routed(self, file_paths: List[str], call):
+        """Async twin of _run_routed"""
+        if self.router is None:
+            return await call(self.runner)
+        return await self.router.arun(file_paths, call)
     
     def _get_externalized_prompt(self, prompt_name: str, **kwargs) -> str:
         """Get externalized prompt with format variables"""
@@ -80,31 +91,425 @@ class MigrationAgent:
     def migrate_java_class(
         self,
         file_path: str,
-        file_info: dict[str, Any]
-    ):
+        file_info: dict[str, Any],
+        session_id: Optional[str] = None,
+        dependencies: Optional[Dict[str, str]] = None,
+        target_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+
+        rewrite = self._rewrite_locally(file_path, file_info, dependencies, target_path)
+        if rewrite.complete:
+            return self._store_local_rewrite(file_path, file_info, rewrite, target_path)
+
+        if self._needs_chunking(file_path):
+            chunked = self._migrate_chunked(file_path, file_info, dependencies, target_path, rewrite)
+            if chunked is not None:
+                return chunked
+
+        if self.inline_sources:
+            prompt = self._migrate_inline_prompt(file_path, file_info, dependencies, rewrite, target_path)
+            return self._run_routed([file_path], lambda runner: self._store_inline_migration(
+                file_path, file_info, runner.run(prompt, session_id=session_id).content, target_path
+            ))
+
+        prompt = self._migrate_java_class_prompt(file_path, file_info, dependencies, rewrite, target_path)
+        return self._run_routed([file_path], lambda runner: self._store_migration_result(
+            file_path, runner.run(prompt, session_id=session_id, expect_json=True).content
+        ))
+
+    async def amigrate_java_class(
+        self,
+        file_path: str,
+        file_info: dict[str, Any],
+        session_id: Optional[str] = None,
+        dependencies: Optional[Dict[str, str]] = None,
+        target_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+
+        rewrite = self._rewrite_locally(file_path, file_info, dependencies, target_path)
+        if rewrite.complete:
+            return self._store_local_rewrite(file_path, file_info, rewrite, target_path)
+
+        if self._needs_chunking(file_path):
+            chunked = await self._amigrate_chunked(file_path, file_info, dependencies, target_path, rewrite)
+            if chunked is not None:
+                return chunked
+
+        if self.inline_sources:
+            prompt = self._migrate_inline_prompt(file_path, file_info, dependencies, rewrite, target_path)
+
+            async def migrate_inline(runner: AgentRunner) -> Dict[str, Any]:
+                response = await runner.arun(prompt, session_id=session_id)
+                return self._store_inline_migration(file_path, file_info, response.content, target_path)
+            return await self._arun_routed([file_path], migrate_inline)
+
+        prompt = self._migrate_java_class_prompt(file_path, file_info, dependencies, rewrite, target_path)
+
+        async def migrate(runner: AgentRunner) -> Dict[str, Any]:
+            response = await runner.arun(prompt, session_id=session_id, expect_json=True)
+            return self._store_migration_result(file_path, response.content)
+        return await self._arun_routed([file_path], migrate)
+
+    def _migrate_java_class_prompt(
+        self,
+        file_path: str,
+        file_info: dict[str, Any],
+        dependencies: Optional[Dict[str, str]] = None,
+        rewrite: Optional[LocalRewrite] = None,
+        target_path: Optional[str] = None
+    ) -> str:
+        file_path_to_read = file_path
+        if rewrite is not None and rewrite.changes and rewrite.content is not None:
+            # The partially rewritten file already sits at its destination, the model finishes it there
+            file_path_to_read = self._output_path(target_path, file_info)
 
-        response = self.agent.run(self._get_externalized_prompt(
+        prompt = self._get_externalized_prompt(
             'migrate_java_class',
-            file_path_to_read=file_path,
+            file_path_to_read=file_path_to_read,
             file_name=file_info['file_name_suggestion'],
             file_path=file_info['package_suggestion']
+        )
+        if file_path_to_read != file_path:
+            prompt += "\n" + self._get_externalized_prompt(
+                'local_rewrites_applied',
+                file_path_to_read=file_path_to_read,
+                legacy_file=file_path,
+                changes="\n".join(f"- {change}" for change in rewrite.changes),
+                residual=", ".join(rewrite.residual)
+            )
+        if dependencies:
+            # Dependencies are migrated first, so their new names can be referenced directly
+            prompt += "\n" + self._dependencies_prompt(dependencies)
+        return prompt
+
+    def _migrate_inline_prompt(
+        self,
+        file_path: str,
+        file_info: dict[str, Any],
+        dependencies: Optional[Dict[str, str]],
+        rewrite: LocalRewrite,
+        target_path: Optional[str]
+    ) -> str:
+        source = rewrite.content
+        if source is None:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                source = f.read()
+
+        prompt = self._get_externalized_prompt(
+            'migrate_java_class_inline',
+            file_path_to_read=file_path,
+            file_name=file_info['file_name_suggestion'],
+            file_path=file_info['package_suggestion'],
+            language=fence_language(file_path),
+            code=source.rstrip()
+        )
+        if rewrite.changes:
+            prompt += "\n" + self._get_externalized_prompt('local_rewrites_inline', changes="; ".join(rewrite.changes))
+        if dependencies:
+            prompt += "\n" + self._dependencies_prompt(dependencies)
+        return prompt
+
+    def _store_inline_migration(
+        self,
+        file_path: str,
+        file_info: dict[str, Any],
+        content: str,
+        target_path: Optional[str]
+    ) -> Dict[str, Any]:
+        content = content or ''
+        if content.strip().upper().startswith(SKIPPED_MARKER):
+            result = {"skipped": True}
+        elif '```' not in content:
+            raise ValueError(f"No migrated code in response for {file_path}")
+        else:
+            output_path = self._output_path(target_path, file_info)
+            code = extract_code_block(content, fence_language(output_path))
+            try:
+                result = extract_json(content)
+            except ValueError:
+                result = {}
+            result["file"] = self._write_output(target_path, file_info, code.rstrip('\n') + '\n')
+
+        self.migration_results[file_path] = result
+        return result
+
+    def _dependencies_prompt(self, dependencies: Dict[str, str]) -> str:
+        return self._get_externalized_prompt(
+            'migrated_dependencies',
+            dependencies="\n".join(f"- {legacy} -> {migrated}" for legacy, migrated in sorted(dependencies.items()))
+        )
+
+    def _rewrite_locally(
+        self,
+        file_path: str,
+        file_info: dict[str, Any],
+        dependencies: Optional[Dict[str, str]],
+        target_path: Optional[str]
+    ) -> LocalRewrite:
+        """Apply the mechanical rewrites, leaving a partially rewritten file at its destination"""
+        rewrite = self.rewriter.rewrite(file_path, file_info, dependencies)
+        if not rewrite.complete and rewrite.changes and rewrite.content is not None:
+            self._write_output(target_path, file_info, rewrite.content)
+        return rewrite
+
+    def _store_local_rewrite(
+        self,
+        file_path: str,
+        file_info: dict[str, Any],
+        rewrite: LocalRewrite,
+        target_path: Optional[str]
+    ) -> Dict[str, Any]:
+        result = {"local_rewrites": rewrite.changes, "model_call": False}
+        if rewrite.dropped:
+            result["dropped"] = True
+        else:
+            result["file"] = self._write_output(target_path, file_info, rewrite.content)
+        self.migration_results[file_path] = result
+        return result
+
+    @staticmethod
+    def _output_path(target_path: Optional[str], file_info: dict[str, Any]) -> str:
+        return expected_output_path(target_path or "./modernized_java_project", file_info)
+
+    def _write_output(self, target_path: Optional[str], file_info: dict[str, Any], code: str) -> str:
+        # Staged: written at the end of the phase, and only if the content changed
+        return self.output_writer.write(self._output_path(target_path, file_info), code)
+
+    def migrate_file_batch(
+        self,
+        file_paths: List[str],
+        file_infos: Dict[str, dict[str, Any]],
+        session_id: Optional[str] = None,
+        dependencies: Optional[Dict[str, str]] = None,
+        target_path: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Migrate several small files with a single prompt
+
+        Returns:
+            Source path -> migration summary, for the files the response covered
+
+        Raises:
+            ValueError: If the response covers none of the files sent to the model
+        """
+        results, pending = self._rewrite_batch_locally(file_paths, file_infos, dependencies, target_path)
+        if pending:
+            # Files the answer misses come back to the orchestrator, which retries them one by one
+            prompt = self._migrate_file_batch_prompt(pending, file_infos, dependencies)
+            results.update(self._run_routed(list(pending), lambda runner: self._store_batch_migration(
+                list(pending), file_infos, runner.run(prompt, session_id=session_id).content, target_path
+            )))
+        return results
+
+    async def amigrate_file_batch(
+        self,
+        file_paths: List[str],
+        file_infos: Dict[str, dict[str, Any]],
+        session_id: Optional[str] = None,
+        dependencies: Optional[Dict[str, str]] = None,
+        target_path: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+
+        results, pending = self._rewrite_batch_locally(file_paths, file_infos, dependencies, target_path)
+        if pending:
+            prompt = self._migrate_file_batch_prompt(pending, file_infos, dependencies)
+
+            async def migrate_batch(runner: AgentRunner) -> Dict[str, Dict[str, Any]]:
+                response = await runner.arun(prompt, session_id=session_id)
+                return self._store_batch_migration(list(pending), file_infos, response.content, target_path)
+            results.update(await self._arun_routed(list(pending), migrate_batch))
+        return results
+
+    def _rewrite_batch_locally(
+        self,
+        file_paths: List[str],
+        file_infos: Dict[str, dict[str, Any]],
+        dependencies: Optional[Dict[str, str]],
+        target_path: Optional[str]
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, LocalRewrite]]:
+        """Summaries of the files fully handled locally and the rewrites of those left for the model"""
+        results, pending = {}, {}
+        for file_path in file_paths:
+            rewrite = self.rewriter.rewrite(file_path, file_infos[file_path], dependencies)
+            if rewrite.complete:
+                results[file_path] = self._store_local_rewrite(file_path, file_infos[file_path], rewrite, target_path)
+            else:
+                pending[file_path] = rewrite
+        return results, pending
+
+    def _migrate_file_batch_prompt(
+        self,
+        rewrites: Dict[str, LocalRewrite],
+        file_infos: Dict[str, dict[str, Any]],
+        dependencies: Optional[Dict[str, str]] = None
+    ) -> str:
+        sections = []
+        for file_path, rewrite in rewrites.items():
+            content = rewrite.content
+            if content is None:
+                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                    content = f.read()
+            file_info = file_infos[file_path]
+            note = f"New name: {file_info['file_name_suggestion']}, new path: {file_info['package_suggestion']}"
+            if rewrite.changes:
+                note += f" (already applied: {'; '.join(rewrite.changes)})"
+            sections.append(render_file_section(file_path, content, note))
+
+        prompt = self._get_externalized_prompt('migrate_file_batch', files="\n\n".join(sections))
+        if dependencies:
+            prompt += "\n" + self._dependencies_prompt(dependencies)
+        return prompt
+
+    def _store_batch_migration(
+        self,
+        file_paths: List[str],
+        file_infos: Dict[str, dict[str, Any]],
+        content: str,
+        target_path: Optional[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        sections = split_batch_response(content, file_paths)
+        if not sections:
+            # Escalated by the router; on the last tier every file is retried on its own
+            raise ValueError(f"No file sections in batch response for {len(file_paths)} files")
+        results = {}
+        for file_path, code in sections.items():
+            if code is None:
+                result = {"skipped": True, "batch_size": len(file_paths)}
+            else:
+                result = {"file": self._write_output(target_path, file_infos[file_path], code), "batch_size": len(file_paths)}
+            self.migration_results[file_path] = result
+            results[file_path] = result
+        return results
+
+    def _needs_chunking(self, file_path: str) -> bool:
+        """Whether a file is too large to migrate in a single prompt"""
+        if not file_path.endswith('.java') or not os.path.isfile(file_path):
+            return False
+        return os.path.getsize(file_path) // CHARS_PER_TOKEN > get_config().get_chunking_file_threshold()
+
+    def _migrate_chunked(
+        self,
+        file_path: str,
+        file_info: dict[str, Any],
+        dependencies: Optional[Dict[str, str]],
+        target_path: Optional[str],
+        rewrite: LocalRewrite
+    ) -> Optional[Dict[str, Any]]:
+        plan = self._chunked_prompts(file_path, file_info, dependencies, rewrite)
+        if plan is None:
+            return None
+        prompts, has_trailer = plan
+        return self._run_routed([file_path], lambda runner: self._store_chunked_migration(
+            file_path, file_info,
+            runner.run_many(prompts, get_config().get_chunking_max_parallel(), self._chunk_session_prefix(file_path)),
+            has_trailer, target_path
         ))
 
+    async def _amigrate_chunked(
+        self,
+        file_path: str,
+        file_info: dict[str, Any],
+        dependencies: Optional[Dict[str, str]],
+        target_path: Optional[str],
+        rewrite: LocalRewrite
+    ) -> Optional[Dict[str, Any]]:
+        plan = self._chunked_prompts(file_path, file_info, dependencies, rewrite)
+        if plan is None:
+            return None
+        prompts, has_trailer = plan
+
+        async def migrate_chunks(runner: AgentRunner) -> Dict[str, Any]:
+            responses = await runner.arun_many(
+                prompts, get_config().get_chunking_max_parallel(), self._chunk_session_prefix(file_path)
+            )
+            return self._store_chunked_migration(file_path, file_info, responses, has_trailer, target_path)
+        return await self._arun_routed([file_path], migrate_chunks)
+
+    @staticmethod
+    def _chunk_session_prefix(file_path: str) -> str:
+        return "migration-chunk-" + hashlib.sha1(file_path.encode("utf-8")).hexdigest()[:16]
+
+    def _chunked_prompts(
+        self,
+        file_path: str,
+        file_info: dict[str, Any],
+        dependencies: Optional[Dict[str, str]],
+        rewrite: LocalRewrite
+    ) -> Optional[Tuple[List[str], bool]]:
+        """
+        Header prompt, one prompt per chunk and one for the secondary top-level types if any
+
+        Returns:
+            Tuple of (prompts, whether the last prompt migrates secondary types), or None if the
+            class cannot be split
+        """
+        source = rewrite.content
+        if source is None:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                source = f.read()
+        chunked = split_java_class(source, get_config().get_chunking_max_chunk_tokens())
+        if chunked is None or not chunked.chunks:
+            return None
+
+        secondary = " and its secondary types" if chunked.has_secondary_types else ""
+        print(f"          ✂️ {file_path}: migrating header and {len(chunked.chunks)} chunk(s){secondary}")
+        names = dict(
+            file_path_to_read=file_path,
+            file_name=file_info['file_name_suggestion'],
+            file_path=file_info['package_suggestion']
+        )
+        prompts = [self._get_externalized_prompt('migrate_class_header', code=chunked.header, **names)]
+        prompts.extend(
+            self._get_externalized_prompt(
+                'migrate_class_chunk',
+                header=chunked.header,
+                kind=chunk.kind,
+                start_line=chunk.start_line,
+                end_line=chunk.end_line,
+                code=chunk.text,
+                **names
+            )
+            for chunk in chunked.chunks
+        )
+        if chunked.has_secondary_types:
+            # Migrated as a last piece of its own, so no legacy type is copied into the output
+            prompts.append(
+                self._get_externalized_prompt('migrate_secondary_types', code=chunked.trailer.strip('\n'), **names)
+            )
+        if dependencies:
+            suffix = "\n" + self._dependencies_prompt(dependencies)
+            prompts = [prompt + suffix for prompt in prompts]
+        return prompts, chunked.has_secondary_types
+
+    def _store_chunked_migration(
+        self,
+        file_path: str,
+        file_info: dict[str, Any],
+        responses: List[Any],
+        has_trailer: bool,
+        target_path: Optional[str]
+    ) -> Dict[str, Any]:
+        header, *pieces = [extract_code_block(response.content) for response in responses]
+        trailer = pieces.pop() if has_trailer else ''
+        code, issues = reassemble_java_class(header, pieces, trailer)
+        output_path = self._write_output(target_path, file_info, code)
+
+        for issue in issues:
+            print(f"          ⚠️ {file_path}: {issue}")
+        result = {
+            "file": output_path,
+            "chunks": len(pieces),
+            "consistency_issues": issues
+        }
+        self.migration_results[file_path] = result
+        return result
+
+    def _store_migration_result(self, file_path: str, content: str) -> Dict[str, Any]:
         try:
-            self._parse_json(response.content)
-        except:
-            print("Error parsing JSON response", response.content)
+            result = extract_json(content)
+        except ValueError as e:
+            # Escalated by the router; on the last tier the file is recorded as failed
+            raise ValueError(f"No migration summary in response for {file_path}: {e}") from e
 
-    def _parse_json(self, text: str) -> Dict[str, Any]:
-        import re
-        
-        json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', text, re.DOTALL)
-        if json_match:
-            return json.loads(json_match.group(1))
-        
-        json_match = re.search(r'\{.*\}', text, re.DOTALL)
-        if json_match:
-            return json.loads(json_match.group())
-        
-        raise ValueError("No valid JSON found in response")
-    
\ No newline at end of file
+        self.migration_results[file_path] = result
+        return result
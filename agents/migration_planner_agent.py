@@ -2,11 +2,13 @@ import json
 from typing import Dict, Any, Optional
 
 from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
-from agno.models.ollama import Ollama
 
 from utils import get_config
 from utils.agent_config_loader import get_agent_config
+from utils.agent_runner import AgentRunner
+from utils.json_extractor import extract_json
+from utils.priming_snapshot import prime_identity
+from utils.resource_registry import create_model, get_sqlite_db
 
 
 class ReportAgent:
@@ -15,8 +17,10 @@ class ReportAgent:
         config = get_config()
         model_name = config.get_model_name()
         db_file = db_file or config.get_database_file()
+        self.db_file = db_file
         self.agent_config = get_agent_config('report_manager')
         self.agent = self._create_agent(model_name, db_file, config)
+        self.runner = AgentRunner(self.agent, self.agent_config)
         self.migration_plan = None
         self.task_results = {}
 
@@ -28,12 +32,8 @@ class ReportAgent:
         return Agent(
             name=basic_config['name'],
             description=basic_config['description'],
-            model=Ollama(
-                id=model_name,
-                api_key=config.get_model_api_key(),
-                options={"temperature": config.get_model_temperature()}
-            ),
-            db=SqliteDb(db_file=db_file),
+            model=create_model(model_name),
+            db=get_sqlite_db(db_file),
             use_json_mode=True,
             role=basic_config['role'],
             system_message="\n".join(self.agent_config.get_system_message()),
@@ -43,25 +43,7 @@ class ReportAgent:
         )
 
     def _prime_identity(self):
-        agent_name = self.agent_config.get_basic_config()['name']
-        try:
-            priming_config = self.agent_config.get_identity_priming_config()
-
-            if not priming_config.get('enabled', True):
-                return True
-
-            layers = priming_config.get('layers', [])
-
-            for i, layer in enumerate(layers, 1):
-                message = layer.get('message', '')
-                if message:
-                    response = self.agent.run(message)
-            print(f"✅ {agent_name} identity successfully established!")
-            return True
-
-        except Exception as e:
-            print(f"❌ {agent_name if 'agent_name' in locals() else 'Agent'} priming failed: {e}")
-            return False
+        return prime_identity(self.agent, self.agent_config, self.db_file)
 
     def _get_externalized_prompt(self, prompt_name: str, **kwargs) -> str:
         """Get externalized prompt with format variables"""
@@ -78,33 +60,49 @@ class ReportAgent:
             project_info=json.dumps(project_info, indent=2)
         )
 
-        response = self.agent.run(prompt)
+        response = self.runner.run(prompt, expect_json=True)
+        return self._store_migration_plan(response.content)
+
+    async def acreate_migration_plan(self, project_info: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = self._get_externalized_prompt(
+            'create_migration_plan',
+            project_info=json.dumps(project_info, indent=2)
+        )
+
+        response = await self.runner.arun(prompt, expect_json=True)
+        return self._store_migration_plan(response.content)
 
+    def _store_migration_plan(self, content: str) -> Dict[str, Any]:
         try:
-            self.migration_plan = self._parse_json(response.content)
-        except:
+            self.migration_plan = extract_json(content)
+        except ValueError:
             self.migration_plan = {
-                "raw_plan": response.content,
+                "raw_plan": content,
                 "status": "needs_parsing"
             }
 
         return self.migration_plan
 
-    def _parse_json(self, plan_text: str) -> Dict[str, Any]:
-        import re
-        json_match = re.search(r'\{.*\}', plan_text, re.DOTALL)
-        if json_match:
-            return json.loads(json_match.group())
-        return {"raw_plan": plan_text}
+    def synthesize_results(self, agent_results: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = self._get_externalized_prompt(
+            'synthesize_results',
+            agent_results=json.dumps(agent_results, indent=2)
+        )
 
+        response = self.runner.run(prompt)
 
-    def synthesize_results(self, agent_results: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return response.content
+        except:
+            return {"final_report": response.content}
+
+    async def asynthesize_results(self, agent_results: Dict[str, Any]) -> Dict[str, Any]:
         prompt = self._get_externalized_prompt(
             'synthesize_results',
             agent_results=json.dumps(agent_results, indent=2)
         )
 
-        response = self.agent.run(prompt)
+        response = await self.runner.arun(prompt)
 
         try:
             return response.content
@@ -112,5 +110,9 @@ class ReportAgent:
             return {"final_report": response.content}
 
     def run_chat(self, message: str) -> str:
-        response = self.agent.run(message)
+        response = self.runner.run(message, use_cache=False)
+        return response.content
+
+    async def arun_chat(self, message: str) -> str:
+        response = await self.runner.arun(message, use_cache=False)
         return response.content
\ No newline at end of file
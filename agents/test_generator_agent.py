@@ -1,13 +1,25 @@
+import asyncio
+import hashlib
 import json
-from typing import Dict, List, Any, Optional
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Any, Optional
 
 from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
-from agno.models.ollama import Ollama
-from agno.tools.file import FileTools
 
 from utils import get_config
 from utils.agent_config_loader import get_agent_config
+from utils.agent_runner import AgentRunner
+from utils.java_chunker import extract_code_block
+from utils.json_extractor import extract_json
+from utils.output_writer import StagedFileTools, get_output_writer
+from utils.priming_snapshot import prime_identity
+from utils.resource_registry import create_model, get_sqlite_db
+from utils.source_index import index_java_file
+
+# Called as each class's tests are done: (class file, result, error)
+ClassTestsCallback = Callable[[str, Optional[Dict[str, Any]], Optional[Exception]], None]
 
 
 class TestGeneratorAgent:
@@ -16,8 +28,10 @@ class TestGeneratorAgent:
         config = get_config()
         model_name = config.get_model_name()
         db_file = db_file or config.get_database_file()
+        self.db_file = db_file
         self.agent_config = get_agent_config('test_generator')
         self.agent = self._create_agent(model_name, db_file, config)
+        self.runner = AgentRunner(self.agent, self.agent_config)
         self.test_results = {}
         
         if prime_identity:
@@ -28,16 +42,10 @@ class TestGeneratorAgent:
         return Agent(
             name=basic_config['name'],
             description=basic_config['description'],
-            tools=[FileTools()],
-            model=Ollama(
-                id=model_name,
-                api_key=config.get_model_api_key(),
-                options={"temperature": config.get_model_temperature()}
-            ),
+            tools=[StagedFileTools()],
+            model=create_model(model_name),
             use_json_mode=True,
-            db=SqliteDb(
-                db_file=db_file
-            ),
+            db=get_sqlite_db(db_file),
             role=basic_config['role'],
             system_message="\n".join(self.agent_config.get_system_message()),
             instructions=self.agent_config.get_identity_instructions(),
@@ -55,63 +63,238 @@ class TestGeneratorAgent:
             return template
     
     def _prime_identity(self):
-        agent_name = self.agent_config.get_basic_config()['name']
-        try:
-            priming_config = self.agent_config.get_identity_priming_config()
-            
-            if not priming_config.get('enabled', True):
-                return True
-            
-            layers = priming_config.get('layers', [])
-
-            for i, layer in enumerate(layers, 1):
-                message = layer.get('message', '')
-                if message:
-                    response = self.agent.run(message)
-
-            print(f"✅ {agent_name} identity successfully established!")
-            return True
-                
-        except Exception as e:
-            print(f"❌ {agent_name if 'agent_name' in locals() else 'Agent'} priming failed: {e}")
-            return False
+        return prime_identity(self.agent, self.agent_config, self.db_file)
+
+    def _create_worker_runner(self) -> AgentRunner:
+        """Runner over a new agent carrying this agent's primed identity, for one worker thread"""
+        config = get_config()
+        agent = self._create_agent(config.get_model_name(), self.db_file, config)
+        agent.additional_input = self.agent.additional_input
+        return AgentRunner(agent, self.agent_config)
     
-    def generate_bdd_scenarios(self) -> Dict[str, Any]:
-        prompt = self._get_externalized_prompt(
+    def generate_bdd_scenarios(self, files: Optional[List[str]] = None) -> Dict[str, Any]:
+        prompt = self._bdd_scenarios_prompt(files)
+        
+        response = self.runner.run(prompt, expect_json=True)
+        return self._store_bdd_scenarios(response.content)
+
+    async def agenerate_bdd_scenarios(self, files: Optional[List[str]] = None) -> Dict[str, Any]:
+        prompt = self._bdd_scenarios_prompt(files)
+
+        response = await self.runner.arun(prompt, expect_json=True)
+        return self._store_bdd_scenarios(response.content)
+
+    def _bdd_scenarios_prompt(self, files: Optional[List[str]]) -> str:
+        if files:
+            return self._get_externalized_prompt(
+                'generate_bdd_scenarios_for_files',
+                files="\n".join(f"- {f}" for f in files)
+            )
+        return self._get_externalized_prompt(
             'generate_bdd_scenarios'
         )
-        
-        response = self.agent.run(prompt)
-        
-        try:
-            result = self._parse_json(response.content)
-        except:
-            result = {
-                "feature_file": response.content,
-                "parsing_note": "Response not in expected JSON format"
-            }
+
+    def _store_bdd_scenarios(self, content: str) -> Dict[str, Any]:
+        result = self._parse_json_or(content, {
+            "feature_file": content,
+            "parsing_note": "Response not in expected JSON format"
+        })
         
         self.test_results[f"bdds"] = result
         return result
     
-    def generate_unit_tests(self) -> Dict[str, Any]:
-        prompt = self._get_externalized_prompt(
+    def generate_unit_tests(self, files: Optional[List[str]] = None) -> Dict[str, Any]:
+        prompt = self._unit_tests_prompt(files)
+        
+        response = self.runner.run(prompt, expect_json=True)
+        return self._store_unit_tests(response.content)
+
+    async def agenerate_unit_tests(self, files: Optional[List[str]] = None) -> Dict[str, Any]:
+        prompt = self._unit_tests_prompt(files)
+
+        response = await self.runner.arun(prompt, expect_json=True)
+        return self._store_unit_tests(response.content)
+
+    def _unit_tests_prompt(self, files: Optional[List[str]]) -> str:
+        if files:
+            return self._get_externalized_prompt(
+                'generate_unit_tests_for_files',
+                files="\n".join(f"- {f}" for f in files)
+            )
+        return self._get_externalized_prompt(
             'generate_unit_tests'
         )
-        
-        response = self.agent.run(prompt)
-        
-        try:
-            result = self._parse_json(response.content)
-        except:
-            result = {
-                "test_class": response.content,
-                "parsing_note": "Response not in expected JSON format"
-            }
+
+    def _store_unit_tests(self, content: str) -> Dict[str, Any]:
+        result = self._parse_json_or(content, {
+            "test_class": content,
+            "parsing_note": "Response not in expected JSON format"
+        })
         
         self.test_results[f"test_units"] = result
         return result
     
+    @staticmethod
+    def testable_classes(target_path: Optional[str] = None, files: Optional[List[str]] = None) -> List[str]:
+        """
+        Migrated Java sources declaring a class, enum or record, found without a model call
+
+        Args:
+            target_path: Migrated project (default: ./modernized_java_project)
+            files: Migrated files to pick from (default: everything under src/main/java)
+        """
+        if files is None:
+            root = os.path.join(target_path or "./modernized_java_project", "src", "main", "java")
+            files = sorted(
+                os.path.join(directory, name) for directory, _, names in os.walk(root) for name in names
+            )
+        return [
+            file_path for file_path in files
+            if file_path.endswith('.java') and os.path.isfile(file_path)
+            and any(declared['kind'] in ('class', 'enum', 'record') for declared in index_java_file(file_path)['types'])
+        ]
+
+    def generate_class_unit_tests(self, class_file: str, target_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate the JUnit 5 tests of one migrated class, with only its source in context
+
+        Args:
+            class_file: Migrated Java source
+            target_path: Migrated project the test class is written to (default: ./modernized_java_project)
+
+        Raises:
+            ValueError: If the response holds no test class
+        """
+        return self._generate_class_unit_tests(self.runner, class_file, target_path)
+
+    def _generate_class_unit_tests(self, runner: AgentRunner, class_file: str, target_path: Optional[str]) -> Dict[str, Any]:
+        prompt, test_file = self._class_unit_tests_prompt(class_file, target_path)
+
+        response = runner.run(prompt, session_id=self._class_session_id(class_file))
+        return self._store_class_unit_tests(class_file, test_file, response.content)
+
+    async def agenerate_class_unit_tests(self, class_file: str, target_path: Optional[str] = None) -> Dict[str, Any]:
+        prompt, test_file = self._class_unit_tests_prompt(class_file, target_path)
+
+        response = await self.runner.arun(prompt, session_id=self._class_session_id(class_file))
+        return self._store_class_unit_tests(class_file, test_file, response.content)
+
+    def generate_unit_tests_per_class(
+        self,
+        files: Optional[List[str]] = None,
+        target_path: Optional[str] = None,
+        on_result: Optional[ClassTestsCallback] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate unit tests class by class, as independent calls running concurrently
+
+        Args:
+            files: Migrated files to cover (default: every class of the migrated project)
+            target_path: Migrated project (default: ./modernized_java_project)
+            on_result: Called as each class is done, with its result or its error
+
+        Returns:
+            Class file -> result, for the classes whose tests were generated
+        """
+        classes = self.testable_classes(target_path, files)
+        results = {}
+        if not classes:
+            return results
+        max_parallel = self.agent_config.get_unit_tests_config().get('max_parallel', 8)
+        worker_state = threading.local()
+
+        def generate(class_file: str, target_path: Optional[str]) -> Dict[str, Any]:
+            # agno's Agent.run changes the agent while it runs, so each thread owns its own agent
+            if not hasattr(worker_state, 'runner'):
+                worker_state.runner = self._create_worker_runner()
+            return self._generate_class_unit_tests(worker_state.runner, class_file, target_path)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(classes)))) as executor:
+            futures = {
+                executor.submit(generate, class_file, target_path): class_file
+                for class_file in classes
+            }
+            for future in as_completed(futures):
+                class_file = futures[future]
+                try:
+                    results[class_file] = future.result()
+                except Exception as e:
+                    self._class_unit_tests_failed(class_file, e, on_result)
+                    continue
+                if on_result:
+                    on_result(class_file, results[class_file], None)
+        return results
+
+    async def agenerate_unit_tests_per_class(
+        self,
+        files: Optional[List[str]] = None,
+        target_path: Optional[str] = None,
+        on_result: Optional[ClassTestsCallback] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        classes = self.testable_classes(target_path, files)
+        semaphore = asyncio.Semaphore(max(1, self.agent_config.get_unit_tests_config().get('max_parallel', 8)))
+        results = {}
+
+        async def generate(class_file: str):
+            async with semaphore:
+                try:
+                    results[class_file] = await self.agenerate_class_unit_tests(class_file, target_path)
+                except Exception as e:
+                    self._class_unit_tests_failed(class_file, e, on_result)
+                    return
+            if on_result:
+                on_result(class_file, results[class_file], None)
+
+        await asyncio.gather(*(generate(class_file) for class_file in classes))
+        return results
+
+    def _class_unit_tests_prompt(self, class_file: str, target_path: Optional[str]):
+        """Prompt with the class source, and the test file its answer is written to"""
+        entry = index_java_file(class_file)
+        class_name = next(
+            declared['name'] for declared in entry['types'] if declared['kind'] in ('class', 'enum', 'record')
+        )
+        with open(class_file, 'r', encoding='utf-8', errors='replace') as f:
+            code = f.read()
+
+        package = entry['package']
+        test_file = os.path.join(
+            target_path or "./modernized_java_project", "src", "test", "java",
+            *(package.split('.') if package else []), f"{class_name}Test.java"
+        )
+        prompt = self._get_externalized_prompt(
+            'generate_unit_tests_for_class',
+            class_name=class_name,
+            class_file=class_file,
+            test_class_name=f"{class_name}Test",
+            package=package or "(default package)",
+            code=code.rstrip()
+        )
+        return prompt, test_file
+
+    @staticmethod
+    def _class_session_id(class_file: str) -> str:
+        # One session per class, so no class carries another's conversation
+        return "unit-tests-" + hashlib.sha1(class_file.encode("utf-8")).hexdigest()[:16]
+
+    def _store_class_unit_tests(self, class_file: str, test_file: str, content: str) -> Dict[str, Any]:
+        content = content or ''
+        if '```' not in content:
+            raise ValueError(f"No test class in response for {class_file}")
+        code = extract_code_block(content, 'java')
+        result = self._parse_json_or(content.rsplit('```', 1)[-1], {})
+        result["test_file"] = get_output_writer().write(test_file, code.rstrip('\n') + '\n')
+
+        self.test_results.setdefault("class_tests", {})[class_file] = result
+        return result
+
+    def _class_unit_tests_failed(self, class_file: str, error: Exception, on_result: Optional[ClassTestsCallback]):
+        self.test_results.setdefault("class_tests", {})[class_file] = {"error": f"{type(error).__name__}: {error}"}
+        if on_result:
+            on_result(class_file, None, error)
+        else:
+            print(f"          ⚠️  Error generating unit tests for {class_file}: {str(error)}")
+
     def generate_integration_tests(
         self,
         components: List[Dict[str, Any]],
@@ -123,15 +306,28 @@ class TestGeneratorAgent:
             integration_points=json.dumps(integration_points, indent=2)
         )
         
-        response = self.agent.run(prompt)
-        
-        try:
-            return self._parse_json(response.content)
-        except:
-            return {
-                "test_classes": [response.content],
-                "parsing_note": "Response not in expected JSON format"
-            }
+        response = self.runner.run(prompt, expect_json=True)
+        return self._parse_json_or(response.content, {
+            "test_classes": [response.content],
+            "parsing_note": "Response not in expected JSON format"
+        })
+
+    async def agenerate_integration_tests(
+        self,
+        components: List[Dict[str, Any]],
+        integration_points: List[str]
+    ) -> Dict[str, Any]:
+        prompt = self._get_externalized_prompt(
+            'generate_integration_tests',
+            components=json.dumps(components, indent=2),
+            integration_points=json.dumps(integration_points, indent=2)
+        )
+
+        response = await self.runner.arun(prompt, expect_json=True)
+        return self._parse_json_or(response.content, {
+            "test_classes": [response.content],
+            "parsing_note": "Response not in expected JSON format"
+        })
     
     def generate_test_data(
         self,
@@ -142,15 +338,26 @@ class TestGeneratorAgent:
             data_requirements=json.dumps(data_requirements, indent=2)
         )
         
-        response = self.agent.run(prompt)
-        
-        try:
-            return self._parse_json(response.content)
-        except:
-            return {
-                "test_data": response.content,
-                "parsing_note": "Response not in expected JSON format"
-            }
+        response = self.runner.run(prompt, expect_json=True)
+        return self._parse_json_or(response.content, {
+            "test_data": response.content,
+            "parsing_note": "Response not in expected JSON format"
+        })
+
+    async def agenerate_test_data(
+        self,
+        data_requirements: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        prompt = self._get_externalized_prompt(
+            'generate_test_data',
+            data_requirements=json.dumps(data_requirements, indent=2)
+        )
+
+        response = await self.runner.arun(prompt, expect_json=True)
+        return self._parse_json_or(response.content, {
+            "test_data": response.content,
+            "parsing_note": "Response not in expected JSON format"
+        })
     
     def generate_mock_configurations(
         self,
@@ -163,12 +370,22 @@ class TestGeneratorAgent:
             mock_scenarios=json.dumps(mock_scenarios, indent=2)
         )
         
-        response = self.agent.run(prompt)
-        
-        try:
-            return self._parse_json(response.content)
-        except:
-            return {"mock_code": response.content}
+        response = self.runner.run(prompt, expect_json=True)
+        return self._parse_json_or(response.content, {"mock_code": response.content})
+
+    async def agenerate_mock_configurations(
+        self,
+        dependencies: List[str],
+        mock_scenarios: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        prompt = self._get_externalized_prompt(
+            'generate_mock_configurations',
+            dependencies=json.dumps(dependencies, indent=2),
+            mock_scenarios=json.dumps(mock_scenarios, indent=2)
+        )
+
+        response = await self.runner.arun(prompt, expect_json=True)
+        return self._parse_json_or(response.content, {"mock_code": response.content})
     
     def calculate_test_coverage(
         self,
@@ -181,12 +398,22 @@ class TestGeneratorAgent:
             test_code=test_code
         )
         
-        response = self.agent.run(prompt)
-        
-        try:
-            return self._parse_json(response.content)
-        except:
-            return {"coverage_analysis": response.content}
+        response = self.runner.run(prompt, expect_json=True)
+        return self._parse_json_or(response.content, {"coverage_analysis": response.content})
+
+    async def acalculate_test_coverage(
+        self,
+        source_code: str,
+        test_code: str
+    ) -> Dict[str, Any]:
+        prompt = self._get_externalized_prompt(
+            'calculate_test_coverage',
+            source_code=source_code,
+            test_code=test_code
+        )
+
+        response = await self.runner.arun(prompt, expect_json=True)
+        return self._parse_json_or(response.content, {"coverage_analysis": response.content})
     
     def generate_test_suite_report(
         self,
@@ -197,22 +424,31 @@ class TestGeneratorAgent:
             all_tests=json.dumps(all_tests, indent=2)
         )
         
-        response = self.agent.run(prompt)
+        response = self.runner.run(prompt)
         return response.content
-    
-    def _parse_json(self, text: str) -> Dict[str, Any]:
-        import re
-        
-        json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', text, re.DOTALL)
-        if json_match:
-            return json.loads(json_match.group(1))
-        
-        json_match = re.search(r'\{.*\}', text, re.DOTALL)
-        if json_match:
-            return json.loads(json_match.group())
-        
-        raise ValueError("No valid JSON found in response")
+
+    async def agenerate_test_suite_report(
+        self,
+        all_tests: Dict[str, Any]
+    ) -> str:
+        prompt = self._get_externalized_prompt(
+            'generate_test_suite_report',
+            all_tests=json.dumps(all_tests, indent=2)
+        )
+
+        response = await self.runner.arun(prompt)
+        return response.content
+
+    def _parse_json_or(self, text: str, fallback: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return extract_json(text)
+        except ValueError:
+            return fallback
     
     def run_chat(self, message: str) -> str:
-        response = self.agent.run(message)
+        response = self.runner.run(message, use_cache=False)
+        return response.content
+
+    async def arun_chat(self, message: str) -> str:
+        response = await self.runner.arun(message, use_cache=False)
         return response.content
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""
+Benchmarks Package
+
+Synthetic legacy projects, a stand-in model server and the harness measuring
+how the migration pipeline scales with them.
+"""
@@ -0,0 +1,116 @@
+"""
+Benchmark Comparison
+
+Diffs two results files of `benchmarks.run_benchmark`, run by run (matched
+on project size), and flags every metric that got worse by more than the
+threshold. Exits with status 1 when there is a regression, so it can gate CI.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/main.json benchmarks/results/feature.json
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# Metric -> True if higher is better
+RUN_METRICS = {
+    "wall_s": False,
+    "files_per_s": True,
+    "peak_rss_mb": False,
+}
+PHASE_METRICS = {
+    "wall_s": False,
+    "files_per_s": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "calls": False,
+    "prompt_tokens": False,
+}
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _metrics(run: Dict[str, Any]) -> Dict[str, Tuple[Optional[float], bool]]:
+    """Metric name -> (value, higher is better) of one run"""
+    metrics = {name: (run.get(name), higher) for name, higher in RUN_METRICS.items()}
+    for phase, stats in run.get('phases', {}).items():
+        for name, higher in PHASE_METRICS.items():
+            metrics[f"{phase}.{name}"] = (stats.get(name), higher)
+    for agent, sizes in run.get('prompt_sizes', {}).items():
+        metrics[f"prompt_max[{agent}]"] = (sizes.get('max'), False)
+        metrics[f"prompt_growth[{agent}]"] = (sizes.get('growth'), False)
+    return metrics
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compare the runs of two results files
+
+    Args:
+        baseline: Results of the reference version
+        candidate: Results of the version under test
+        threshold: Relative change beyond which a worse value is a regression
+
+    Returns:
+        One row per metric of every size present in both files
+    """
+    baseline_runs = {run['size']: run for run in baseline.get('runs', [])}
+    rows = []
+    for run in candidate.get('runs', []):
+        reference = baseline_runs.get(run['size'])
+        if reference is None:
+            continue
+        before_metrics = _metrics(reference)
+        for name, (after, higher) in _metrics(run).items():
+            before = before_metrics.get(name, (None, higher))[0]
+            if before is None or after is None:
+                continue
+            change = (after - before) / abs(before) if before else (0.0 if after == before else float('inf'))
+            worse = -change if higher else change
+            rows.append({
+                "size": run['size'],
+                "metric": name,
+                "before": before,
+                "after": after,
+                "change": change,
+                "regression": worse > threshold,
+            })
+    return rows
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Compare two migration benchmark results files")
+    parser.add_argument("baseline", help="Results file of the reference version")
+    parser.add_argument("candidate", help="Results file of the version under test")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Tolerated relative slowdown (default: 0.10)")
+    parser.add_argument("--all", action="store_true", help="Show unchanged metrics too")
+    args = parser.parse_args()
+
+    baseline, candidate = _load(args.baseline), _load(args.candidate)
+    if baseline.get('backend', 'stub-server') != candidate.get('backend', 'stub-server'):
+        print("⚠️  The runs used different model backends, timings are not comparable")
+    if baseline.get('model_profile') != candidate.get('model_profile'):
+        print("⚠️  The runs used different model latency profiles, timings are not comparable")
+
+    rows = compare(baseline, candidate, args.threshold)
+    print(f"📊 {baseline.get('label')} -> {candidate.get('label')} (threshold {args.threshold:.0%})\n")
+    for row in rows:
+        if not (args.all or row['regression'] or abs(row['change']) > args.threshold):
+            continue
+        marker = "❌" if row['regression'] else "✅"
+        print(f"{marker} {row['size']:>6} classes  {row['metric']:<40} "
+              f"{row['before']:>10} -> {row['after']:<10} ({row['change']:+.1%})")
+
+    regressions = sum(row['regression'] for row in rows)
+    print(f"\n{regressions} regression(s) in {len(rows)} compared metrics")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+Synthetic Legacy Project Generator
+
+Writes a multi-module Maven EJB/WAR/EAR project shaped like
+legacy_java_project2, of any size. Classes are grouped in domains of four
+(entity, remote interface, stateless bean, servlet), each with a JSP; beans
+call the bean of the previous domain, so the dependency graph has depth, and
+every `large_every`-th bean carries enough methods to be chunked. Output is
+deterministic for a given size and seed.
+"""
+
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+BASE_PACKAGE = "com.acme.legacy"
+CLASSES_PER_DOMAIN = 4
+WORDS = (
+    "account", "order", "invoice", "customer", "product", "payment", "shipment", "ledger",
+    "catalog", "contract", "claim", "policy", "tariff", "stock", "voucher", "branch"
+)
+
+
+@dataclass
+class GeneratedProject:
+    """Summary of a generated project"""
+    root: str
+    classes: int = 0
+    jsps: int = 0
+    descriptors: int = 0
+    large_classes: int = 0
+    files: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "classes": self.classes,
+            "jsps": self.jsps,
+            "descriptors": self.descriptors,
+            "large_classes": self.large_classes,
+            "files": len(self.files),
+        }
+
+
+def _domain_names(count: int, rng: random.Random) -> List[str]:
+    names = []
+    for number in range(count):
+        word = WORDS[number % len(WORDS)]
+        names.append(f"{word}{number // len(WORDS)}" if number >= len(WORDS) else word)
+    rng.shuffle(names)
+    return names
+
+
+def _type_name(domain: str) -> str:
+    return domain[0].upper() + domain[1:]
+
+
+class ProjectGenerator:
+    """Generate synthetic legacy Java EE projects"""
+
+    def __init__(self, classes: int, large_every: int = 50, methods_per_class: int = 4, seed: int = 0):
+        """
+        Initialize project generator
+
+        Args:
+            classes: Number of Java classes (rounded up to whole domains of four)
+            large_every: Every n-th bean is large enough to be chunked (0 = none)
+            methods_per_class: Business methods of a regular bean
+            seed: Seed of the random domain order and field types
+        """
+        self.domains = max(1, -(-classes // CLASSES_PER_DOMAIN))
+        self.large_every = large_every
+        self.methods_per_class = methods_per_class
+        self.rng = random.Random(seed)
+
+    def generate(self, root: str) -> GeneratedProject:
+        """
+        Write the project
+
+        Args:
+            root: Directory to write it into (created if needed)
+
+        Returns:
+            GeneratedProject with the file counts
+        """
+        project = GeneratedProject(root=root)
+        domains = _domain_names(self.domains, self.rng)
+
+        for number, domain in enumerate(domains):
+            previous = domains[number - 1] if number else None
+            large = bool(self.large_every) and (number + 1) % self.large_every == 0
+            self._write_domain(project, domain, previous, large)
+
+        self._write(project, "ejb-module/src/main/resources/META-INF/ejb-jar.xml", self._ejb_jar(domains), "descriptors")
+        self._write(project, "ejb-module/src/main/resources/META-INF/persistence.xml", self._persistence(domains), "descriptors")
+        self._write(project, "war-module/src/main/webapp/WEB-INF/web.xml", self._web_xml(domains), "descriptors")
+        self._write(project, "ear-module/src/main/application/META-INF/application.xml", self._application_xml(), "descriptors")
+        for module, packaging in (("", "pom"), ("ejb-module/", "ejb"), ("war-module/", "war"), ("ear-module/", "ear")):
+            self._write(project, f"{module}pom.xml", self._pom(module.rstrip('/') or "legacy-app", packaging), "descriptors")
+        return project
+
+    def _write(self, project: GeneratedProject, relative_path: str, content: str, counter: str):
+        path = os.path.join(project.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        project.files.append(relative_path)
+        setattr(project, counter, getattr(project, counter) + 1)
+
+    def _write_domain(self, project: GeneratedProject, domain: str, previous: str, large: bool):
+        type_name = _type_name(domain)
+        package = f"{BASE_PACKAGE}.{domain}"
+        java_root = "ejb-module/src/main/java/" + package.replace('.', '/')
+        web_root = f"war-module/src/main/java/{BASE_PACKAGE.replace('.', '/')}/web"
+
+        self._write(project, f"{java_root}/{type_name}.java", self._entity(package, type_name), "classes")
+        self._write(project, f"{java_root}/{type_name}Remote.java", self._remote(package, type_name), "classes")
+        self._write(project, f"{java_root}/{type_name}Bean.java", self._bean(package, type_name, previous, large), "classes")
+        self._write(project, f"{web_root}/{type_name}Servlet.java", self._servlet(package, type_name), "classes")
+        self._write(project, f"war-module/src/main/webapp/{domain}.jsp", self._jsp(domain, type_name), "jsps")
+        if large:
+            project.large_classes += 1
+
+    def _entity(self, package: str, type_name: str) -> str:
+        fields = [("Long", "id"), ("String", "name"), (self.rng.choice(("String", "Integer", "Double")), "amount")]
+        lines = [
+            f"package {package};", "",
+            "import java.io.Serializable;", "",
+            "import javax.persistence.Entity;",
+            "import javax.persistence.Id;", "",
+            "@Entity",
+            f"public class {type_name} implements Serializable {{", "",
+        ]
+        for java_type, name in fields:
+            if name == "id":
+                lines.append("    @Id")
+            lines.append(f"    private {java_type} {name};")
+        for java_type, name in fields:
+            accessor = name[0].upper() + name[1:]
+            lines += [
+                "",
+                f"    public {java_type} get{accessor}() {{",
+                f"        return {name};",
+                "    }", "",
+                f"    public void set{accessor}({java_type} {name}) {{",
+                f"        this.{name} = {name};",
+                "    }",
+            ]
+        return "\n".join(lines + ["}", ""])
+
+    def _methods(self, large: bool) -> List[str]:
+        count = self.methods_per_class * (30 if large else 1)
+        return [f"process{number}" for number in range(count)]
+
+    def _remote(self, package: str, type_name: str) -> str:
+        lines = [
+            f"package {package};", "",
+            "import javax.ejb.Remote;", "",
+            "@Remote",
+            f"public interface {type_name}Remote {{",
+            f"    {type_name} find(Long id);",
+            f"    String describe({type_name} item);",
+        ]
+        return "\n".join(lines + ["}", ""])
+
+    def _bean(self, package: str, type_name: str, previous: str, large: bool) -> str:
+        lines = [f"package {package};", "", "import java.util.ArrayList;", "import java.util.List;", ""]
+        lines += ["import javax.ejb.EJB;"] if previous else []
+        lines += ["import javax.ejb.Stateless;"]
+        if previous:
+            lines += ["", f"import {BASE_PACKAGE}.{previous}.{_type_name(previous)}Remote;"]
+        lines += ["", "@Stateless", f"public class {type_name}Bean implements {type_name}Remote {{", ""]
+        if previous:
+            lines += ["    @EJB", f"    private {_type_name(previous)}Remote upstream;", ""]
+        lines += [
+            f"    private final List<{type_name}> items = new ArrayList<>();", "",
+            "    @Override",
+            f"    public {type_name} find(Long id) {{",
+            f"        for ({type_name} item : items) {{",
+            "            if (item.getId().equals(id)) {",
+            "                return item;",
+            "            }",
+            "        }",
+            "        return null;",
+            "    }", "",
+            "    @Override",
+            f"    public String describe({type_name} item) {{",
+            "        return item == null ? \"unknown\" : item.getName() + \" (\" + item.getAmount() + \")\";",
+            "    }",
+        ]
+        for method in self._methods(large):
+            threshold = self.rng.randint(1, 1000)
+            lines += [
+                "",
+                f"    public int {method}(int value) {{",
+                "        int total = 0;",
+                "        for (int i = 0; i < value; i++) {",
+                f"            total += i % {threshold} == 0 ? i : 1;",
+                "        }",
+                ("        return total + (upstream.find((long) value) == null ? 0 : 1);"
+                 if previous else "        return total;"),
+                "    }",
+            ]
+        return "\n".join(lines + ["}", ""])
+
+    def _servlet(self, package: str, type_name: str) -> str:
+        lines = [
+            f"package {BASE_PACKAGE}.web;", "",
+            "import java.io.IOException;", "",
+            "import javax.ejb.EJB;",
+            "import javax.servlet.ServletException;",
+            "import javax.servlet.http.HttpServlet;",
+            "import javax.servlet.http.HttpServletRequest;",
+            "import javax.servlet.http.HttpServletResponse;", "",
+            f"import {package}.{type_name};",
+            f"import {package}.{type_name}Remote;", "",
+            f"public class {type_name}Servlet extends HttpServlet {{", "",
+            "    @EJB",
+            f"    private {type_name}Remote service;", "",
+            "    @Override",
+            "    protected void doGet(HttpServletRequest request, HttpServletResponse response)",
+            "            throws ServletException, IOException {",
+            f"        {type_name} item = service.find(Long.valueOf(request.getParameter(\"id\")));",
+            "        request.setAttribute(\"description\", service.describe(item));",
+            f"        request.getRequestDispatcher(\"/{type_name.lower()}.jsp\").forward(request, response);",
+            "    }",
+        ]
+        return "\n".join(lines + ["}", ""])
+
+    @staticmethod
+    def _jsp(domain: str, type_name: str) -> str:
+        return "\n".join([
+            '<%@ page contentType="text/html;charset=UTF-8" language="java" %>',
+            "<html>",
+            f"<head><title>{type_name}</title></head>",
+            "<body>",
+            f"    <h1>{type_name}</h1>",
+            "    <p>${description}</p>",
+            f'    <a href="{domain}?id=1">Reload</a>',
+            "</body>",
+            "</html>", ""
+        ])
+
+    @staticmethod
+    def _web_xml(domains: List[str]) -> str:
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<web-app version="3.0">']
+        for domain in domains:
+            servlet = f"{_type_name(domain)}Servlet"
+            lines += [
+                "    <servlet>",
+                f"        <servlet-name>{servlet}</servlet-name>",
+                f"        <servlet-class>{BASE_PACKAGE}.web.{servlet}</servlet-class>",
+                "    </servlet>",
+                "    <servlet-mapping>",
+                f"        <servlet-name>{servlet}</servlet-name>",
+                f"        <url-pattern>/{domain}</url-pattern>",
+                "    </servlet-mapping>",
+            ]
+        return "\n".join(lines + ["</web-app>", ""])
+
+    @staticmethod
+    def _ejb_jar(domains: List[str]) -> str:
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<ejb-jar version="3.1">', "    <enterprise-beans>"]
+        for domain in domains:
+            bean = f"{_type_name(domain)}Bean"
+            lines += [
+                "        <session>",
+                f"            <ejb-name>{bean}</ejb-name>",
+                f"            <ejb-class>{BASE_PACKAGE}.{domain}.{bean}</ejb-class>",
+                "            <session-type>Stateless</session-type>",
+                "        </session>",
+            ]
+        return "\n".join(lines + ["    </enterprise-beans>", "</ejb-jar>", ""])
+
+    @staticmethod
+    def _persistence(domains: List[str]) -> str:
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<persistence version="2.0">', '    <persistence-unit name="legacy">']
+        lines += [f"        <class>{BASE_PACKAGE}.{domain}.{_type_name(domain)}</class>" for domain in domains]
+        return "\n".join(lines + ["    </persistence-unit>", "</persistence>", ""])
+
+    @staticmethod
+    def _application_xml() -> str:
+        return "\n".join([
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<application version="6">',
+            "    <module><ejb>ejb-module.jar</ejb></module>",
+            "    <module><web><web-uri>war-module.war</web-uri><context-root>/legacy</context-root></web></module>",
+            "</application>", ""
+        ])
+
+    @staticmethod
+    def _pom(artifact: str, packaging: str) -> str:
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            "<project>",
+            "    <modelVersion>4.0.0</modelVersion>",
+            "    <groupId>com.acme.legacy</groupId>",
+            f"    <artifactId>{artifact}</artifactId>",
+            "    <version>1.0</version>",
+            f"    <packaging>{packaging}</packaging>",
+        ]
+        if packaging == "pom":
+            lines += ["    <modules>"] + [f"        <module>{module}</module>" for module in ("ejb-module", "war-module", "ear-module")] + ["    </modules>"]
+        else:
+            lines += [
+                "    <dependencies>",
+                "        <dependency>",
+                "            <groupId>javax</groupId>",
+                "            <artifactId>javaee-api</artifactId>",
+                "            <version>6.0</version>",
+                "            <scope>provided</scope>",
+                "        </dependency>",
+                "    </dependencies>",
+            ]
+        return "\n".join(lines + ["</project>", ""])
+
+
+def generate_project(root: str, classes: int, large_every: int = 50, seed: int = 0) -> GeneratedProject:
+    """
+    Write a synthetic legacy project
+
+    Args:
+        root: Directory to write it into
+        classes: Number of Java classes
+        large_every: Every n-th bean is large enough to be chunked (0 = none)
+        seed: Seed of the generator
+
+    Returns:
+        GeneratedProject with the file counts
+    """
+    return ProjectGenerator(classes, large_every=large_every, seed=seed).generate(root)
@@ -0,0 +1,314 @@
+"""
+Benchmark Harness
+
+Generates synthetic legacy projects of the requested sizes, runs the
+migration phases on each of them against a stand-in model, and
+stores throughput, p50/p95 per-call latency, peak RSS and prompt-size growth
+in a JSON results file that `benchmarks.compare` diffs between versions.
+
+Every size runs in its own process with its own config.yml, databases and
+caches under a scratch directory, so the peak RSS of one run is not carried
+into the next and no run is served from another's cache.
+
+The stand-in model is either the Ollama-compatible stub server (default,
+includes the HTTP client path) or the in-process fake model backend
+(`--backend fake`, `model.provider: fake`).
+
+Usage:
+    python -m benchmarks.run_benchmark --sizes 10 100 1000 --label main
+    python -m benchmarks.run_benchmark --sizes 500 --first-token-ms 200 --tokens-per-second 80 --async
+    python -m benchmarks.run_benchmark --sizes 100 --set migration.workers=8 --label workers-8
+    python -m benchmarks.run_benchmark --sizes 1000 --backend fake --first-token-ms 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from benchmarks.project_generator import generate_project
+from benchmarks.stub_model_server import StubModelServer
+from utils.fake_model import LatencyProfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+ALL_PHASES = ("analysis", "migration", "tests")
+BACKENDS = ("stub-server", "fake")
+RESULTS_FORMAT = 1
+
+
+def _set_option(config: Dict[str, Any], assignment: str):
+    """Apply a dotted key=value override (the value is parsed as YAML)"""
+    key, _, value = assignment.partition('=')
+    section = config
+    *parents, leaf = key.split('.')
+    for parent in parents:
+        section = section.setdefault(parent, {})
+    section[leaf] = yaml.safe_load(value)
+
+
+def _write_run_config(
+    run_dir: str,
+    model_url: Optional[str],
+    profile: LatencyProfile,
+    overrides: List[str]
+) -> str:
+    """config.yml of one run: the repository config pointed at the stand-in model and the scratch dir"""
+    with open(os.path.join(REPO_ROOT, "config.yml"), 'r') as f:
+        config = yaml.safe_load(f)
+
+    model = config.setdefault('model', {})
+    if model_url:
+        model['provider'] = 'ollama'
+        model['host'] = model_url
+    else:
+        model['provider'] = 'fake'
+        model['fake'] = {
+            "first_token_ms": profile.first_token_ms,
+            "tokens_per_second": profile.tokens_per_second,
+            "chunk_tokens": profile.chunk_tokens,
+        }
+    config.setdefault('database', {})['file'] = os.path.join(run_dir, "agno.db")
+    config.setdefault('response_cache', {})['file'] = os.path.join(run_dir, "llm_cache.db")
+    config.setdefault('analysis', {})['index_dir'] = os.path.join(run_dir, ".java_index")
+    for assignment in overrides:
+        _set_option(config, assignment)
+
+    config_path = os.path.join(run_dir, "config.yml")
+    with open(config_path, 'w') as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    return config_path
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_single(config_path: str, source: str, target: str, phases: List[str], use_async: bool) -> Dict[str, Any]:
+    """
+    Run the migration once in this process and measure it
+
+    Args:
+        config_path: config.yml of the run
+        source: Legacy project
+        target: Output directory
+        phases: Phases to run
+        use_async: Run the asyncio pipeline
+
+    Returns:
+        Wall time, per-phase telemetry, prompt sizes, peak RSS and migration counts
+    """
+    from utils import get_config, reload_config
+    reload_config(config_path)
+
+    from java_migration_team import JavaMigrationTeam
+    from utils.context_budget import get_prompt_size_report
+    from utils.telemetry import get_telemetry
+
+    start = time.perf_counter()
+    team = JavaMigrationTeam(source_path=source, target_path=target, db_file=get_config().get_database_file())
+    if use_async:
+        asyncio.run(team.aexecute_migration(phases=phases))
+    else:
+        team.execute_migration(phases=phases)
+    wall_s = time.perf_counter() - start
+
+    migration = team.results.get('migration', {})
+    return {
+        "wall_s": round(wall_s, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+        "telemetry": get_telemetry().summary(),
+        "prompt_sizes": get_prompt_size_report(),
+        "migration": {
+            "files": len(migration),
+            "succeeded": sum(1 for result in migration.values() if result['status'] == 'success'),
+            "local_rewrites": sum(
+                1 for result in migration.values()
+                if isinstance(result.get('summary'), dict) and result['summary'].get('model_call') is False
+            ),
+        },
+        "outputs": team.results.get('outputs', {}),
+    }
+
+
+def _summarize(size: int, project: Dict[str, int], measured: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a run into the comparable results format"""
+    phases = {}
+    for name, stats in measured['telemetry']['phases'].items():
+        wall_s = stats['wall_ms'] / 1000
+        phases[name] = {
+            "wall_s": round(wall_s, 3),
+            "files_per_s": round(project['files'] / wall_s, 2) if wall_s else None,
+            "calls": stats['calls'],
+            "cache_hits": stats['cache_hits'],
+            "errors": stats['errors'],
+            "retries": stats['retries'],
+            "p50_ms": stats['p50_ms'],
+            "p95_ms": stats['p95_ms'],
+            "prompt_tokens": stats['prompt_tokens'],
+            "completion_tokens": stats['completion_tokens'],
+        }
+    prompt_growth = {
+        agent: {"first": sizes['first'], "last": sizes['last'], "max": sizes['max'],
+                "avg": sizes['avg'], "growth": sizes['last'] - sizes['first']}
+        for agent, sizes in measured['prompt_sizes'].items()
+    }
+    return {
+        "size": size,
+        "project": project,
+        "wall_s": measured['wall_s'],
+        "files_per_s": round(project['files'] / measured['wall_s'], 2) if measured['wall_s'] else None,
+        "peak_rss_mb": measured['peak_rss_mb'],
+        "phases": phases,
+        "prompt_sizes": prompt_growth,
+        "migration": measured['migration'],
+        "outputs": measured['outputs'],
+    }
+
+
+def run_size(
+    size: int,
+    server: Optional[StubModelServer],
+    profile: LatencyProfile,
+    args: argparse.Namespace,
+    scratch_dir: str
+) -> Dict[str, Any]:
+    """Generate a project of this size and migrate it in a child process"""
+    run_dir = os.path.join(scratch_dir, f"size-{size}")
+    os.makedirs(run_dir, exist_ok=True)
+    project = generate_project(os.path.join(run_dir, "legacy"), size, large_every=args.large_every, seed=args.seed)
+    config_path = _write_run_config(run_dir, server.url if server else None, profile, args.set)
+    result_path = os.path.join(run_dir, "result.json")
+    log_path = os.path.join(run_dir, "run.log")
+
+    command = [
+        sys.executable, "-m", "benchmarks.run_benchmark", "--child",
+        "--config", config_path,
+        "--source", project.root,
+        "--target", os.path.join(run_dir, "modernized"),
+        "--result", result_path,
+        "--phases", *args.phases,
+    ] + (["--async"] if args.use_async else [])
+
+    print(f"   ⚙️  {size} classes ({len(project.files)} files), log: {log_path}")
+    with open(log_path, 'w') as log:
+        completed = subprocess.run(command, cwd=REPO_ROOT, stdout=log, stderr=subprocess.STDOUT)
+    if completed.returncode != 0:
+        with open(log_path, 'r', errors='replace') as log:
+            tail = log.readlines()[-20:]
+        raise RuntimeError(f"Benchmark run of size {size} failed:\n{''.join(tail)}")
+
+    with open(result_path, 'r') as f:
+        return _summarize(size, project.to_dict(), json.load(f))
+
+
+def _print_run(run: Dict[str, Any]):
+    print(f"   ✓ {run['size']} classes: {run['wall_s']:.1f}s, {run['files_per_s']} files/s, "
+          f"peak RSS {run['peak_rss_mb']} MB")
+    for name, phase in run['phases'].items():
+        print(f"      {name}: {phase['wall_s']:.1f}s, {phase['files_per_s']} files/s, {phase['calls']} calls, "
+              f"p50 {phase['p50_ms']:.0f} ms, p95 {phase['p95_ms']:.0f} ms")
+    for agent, sizes in run['prompt_sizes'].items():
+        print(f"      📏 {agent}: prompt tokens {sizes['first']} -> {sizes['last']} (max {sizes['max']})")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the migration pipeline on synthetic legacy projects")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100], help="Numbers of Java classes to generate")
+    parser.add_argument("--phases", nargs="+", choices=ALL_PHASES, default=list(ALL_PHASES), help="Phases to run")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Run the asyncio pipeline")
+    parser.add_argument("--label", default=None, help="Name of the results file (default: current commit)")
+    parser.add_argument("--output", default=RESULTS_DIR, help="Directory of the results files")
+    parser.add_argument("--backend", choices=BACKENDS, default="stub-server",
+                        help="Stand-in model: Ollama-compatible stub server or in-process fake model")
+    parser.add_argument("--first-token-ms", type=float, default=0.0, help="Simulated model time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Simulated generation rate (0 = instant)")
+    parser.add_argument("--large-every", type=int, default=50, help="Every n-th bean is large enough to be chunked")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the project generator")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a config.yml option for the runs, e.g. migration.workers=8")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated projects and outputs")
+    # Internal: one measured run, started by the harness in a fresh process
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--config", help=argparse.SUPPRESS)
+    parser.add_argument("--source", help=argparse.SUPPRESS)
+    parser.add_argument("--target", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measured = run_single(args.config, args.source, args.target, args.phases, args.use_async)
+        with open(args.result, 'w') as f:
+            json.dump(measured, f, indent=2)
+        return
+
+    commit = _git_commit()
+    label = args.label or commit or time.strftime("%Y%m%d-%H%M%S")
+    profile = LatencyProfile(args.first_token_ms, args.tokens_per_second)
+    scratch_dir = tempfile.mkdtemp(prefix="migration-benchmark-")
+
+    print("\n" + "="*80)
+    print(f"📊 MIGRATION BENCHMARK {label}")
+    print("="*80 + "\n")
+
+    results = {
+        "format": RESULTS_FORMAT,
+        "label": label,
+        "commit": commit,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "phases": args.phases,
+        "async": args.use_async,
+        "backend": args.backend,
+        "model_profile": {"first_token_ms": args.first_token_ms, "tokens_per_second": args.tokens_per_second},
+        "overrides": args.set,
+        "runs": [],
+    }
+    server = StubModelServer(profile).start() if args.backend == "stub-server" else None
+    try:
+        for size in args.sizes:
+            run = run_size(size, server, profile, args, scratch_dir)
+            results["runs"].append(run)
+            _print_run(run)
+    finally:
+        if server is not None:
+            server.stop()
+        if args.keep:
+            print(f"\n📁 Generated projects and outputs kept in {scratch_dir}")
+        else:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    os.makedirs(args.output, exist_ok=True)
+    results_path = os.path.join(args.output, f"{label}.json")
+    with open(results_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results written to {results_path}")
+    print(f"   Compare with: python -m benchmarks.compare <baseline.json> {results_path}")
+
+
+if __name__ == "__main__":
+    main()
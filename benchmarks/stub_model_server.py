@@ -0,0 +1,162 @@
+"""
+Stand-in Model Server
+
+Minimal Ollama-compatible HTTP server (`/api/chat`, streamed or not) that
+answers the migration prompts with the canned responses of the fake model
+(`utils.fake_model`), so runs also exercise the Ollama client and its HTTP
+connection pool. Latency is simulated as a time to first token plus a token
+rate, so the pipeline's own overhead, concurrency and scheduling can be
+measured without a real model.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from utils.fake_model import LatencyProfile, canned_response
+from utils.java_chunker import estimate_tokens
+
+
+class StubModelHandler(BaseHTTPRequestHandler):
+    """Ollama /api/chat endpoint answering with canned responses"""
+
+    protocol_version = "HTTP/1.1"
+    profile = LatencyProfile()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        body = json.dumps({"models": [], "version": "stub"}).encode('utf-8')
+        self._send(200, body, "application/json")
+
+    def do_POST(self):
+        if self.path != "/api/chat":
+            self._send(404, b'{"error": "not found"}', "application/json")
+            return
+
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        messages = request.get('messages') or []
+        prompt = next((m.get('content') or '' for m in reversed(messages) if m.get('role') == 'user'), '')
+        prompt_tokens = sum(estimate_tokens(m.get('content') or '') for m in messages)
+        content = canned_response(prompt)
+        model = request.get('model', 'stub')
+
+        time.sleep(self.profile.first_token_ms / 1000)
+        if request.get('stream', True):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for piece in self.profile.pieces(content):
+                    time.sleep(self.profile.delay(estimate_tokens(piece)))
+                    self._chunk(self._message(model, piece, done=False))
+                self._chunk(self._message(model, "", done=True, prompt_tokens=prompt_tokens,
+                                          completion_tokens=estimate_tokens(content)))
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # The client closed the stream early (complete JSON answer)
+                self.close_connection = True
+            return
+
+        time.sleep(self.profile.delay(estimate_tokens(content)))
+        body = json.dumps(self._message(model, content, done=True, prompt_tokens=prompt_tokens,
+                                        completion_tokens=estimate_tokens(content)))
+        self._send(200, body.encode('utf-8'), "application/json")
+
+    @staticmethod
+    def _message(model: str, content: str, done: bool, prompt_tokens: int = 0,
+                 completion_tokens: int = 0) -> Dict:
+        message = {
+            "model": model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": content},
+            "done": done,
+        }
+        if done:
+            message.update(done_reason="stop", prompt_eval_count=prompt_tokens, eval_count=completion_tokens)
+        return message
+
+    def _chunk(self, payload: Dict):
+        data = json.dumps(payload).encode('utf-8') + b"\n"
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients closing streams early or dropping keep-alive connections are expected
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+
+class StubModelServer:
+    """Stand-in model server running in a background thread"""
+
+    def __init__(self, profile: Optional[LatencyProfile] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize stand-in model server
+
+        Args:
+            profile: Simulated model speed (default: instant)
+            host: Interface to listen on
+            port: Port to listen on (0 = any free port)
+        """
+        handler = type("ProfiledStubModelHandler", (StubModelHandler,), {"profile": profile or LatencyProfile()})
+        self.httpd = _QuietHTTPServer((host, port), handler)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubModelServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stub-model-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubModelServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Serve canned migration answers on the Ollama chat API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--first-token-ms", type=float, default=0.0, help="Simulated time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Simulated generation rate (0 = instant)")
+    args = parser.parse_args()
+
+    server = StubModelServer(LatencyProfile(args.first_token_ms, args.tokens_per_second), args.host, args.port)
+    print(f"🧪 Stand-in model server listening on {server.url} (set model.host to use it)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,23 @@
-from agno.db.sqlite import SqliteDb
-from agno.models.openai import OpenAIChat
 from agno.os import AgentOS
 from agno.team import Team
+from fastapi.responses import PlainTextResponse
 
 from agents import (
     CodeAnalyzerAgent,
     MigrationAgent,
     TestGeneratorAgent
 )
+from utils.output_writer import get_output_writer
+from utils.resource_registry import create_model, get_sqlite_db
+from utils.telemetry import get_telemetry, record_agent_run
 
 def create_migration_agentos():
     print("🚀 Initializing Java Migration AgentOS...")
 
     from utils import get_config
     config = get_config()
+    # No phase ends in an interactive session to commit staged files, write them right away
+    get_output_writer().staged = False
 
     analyzer_wrapper = CodeAnalyzerAgent()
     migration_wrapper = MigrationAgent()
@@ -24,19 +28,19 @@ def create_migration_agentos():
         migration_wrapper.agent,
         test_gen_wrapper.agent
     ]
+    # AgentOS runs the agno agents directly, bypassing AgentRunner's telemetry
+    for agent in agents:
+        agent.post_hooks = [*(agent.post_hooks or []), record_agent_run]
 
     agent_os = AgentOS(
         agents=agents,
         teams=[Team(
-            model=OpenAIChat(
-                id=config.get_model_name(),
-                api_key='ollama',  # Keep hardcoded as it's not in config
-                base_url=config.get_model_base_url()
-            ),
-            db=SqliteDb(db_file=config.get_database_file()),
+            model=create_model(),
+            db=get_sqlite_db(config.get_database_file()),
             name="Migration Team",
             add_history_to_context=True,
-            members=agents
+            members=agents,
+            post_hooks=[record_agent_run]
         )]
     )
     
@@ -57,6 +61,11 @@ def main():
     agent_os = create_migration_agentos()
     
     app = agent_os.get_app()
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """Model call telemetry in the Prometheus text format"""
+        return PlainTextResponse(get_telemetry().prometheus(), media_type="text/plain; version=0.0.4")
     
     port = config.get_ui_port()
     
@@ -66,6 +75,7 @@ def main():
     print(f"\nModel: {config.get_model_name()}")
     print(f"\nAccess the UI at:")
     print(f"   🌐 http://localhost:{port}")
+    print(f"   📈 Metrics: http://localhost:{port}/metrics")
     print("\nAvailable Agents:")
     print("   1. Report Manager - Planning & guidance")
     print("   2. Code Analyzer - Legacy code analysis")
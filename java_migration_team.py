@@ -4,7 +4,14 @@ Java Migration Team - Coordinates all agents for Java application modernization
 FIXED VERSION with enhanced code analysis reports
 """
 
-from typing import Dict, Any
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Generator, List, Optional, Sequence, Set, Tuple
 
 from agents import (
     ReportAgent,
@@ -12,6 +19,30 @@ from agents import (
     MigrationAgent,
     TestGeneratorAgent
 )
+from utils import get_config
+from utils.agent_config_loader import get_agent_config
+from utils.context_budget import get_prompt_size_report
+from utils.dependency_graph import DependencyGraph
+from utils.file_batcher import pack_small_files
+from utils.job_queue import JOB_DONE, JOB_FAILED, JobOutcome
+from utils.migration_manifest import (
+    ENTRY_FAILED,
+    MANIFEST_FILE_NAME,
+    MigrationManifest,
+    expected_output_path,
+    normalize_source_path
+)
+from utils.output_writer import WriteReport, get_output_writer
+from utils.response_cache import get_response_cache
+from utils.run_journal import JOURNAL_FILE_NAME, TASK_DONE, TASK_ERROR, RunJournal
+from utils.source_index import get_source_index
+from utils.telemetry import CallRecord, get_telemetry
+from utils.worker_farm import WorkerFarm
+
+ALL_PHASES = ("analysis", "migration", "tests")
+PLAN_FILE_NAME = ".migration_plan.json"
+PROFILE_FILE_NAME = "run_profile.json"
+QUEUE_FILE_NAME = ".migration_queue.db"
 
 class JavaMigrationTeam:
     """
@@ -23,7 +54,9 @@ class JavaMigrationTeam:
         self,
         source_path: str,
         target_path: str,
-        db_file: str = "agno.db"
+        db_file: str = "agno.db",
+        profile: bool = False,
+        farm: Optional[bool] = None
     ):
         """
         Initialize the migration team
@@ -32,59 +65,471 @@ class JavaMigrationTeam:
             source_path: Path to legacy Java project
             target_path: Path for modernized project
             db_file: Database file for agent memory
+            profile: Write the per-call telemetry of the run to migration_reports/run_profile.json
+            farm: Run migration and test jobs on the worker farm (default: farm.enabled from config.yml)
         """
         self.source_path = source_path
         self.target_path = target_path
         self.db_file = db_file
+        self.profile = profile
+        self.use_farm = get_config().is_farm_enabled() if farm is None else farm
+        self._farm: Optional[WorkerFarm] = None
 
-        # Initialize all agents
+        # Agents are created on first use so a run only pays for the ones it needs
         print("🚀 Initializing Java Migration Team...")
-        self.report_manager = ReportAgent(db_file)
-        self.code_analyzer = CodeAnalyzerAgent(db_file)
-        self.migration_agent = MigrationAgent(db_file)
-        self.test_generator = TestGeneratorAgent(db_file)
+        self._agents = {}
+        self._agents_lock = threading.Lock()
 
         # Results storage
-        self.results = {"analysis": {}}
+        self.results = {"analysis": {}, "migration": {}}
+        self._results_lock = threading.Lock()
+        self._journal: Optional[RunJournal] = None
+
+        print("✅ Migration team ready, agents are initialized on demand")
+
+    def _get_agent(self, name: str, agent_class):
+        """Create an agent on first use"""
+        with self._agents_lock:
+            if name not in self._agents:
+                print(f"   🤖 Initializing {agent_class.__name__}...")
+                self._agents[name] = agent_class(self.db_file)
+            return self._agents[name]
+
+    @property
+    def report_manager(self) -> ReportAgent:
+        return self._get_agent("report_manager", ReportAgent)
 
-        print("✅ All agents initialized successfully!")
+    @property
+    def code_analyzer(self) -> CodeAnalyzerAgent:
+        return self._get_agent("code_analyzer", CodeAnalyzerAgent)
 
-    def execute_migration(self):
+    @property
+    def migration_agent(self) -> MigrationAgent:
+        return self._get_agent("migration_agent", MigrationAgent)
+
+    @property
+    def test_generator(self) -> TestGeneratorAgent:
+        return self._get_agent("test_generator", TestGeneratorAgent)
+
+    def execute_migration(
+        self,
+        incremental: bool = False,
+        phases: Sequence[str] = ALL_PHASES,
+        resume: bool = False
+    ):
         """
         Execute the complete migration workflow
         
+        Args:
+            incremental: Only migrate and regenerate tests for sources added or
+                changed since the last run, and delete outputs of removed ones
+            phases: Phases to run ("analysis", "migration", "tests"); without the
+                analysis phase, migration uses the plan saved by the last analysis
+            resume: Continue the interrupted run recorded in the run journal with
+                its original parameters, skipping completed phases and files
+        
         Returns:
             Dictionary containing all migration results
         """
+        workflow = self._migration_workflow(
+            incremental, phases, resume, "",
+            run_analysis=self._phase_analysis,
+            run_migration=self._phase_migration,
+            run_tests=self._phase_test_generation
+        )
+        # Phase bodies run inside the workflow, their results are handed straight back
+        result = None
+        while True:
+            try:
+                result = workflow.send(result)
+            except StopIteration:
+                break
+
+    async def aexecute_migration(
+        self,
+        incremental: bool = False,
+        phases: Sequence[str] = ALL_PHASES,
+        resume: bool = False
+    ):
+        """
+        Execute the complete migration workflow on a single event loop
+
+        Model calls fan out concurrently, bounded by migration.max_in_flight.
+
+        Args:
+            incremental: Only migrate and regenerate tests for sources added or
+                changed since the last run, and delete outputs of removed ones
+            phases: Phases to run ("analysis", "migration", "tests"); without the
+                analysis phase, migration uses the plan saved by the last analysis
+            resume: Continue the interrupted run recorded in the run journal with
+                its original parameters, skipping completed phases and files
+        """
+        semaphore = asyncio.Semaphore(get_config().get_migration_max_in_flight())
+        workflow = self._migration_workflow(
+            incremental, phases, resume, " (async)",
+            run_analysis=self._aphase_analysis,
+            run_migration=lambda analysis_results: self._aphase_migration(analysis_results, semaphore),
+            run_tests=lambda files=None: self._aphase_test_generation(semaphore, files)
+        )
+        # Phase bodies return coroutines, awaited here and their outcome sent back into the workflow
+        try:
+            step = next(workflow)
+            while True:
+                try:
+                    result = await step
+                except BaseException as e:
+                    step = workflow.throw(e)
+                else:
+                    step = workflow.send(result)
+        except StopIteration:
+            pass
+
+    def _migration_workflow(
+        self,
+        incremental: bool,
+        phases: Sequence[str],
+        resume: bool,
+        mode: str,
+        run_analysis: Callable[[], Any],
+        run_migration: Callable[[Dict[str, Any]], Any],
+        run_tests: Callable[..., Any]
+    ) -> Generator[Any, Any, None]:
+        """
+        Phase sequencing shared by execute_migration and aexecute_migration
+
+        Journal, resume, incremental manifest, phase telemetry and output
+        commits live here; only the phase bodies differ between the two. The
+        workflow yields what each phase body returns and continues with the
+        value sent back, which the async driver awaits first.
+
+        Args:
+            mode: Suffix of the start banner
+            run_analysis: Analysis phase body, returning the analysis results
+            run_migration: Migration phase body, taking the migration plan
+            run_tests: Test generation phase body, taking the outputs to cover
+                (None for all), returning False if a step failed
+        """
+        phases = self._validate_phases(phases)
+
         print("\n" + "="*80)
-        print("🎯 STARTING JAVA MIGRATION PROCESS")
+        print(f"🎯 STARTING JAVA MIGRATION PROCESS{mode}")
         print("="*80 + "\n")
 
+        manifest = MigrationManifest(os.path.join(self.target_path, MANIFEST_FILE_NAME))
+        source_hashes = MigrationManifest.scan(self.source_path)
+        incremental, phases = self._start_journal(resume, incremental, phases, manifest)
+        migrated_outputs = None
+
         try:
             # Phase 1: Analysis
-            print("🔍 Phase 1: Code Analysis")
-            analysis_results = self._phase_analysis()
+            if "analysis" in phases and self._is_phase_completed("analysis"):
+                print("⏭️  Phase 1: Code Analysis already completed\n")
+                analysis_results = self._journal.phase_result("analysis")
+            elif "analysis" in phases:
+                print("🔍 Phase 1: Code Analysis")
+                with get_telemetry().phase("analysis"):
+                    if incremental:
+                        changes = self._detect_changes(manifest, source_hashes)
+                        analysis_results = (yield run_analysis()) if changes['added'] else {"structure": None, "files": {}}
+                        analysis_results = self._select_changed_files(manifest, changes, analysis_results)
+                    else:
+                        analysis_results = yield run_analysis()
+                    self._save_plan(analysis_results)
+                    self._commit_outputs()
+                    self._complete_phase("analysis", analysis_results)
+                    print("✅ Code analysis completed\n")
+            else:
+                analysis_results = self._load_plan()
             self.results["analysis"] = analysis_results
-            print("✅ Code analysis completed\n")
 
             # Phase 2: Migration
-            print("🔄 Phase 2: Code Migration")
-            self._phase_migration(analysis_results)
-            print("✅ Code migration completed\n")
+            if "migration" in phases and self._is_phase_completed("migration"):
+                print("⏭️  Phase 2: Code Migration already completed\n")
+                self._restore_migration_results()
+                migrated_outputs = self._update_manifest(manifest, source_hashes)
+            elif "migration" in phases:
+                print("🔄 Phase 2: Code Migration")
+                with get_telemetry().phase("migration"):
+                    yield run_migration(self._require_plan(analysis_results))
+                    self._commit_outputs()
+                    migrated_outputs = self._update_manifest(manifest, source_hashes)
+                    self._complete_phase("migration")
+                    print("✅ Code migration completed\n")
 
             # Phase 3: Test Generation
-            print("🧪 Phase 3: Test Generation")
-            self._phase_test_generation()
-            print("✅ Test generation completed\n")
+            if "tests" in phases and self._is_phase_completed("tests"):
+                print("⏭️  Phase 3: Test Generation already completed\n")
+            elif "tests" in phases:
+                print("🧪 Phase 3: Test Generation")
+                with get_telemetry().phase("tests"):
+                    generated = True
+                    if not incremental or migrated_outputs is None:
+                        generated = yield run_tests()
+                    elif migrated_outputs:
+                        generated = yield run_tests(migrated_outputs)
+                    else:
+                        print("   ✓ No changed sources, skipping test generation")
+                    self._commit_outputs()
+                    if generated:
+                        # A resumed run retries the test generation steps that failed
+                        self._complete_phase("tests")
+                    print("✅ Test generation completed\n")
+
+            self._report_cache_stats()
+            self._report_prompt_sizes()
+            self._report_telemetry()
+            self._close_journal(finished=True)
 
             print("="*80)
             print("🎉 MIGRATION PROCESS COMPLETED SUCCESSFULLY!")
             print("="*80 + "\n")
 
-
         except Exception as e:
             print(f"\n❌ Error during migration: {str(e)}")
+            # Outputs of the failed phase are never half written
+            get_output_writer().discard()
+            self._close_journal(finished=False)
             raise
+        finally:
+            self._stop_farm()
+
+    @staticmethod
+    def _validate_phases(phases: Sequence[str]) -> Sequence[str]:
+        unknown = set(phases) - set(ALL_PHASES)
+        if unknown:
+            raise ValueError(f"Unknown phases {sorted(unknown)}, expected any of {list(ALL_PHASES)}")
+        return phases
+
+    def _save_plan(self, analysis_results: Dict[str, Any]):
+        """Persist the analysis so a later run can migrate without re-analyzing"""
+        os.makedirs(self.target_path, exist_ok=True)
+        with open(os.path.join(self.target_path, PLAN_FILE_NAME), 'w', encoding='utf-8') as f:
+            json.dump(analysis_results, f, indent=2)
+
+    def _load_plan(self) -> Optional[Dict[str, Any]]:
+        """Load the analysis saved by the last analysis phase"""
+        plan_file = os.path.join(self.target_path, PLAN_FILE_NAME)
+        if not os.path.exists(plan_file):
+            return None
+        with open(plan_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _require_plan(analysis_results: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if analysis_results is None:
+            raise ValueError("No migration plan found, run the analysis phase first")
+        return analysis_results
+
+    def _use_incremental(self, incremental: bool, manifest: MigrationManifest) -> bool:
+        """An incremental run needs a manifest from a previous run"""
+        if incremental and not manifest.entries:
+            print("ℹ️  No migration manifest found, running a full migration\n")
+            return False
+        return incremental
+
+    def _start_journal(
+        self,
+        resume: bool,
+        incremental: bool,
+        phases: Sequence[str],
+        manifest: MigrationManifest
+    ) -> Tuple[bool, Sequence[str]]:
+        """Open the run journal; a resumed run continues with the parameters it was started with"""
+        self._journal = None
+        journal = None
+        if get_config().is_journal_enabled():
+            os.makedirs(self.target_path, exist_ok=True)
+            journal = RunJournal(os.path.join(self.target_path, JOURNAL_FILE_NAME))
+            params = journal.params() or {}
+            if resume and journal.is_resumable() and params.get('source') == os.path.abspath(self.source_path):
+                self._journal = journal
+                get_output_writer().attach_journal(journal)
+                self._report_resume(params)
+                return params['incremental'], params['phases']
+
+        if resume:
+            print("ℹ️  No interrupted run to resume, running from the start\n")
+        incremental = self._use_incremental(incremental, manifest)
+        if journal is not None:
+            journal.start({
+                "source": os.path.abspath(self.source_path),
+                "incremental": incremental,
+                "phases": list(phases)
+            })
+            self._journal = journal
+            get_output_writer().attach_journal(journal)
+        return incremental, phases
+
+    def _report_resume(self, params: Dict[str, Any]):
+        """Print where the interrupted run stopped"""
+        print(f"⏯️  Resuming the interrupted run (phases: {', '.join(params['phases'])}"
+              + (", incremental" if params['incremental'] else "") + ")")
+        progress = self._journal.progress()
+        for phase in params['phases']:
+            if self._journal.is_phase_completed(phase):
+                print(f"   ✓ {phase}: completed")
+            elif phase in progress:
+                counts = ", ".join(f"{count} {status}" for status, count in sorted(progress[phase].items()))
+                print(f"   ↻ {phase}: interrupted after {counts} task(s)")
+            else:
+                print(f"   ○ {phase}: not started")
+        print()
+
+    def _close_journal(self, finished: bool):
+        """Mark the journaled run as finished, or tell how to resume it"""
+        if self._journal is None:
+            return
+        if finished:
+            self._journal.finish()
+        else:
+            print("⏯️  Progress is journaled, continue with --resume")
+        get_output_writer().attach_journal(None)
+        self._journal.close()
+        self._journal = None
+
+    def _is_phase_completed(self, phase: str) -> bool:
+        return self._journal is not None and self._journal.is_phase_completed(phase)
+
+    def _complete_phase(self, phase: str, result: Any = None):
+        if self._journal is not None:
+            self._journal.complete_phase(phase, result)
+
+    def _completed_tasks(self, phase: str) -> Dict[str, Any]:
+        """Tasks of a phase the journaled run already completed"""
+        return self._journal.task_results(phase, TASK_DONE) if self._journal is not None else {}
+
+    def _record_task(self, phase: str, key: str, result: Any = None, status: str = TASK_DONE):
+        if self._journal is not None:
+            self._journal.record_task(phase, key, result, status)
+
+    def _detect_changes(self, manifest: MigrationManifest, source_hashes: Dict[str, str]) -> Dict[str, List[str]]:
+        """Diff sources against the manifest and delete outputs of removed sources"""
+        changes = manifest.diff(source_hashes)
+        print(f"   📋 {len(changes['added'])} added, {len(changes['changed'])} changed, "
+              f"{len(changes['unchanged'])} unchanged, {len(changes['removed'])} removed")
+
+        for source_file in changes['removed']:
+            for output_file in manifest.remove(source_file):
+                if os.path.exists(output_file):
+                    get_output_writer().delete(output_file)
+                    print(f"      🗑️  Removing {output_file} (source {source_file} deleted)")
+
+        self.results["changes"] = changes
+        return changes
+
+    def _select_changed_files(
+        self,
+        manifest: MigrationManifest,
+        changes: Dict[str, List[str]],
+        analysis_results: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Keep only added and changed files; changed files reuse their recorded suggestions"""
+        files = {
+            source_file: manifest.get_file_info(source_file)
+            for source_file in changes['changed']
+        }
+
+        analyzed_files = {
+            normalize_source_path(file_path): file_info
+            for file_path, file_info in analysis_results['files'].items()
+        }
+        for source_file in changes['added']:
+            if source_file in analyzed_files:
+                files[source_file] = analyzed_files[source_file]
+            else:
+                print(f"      ⚠️ No package suggestion for added file {source_file}, skipping")
+
+        return {"structure": analysis_results['structure'], "files": files}
+
+    def _update_manifest(self, manifest: MigrationManifest, source_hashes: Dict[str, str]) -> List[str]:
+        """
+        Record the migration of every scanned source in the manifest and return the new outputs
+
+        Failed files are kept with their suggestions so the next incremental run
+        retries them, and files no migration result covers (unplaced by the
+        analysis, or never migrated like .md files) with their hash only, so they
+        do not count as added and trigger a new analysis on every run.
+        """
+        migrated_outputs = []
+        migrated_files = set()
+        for file_path, result in self.results['migration'].items():
+            source_file = normalize_source_path(file_path)
+            migrated_files.add(source_file)
+            file_hash = source_hashes.get(source_file)
+            if file_hash is None and os.path.exists(source_file):
+                file_hash = MigrationManifest.hash_file(source_file)
+            if file_hash is None:
+                continue
+
+            if result['status'] != 'success':
+                manifest.record(source_file, file_hash, result['file_info'], [], status=ENTRY_FAILED)
+                continue
+
+            output_file = expected_output_path(self.target_path, result['file_info'])
+            outputs = [output_file] if os.path.exists(output_file) else []
+            manifest.record(source_file, file_hash, result['file_info'], outputs)
+            migrated_outputs.extend(outputs)
+
+        for source_file, file_hash in source_hashes.items():
+            if source_file in migrated_files:
+                continue
+            if source_file not in manifest.entries or manifest.is_skipped(source_file):
+                manifest.record_skipped(source_file, file_hash)
+
+        manifest.save()
+        return migrated_outputs
+
+    def _commit_outputs(self) -> WriteReport:
+        """Write the outputs staged during a phase, skipping files whose content did not change"""
+        report = get_output_writer().commit()
+        if report.written or report.unchanged or report.deleted:
+            print(f"   💾 Outputs: {report.summary()}")
+        totals = self.results.setdefault("outputs", {"written": 0, "unchanged": 0, "deleted": 0})
+        for key in totals:
+            totals[key] += len(getattr(report, key))
+        return report
+
+    def _report_cache_stats(self):
+        """Print response cache hit/miss counters"""
+        cache = get_response_cache()
+        if cache is None:
+            return
+
+        stats = cache.stats()
+        self.results["response_cache"] = stats
+        print(f"💾 Response cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries\n")
+
+    def _report_prompt_sizes(self):
+        """Print per-agent prompt sizes so growth of the context is visible"""
+        report = get_prompt_size_report()
+        self.results["prompt_sizes"] = report
+        for agent_name, sizes in report.items():
+            print(f"📏 {agent_name} prompt tokens over {sizes['calls']} calls: "
+                  f"first {sizes['first']}, last {sizes['last']}, max {sizes['max']}, avg {sizes['avg']}")
+        if report:
+            print()
+
+    def _report_telemetry(self):
+        """Print per-phase latency and tokens, and write the full run profile when profiling"""
+        telemetry = get_telemetry()
+        summary = telemetry.summary()
+        self.results["telemetry"] = summary
+        for phase, stats in summary["phases"].items():
+            print(f"⏱️  {phase}: {stats['wall_ms'] / 1000:.1f}s, {stats['calls']} model calls "
+                  f"({stats['cache_hits']} cached, {stats['retries']} retries, {stats['errors']} errors), "
+                  f"{stats['prompt_tokens']} prompt / {stats['completion_tokens']} completion tokens, "
+                  f"{stats['tool_calls']} tool calls, p50 {stats['p50_ms']:.0f} ms, p95 {stats['p95_ms']:.0f} ms")
+        for tier, stats in summary.get("tiers", {}).items():
+            print(f"🧭 Tier {tier}: {stats['routed']} files routed, {stats['escalated']} escalated to it, "
+                  f"{stats['calls']} model calls, {stats['model_ms'] / 1000:.1f}s in model calls, "
+                  f"p50 {stats['p50_ms']:.0f} ms, p95 {stats['p95_ms']:.0f} ms")
+        if self.profile:
+            profile_file = telemetry.write_summary(
+                os.path.join(self.target_path, "migration_reports", PROFILE_FILE_NAME)
+            )
+            print(f"📈 Run profile written to {profile_file}")
+        if summary["phases"]:
+            print()
 
     def _phase_analysis(self) -> Dict[str, Any]:
         """Phase 2: Analyze legacy code"""
@@ -96,38 +541,556 @@ class JavaMigrationTeam:
             "files": structure_analysis['files']
         }
 
+    async def _aphase_analysis(self) -> Dict[str, Any]:
+        """Phase 2: Analyze legacy code (async)"""
+        print("   📂 Analyzing project structure...")
+        structure_analysis = await self.code_analyzer.aanalyze_project_structure(self.source_path)
+
+        return {
+            "structure": structure_analysis['structure'],
+            "files": structure_analysis['files']
+        }
+
+    def _migration_schedule(self, files: Dict[str, Any]) -> Tuple[DependencyGraph, List[List[List[str]]]]:
+        """Dependency graph of the files to migrate, from the legacy source index, and its levels"""
+        graph = DependencyGraph(files, get_source_index(self.source_path))
+        levels = graph.levels()
+        cycles = sum(1 for batches in levels for batch in batches if len(batch) > 1)
+        print(f"   🧬 {len(levels)} dependency level(s)" + (f", {cycles} cycle(s) batched" if cycles else ""))
+        return graph, levels
+
+    def _migrated_dependencies(self, graph: DependencyGraph, file_path_to_read: str) -> Dict[str, str]:
+        """Legacy -> migrated type names of the already migrated files this file uses"""
+        renamed = {}
+        with self._results_lock:
+            for dependency in graph.edges.get(file_path_to_read, ()):
+                result = self.results['migration'].get(dependency)
+                if not result or result['status'] != 'success':
+                    continue
+
+                package = result['file_info'].get('package_suggestion', '')
+                type_name = os.path.splitext(result['file_info'].get('file_name_suggestion', ''))[0]
+                if '/' in package or not type_name:
+                    continue
+                migrated = f"{package}.{type_name}" if package else type_name
+                for legacy in graph.declared_types[dependency][:1]:
+                    renamed[legacy] = migrated
+        return renamed
+
     def _phase_migration(self, analysis_results: Dict[str, Any]):
-        """Phase 3: Migrate code"""
-        print(f"   🔄 Migrating {len(analysis_results['files'])} files...")
+        """Phase 3: Migrate code, one dependency level at a time"""
+        files = analysis_results['files']
+        number_of_files = len(files)
+        graph, levels = self._migration_schedule(files)
+        levels, done = self._pending_levels(levels)
+        workers = min(get_config().get_migration_workers(), max(number_of_files - len(done), 1))
+        mode = "on the worker farm" if self.use_farm else f"with {workers} worker(s)"
+        print(f"   🔄 Migrating {number_of_files - len(done)} files {mode}...")
+        count = len(done)
+
+        if self.use_farm:
+            self._farm_migration(graph, levels, files, count)
+        elif workers == 1:
+            for batches in levels:
+                groups, batches = self._pack_small_files(batches)
+                for group in groups:
+                    count += len(group)
+                    print(f"      [{count}/{number_of_files}] Migrating {len(group)} small files together: {', '.join(group)}")
+                    self._migrate_file_group(self.migration_agent, graph, group, files)
+                for batch in batches:
+                    for file_path_to_read in batch:
+                        count += 1
+                        print(f"      [{count}/{number_of_files}] Migrating: {file_path_to_read}")
+                        self._migrate_file(self.migration_agent, graph, file_path_to_read, files[file_path_to_read])
+        else:
+            worker_state = threading.local()
+
+            def worker_agent() -> MigrationAgent:
+                # Each worker thread owns its own agent so no conversation state is shared
+                if not hasattr(worker_state, 'agent'):
+                    worker_state.agent = MigrationAgent(self.db_file)
+                return worker_state.agent
+
+            def migrate_batch(batch: List[str]) -> List[Dict[str, Any]]:
+                agent = worker_agent()
+                return [
+                    self._migrate_file(agent, graph, file_path_to_read, files[file_path_to_read])
+                    for file_path_to_read in batch
+                ]
+
+            def migrate_group(group: List[str]) -> List[Dict[str, Any]]:
+                return self._migrate_file_group(worker_agent(), graph, group, files)
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="migration") as executor:
+                for batches in levels:
+                    # A level only starts once every level it depends on is done
+                    groups, batches = self._pack_small_files(batches)
+                    futures = {executor.submit(migrate_group, group): group for group in groups}
+                    futures.update({executor.submit(migrate_batch, batch): batch for batch in batches})
+                    for future in as_completed(futures):
+                        for file_path_to_read, result in zip(futures[future], future.result()):
+                            count += 1
+                            print(f"      [{count}/{number_of_files}] {result['status']}: {file_path_to_read}")
+
+        succeeded = sum(1 for r in self.results['migration'].values() if r['status'] == 'success')
+        print(f"   ✓ Migration completed for {succeeded}/{number_of_files} files")
+        self._report_local_rewrites()
+
+    def _restore_migration_results(self) -> Set[str]:
+        """Reload the file results recorded by the interrupted run and return the files it migrated"""
+        restored = self._journal.task_results("migration") if self._journal is not None else {}
+        with self._results_lock:
+            self.results['migration'].update(restored)
+        return {file_path for file_path, result in restored.items() if result['status'] == 'success'}
+
+    def _pending_levels(self, levels: List[List[List[str]]]) -> Tuple[List[List[List[str]]], Set[str]]:
+        """Drop the files the interrupted run already migrated from the schedule"""
+        done = self._restore_migration_results()
+        if not done:
+            return levels, done
+
+        print(f"   ⏭️  {len(done)} file(s) already migrated by the interrupted run")
+        pending = []
+        for batches in levels:
+            batches = [[f for f in batch if f not in done] for batch in batches]
+            batches = [batch for batch in batches if batch]
+            if batches:
+                pending.append(batches)
+        return pending, done
+
+    def _record_migration(self, file_path_to_read: str, result: Dict[str, Any]):
+        """Store the result of a file and journal it, so a resumed run does not migrate it again"""
+        with self._results_lock:
+            self.results['migration'][file_path_to_read] = result
+        self._record_task("migration", file_path_to_read, result,
+                          TASK_DONE if result['status'] == 'success' else TASK_ERROR)
+
+    def _migrate_file(
+        self,
+        migration_agent: MigrationAgent,
+        graph: DependencyGraph,
+        file_path_to_read: str,
+        file_info: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Migrate a single file, recording success or failure without raising"""
         try:
-            count = 1
-            for file_path_to_read, file_info in analysis_results['files'].items():
-                print(f"      [{count}/{len(analysis_results['files'])}] Migrating: {file_path_to_read}")
-                self.migration_agent.migrate_java_class(
-                    file_path_to_read, file_info
-                )
-                count += 1
+            summary = migration_agent.migrate_java_class(
+                file_path_to_read, file_info,
+                dependencies=self._migrated_dependencies(graph, file_path_to_read),
+                target_path=self.target_path
+            )
+            result = {"status": "success", "file_info": file_info, "summary": summary}
         except Exception as e:
-            print(f"          ⚠️ Error: {str(e)}")
-        number_of_files = len(analysis_results['files'])
-        print(f"   ✓ Migration completed for {number_of_files} files")
+            print(f"          ⚠️ Error migrating {file_path_to_read}: {str(e)}")
+            result = {"status": "error", "file_info": file_info, "error": str(e)}
+
+        self._record_migration(file_path_to_read, result)
+        return result
+
+    def _report_local_rewrites(self):
+        """List the files the local rewrite pass migrated without a model call"""
+        local_files = sorted(
+            file_path for file_path, result in self.results['migration'].items()
+            if result['status'] == 'success' and isinstance(result.get('summary'), dict)
+            and result['summary'].get('model_call') is False
+        )
+        if local_files:
+            print(f"   ⚡ {len(local_files)} file(s) fully migrated by local rewrites:")
+            for file_path in local_files:
+                print(f"      - {file_path}")
+
+    def _pack_small_files(self, batches: List[List[str]]) -> Tuple[List[List[str]], List[List[str]]]:
+        """Split the batches of a level into groups of small files sharing a prompt and the remaining batches"""
+        config = get_config()
+        if not config.is_batching_enabled():
+            return [], batches
 
-    def _phase_test_generation(self):
-        """Phase 4: Generate tests"""
+        # Files of an import cycle stay in their batch, they must see each other's new names
+        singles = [batch[0] for batch in batches if len(batch) == 1]
+        groups = [
+            group for group in pack_small_files(
+                singles,
+                config.get_batching_small_file_tokens(),
+                config.get_batching_max_tokens(),
+                config.get_batching_max_files()
+            )
+            if len(group) > 1
+        ]
+        packed = {file_path for group in groups for file_path in group}
+        return groups, [batch for batch in batches if batch[0] not in packed]
 
-        print(f"   🧪 Generating tests")
+    def _group_dependencies(self, graph: DependencyGraph, group: List[str]) -> Dict[str, str]:
+        dependencies = {}
+        for file_path_to_read in group:
+            dependencies.update(self._migrated_dependencies(graph, file_path_to_read))
+        return dependencies
 
+    def _migrate_file_group(
+        self,
+        migration_agent: MigrationAgent,
+        graph: DependencyGraph,
+        group: List[str],
+        files: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Migrate small files with one prompt, falling back to one prompt per file the response missed"""
         try:
-            print(f"          ⚙️  Generating BDD scenarios...")
-            self.test_generator.generate_bdd_scenarios()
+            summaries = migration_agent.migrate_file_batch(
+                group, {file_path_to_read: files[file_path_to_read] for file_path_to_read in group},
+                dependencies=self._group_dependencies(graph, group),
+                target_path=self.target_path
+            )
+        except Exception as e:
+            print(f"          ⚠️ Error migrating {len(group)} small files together: {str(e)}")
+            summaries = {}
+
+        results = []
+        for file_path_to_read in group:
+            if file_path_to_read not in summaries:
+                get_telemetry().record_retry()
+                results.append(self._migrate_file(migration_agent, graph, file_path_to_read, files[file_path_to_read]))
+                continue
+            result = {"status": "success", "file_info": files[file_path_to_read], "summary": summaries[file_path_to_read]}
+            self._record_migration(file_path_to_read, result)
+            results.append(result)
+        return results
+
+    def _get_farm(self) -> WorkerFarm:
+        """Start the worker farm on first use"""
+        if self._farm is None:
+            queue_file = get_config().get_farm_queue_file() or os.path.join(self.target_path, QUEUE_FILE_NAME)
+            self._farm = WorkerFarm(
+                queue_file, log_dir=os.path.join(self.target_path, "migration_reports", "worker_logs")
+            ).start()
+        return self._farm
+
+    def _stop_farm(self):
+        """Shut the worker farm down and report what each worker did"""
+        if self._farm is None:
+            return
+        self._farm.stop()
+        counts = self._farm.queue.counts()
+        workers = self._farm.queue.workers(status=None)
+        self._farm.close()
+        self._farm = None
+        self.results["farm"] = {"jobs": counts, "workers": workers}
+        print(f"🏭 Worker farm: {counts.get(JOB_DONE, 0)} job(s) done, {counts.get(JOB_FAILED, 0)} failed, "
+              f"{len(workers)} worker(s)")
+        for worker in workers:
+            print(f"   - {worker['id']} ({worker['model_host'] or 'default endpoint'}): "
+                  f"{worker['jobs_done']} job(s), {worker['status']}")
+        print()
+
+    def _collect_farm_outcome(self, outcome: JobOutcome) -> Tuple[bool, Any]:
+        """Stage the outputs and merge the telemetry of a finished job, returning (succeeded, value or error)"""
+        if outcome.status != JOB_DONE:
+            return False, outcome.error
+        writer, telemetry = get_output_writer(), get_telemetry()
+        for path, content in outcome.result['outputs'].items():
+            if content is None:
+                writer.delete(path)
+            else:
+                writer.write(path, content)
+        for call in outcome.result['calls']:
+            telemetry.record_call(CallRecord(**{**call, "phase": telemetry.current_phase}))
+        for _ in range(outcome.result['retries']):
+            telemetry.record_retry()
+        for tier, counts in outcome.result.get('routing', {}).items():
+            telemetry.record_routing(tier, count=counts['routed'])
+            telemetry.record_routing(tier, escalated=True, count=counts['escalated'])
+        return True, outcome.result['value']
+
+    def _submit_farm_job(self, graph: DependencyGraph, files: Dict[str, Any], chain: List[Tuple[str, List[str]]]) -> int:
+        """Queue the first job of a chain, with the new names of the dependencies migrated so far"""
+        kind, file_paths = chain[0]
+        if kind == "migrate_group":
+            payload = {
+                "file_paths": file_paths,
+                "file_infos": {file_path_to_read: files[file_path_to_read] for file_path_to_read in file_paths},
+                "dependencies": self._group_dependencies(graph, file_paths),
+            }
+        else:
+            payload = {
+                "file_path": file_paths[0],
+                "file_info": files[file_paths[0]],
+                "dependencies": self._migrated_dependencies(graph, file_paths[0]),
+            }
+        payload["target_path"] = self.target_path
+        return self._get_farm().submit(kind, payload)
+
+    def _farm_migration(self, graph: DependencyGraph, levels: List[List[List[str]]], files: Dict[str, Any], count: int):
+        """Migrate one dependency level at a time through the worker farm's queue"""
+        farm = self._get_farm()
+        number_of_files = len(files)
+        for batches in levels:
+            groups, batches = self._pack_small_files(batches)
+            # The jobs of a chain run one after the other, so the files of a cycle see each other's new names
+            chains = [[("migrate_group", group)] for group in groups]
+            chains += [[("migrate_file", [file_path_to_read]) for file_path_to_read in batch] for batch in batches]
+            running = {self._submit_farm_job(graph, files, chain): chain for chain in chains}
+
+            while running:
+                for job_id, outcome in farm.wait(running).items():
+                    chain = running.pop(job_id)
+                    (kind, file_paths), chain = chain[0], chain[1:]
+                    succeeded, value = self._collect_farm_outcome(outcome)
+
+                    if kind == "migrate_group":
+                        summaries = value if succeeded else {}
+                        if not succeeded:
+                            print(f"          ⚠️ Error migrating {len(file_paths)} small files together: {value}")
+                        missed = [file_path_to_read for file_path_to_read in file_paths if file_path_to_read not in summaries]
+                        for file_path_to_read in missed:
+                            get_telemetry().record_retry()
+                        chain = [("migrate_file", [file_path_to_read]) for file_path_to_read in missed] + chain
+                        results = {
+                            file_path_to_read: {"status": "success", "file_info": files[file_path_to_read], "summary": summary}
+                            for file_path_to_read, summary in summaries.items() if file_path_to_read in files
+                        }
+                    else:
+                        file_path_to_read = file_paths[0]
+                        if succeeded:
+                            result = {"status": "success", "file_info": files[file_path_to_read], "summary": value}
+                        else:
+                            print(f"          ⚠️ Error migrating {file_path_to_read}: {value}")
+                            result = {"status": "error", "file_info": files[file_path_to_read], "error": value}
+                        results = {file_path_to_read: result}
+
+                    for file_path_to_read, result in results.items():
+                        self._record_migration(file_path_to_read, result)
+                        count += 1
+                        print(f"      [{count}/{number_of_files}] {result['status']}: {file_path_to_read}")
+                    if chain:
+                        running[self._submit_farm_job(graph, files, chain)] = chain
+
+    def _generate_tests_step(self, step: str, files: Optional[List[str]]) -> Dict[str, Any]:
+        """Run a test generation step with the test generator, or as a job on the worker farm"""
+        if not self.use_farm:
+            return getattr(self.test_generator, f"generate_{step}")(files)
+
+        farm = self._get_farm()
+        job_id = farm.submit("generate_tests", {"step": step, "files": files})
+        succeeded, value = self._collect_farm_outcome(farm.wait([job_id])[job_id])
+        if not succeeded:
+            raise RuntimeError(value)
+        return value
+
+    async def _agenerate_tests_step(self, step: str, files: Optional[List[str]]) -> Dict[str, Any]:
+        """Run a test generation step (async)"""
+        if self.use_farm:
+            return await asyncio.to_thread(self._generate_tests_step, step, files)
+        return await getattr(self.test_generator, f"agenerate_{step}")(files)
+
+    @staticmethod
+    def _unit_tests_per_class() -> bool:
+        """Whether unit tests are generated class by class (unit_tests.mode of the test generator)"""
+        return get_agent_config('test_generator').get_unit_tests_config().get('mode', 'project') == 'per_class'
+
+    def _class_unit_tests_plan(self, files: Optional[List[str]], done: Dict[str, Any]):
+        """Migrated classes to cover, the ones still without tests, and a callback journaling each outcome"""
+        classes = TestGeneratorAgent.testable_classes(self.target_path, files)
+        pending = [class_file for class_file in classes if f"unit_tests:{class_file}" not in done]
+        print(f"          ⚙️  Generating unit tests for {len(pending)} classes"
+              + (f" ({len(classes) - len(pending)} already generated)" if len(pending) < len(classes) else "")
+              + "...")
+        finished: List[str] = []
+        failed: List[str] = []
+        lock = threading.Lock()
+
+        def on_result(class_file: str, result: Optional[Dict[str, Any]], error: Optional[Exception]):
+            with lock:
+                finished.append(class_file)
+                if error is None:
+                    self._record_task("tests", f"unit_tests:{class_file}", result)
+                    status = "success"
+                else:
+                    self._record_task("tests", f"unit_tests:{class_file}", str(error), TASK_ERROR)
+                    failed.append(class_file)
+                    status = f"error ({error})"
+                print(f"      [{len(classes) - len(pending) + len(finished)}/{len(classes)}] {status}: {class_file}")
+
+        return classes, pending, on_result, failed
+
+    def _generate_class_unit_tests(self, files: Optional[List[str]], done: Dict[str, Any]) -> bool:
+        """Generate unit tests class by class, returning whether every class got its tests"""
+        classes, pending, on_result, failed = self._class_unit_tests_plan(files, done)
+        if self.use_farm:
+            farm = self._get_farm()
+            running = {
+                farm.submit("generate_class_tests", {"class_file": class_file, "target_path": self.target_path}): class_file
+                for class_file in pending
+            }
+            while running:
+                for job_id, outcome in farm.wait(running).items():
+                    succeeded, value = self._collect_farm_outcome(outcome)
+                    on_result(running.pop(job_id), value if succeeded else None, None if succeeded else RuntimeError(value))
+        elif pending:
+            self.test_generator.generate_unit_tests_per_class(pending, self.target_path, on_result)
+        return self._finish_class_unit_tests(classes, failed)
+
+    async def _agenerate_class_unit_tests(self, files: Optional[List[str]], done: Dict[str, Any]) -> bool:
+        """Generate unit tests class by class (async)"""
+        if self.use_farm:
+            return await asyncio.to_thread(self._generate_class_unit_tests, files, done)
+        classes, pending, on_result, failed = self._class_unit_tests_plan(files, done)
+        if pending:
+            await self.test_generator.agenerate_unit_tests_per_class(pending, self.target_path, on_result)
+        return self._finish_class_unit_tests(classes, failed)
+
+    def _finish_class_unit_tests(self, classes: List[str], failed: List[str]) -> bool:
+        if failed:
+            print(f"          ⚠️  Unit tests of {len(failed)} classes failed, a resumed run retries them")
+            return False
+        self._record_task("tests", "unit_tests", {"classes": len(classes)})
+        return True
+
+    async def _aphase_migration(self, analysis_results: Dict[str, Any], semaphore: asyncio.Semaphore):
+        """Phase 3: Migrate code, one dependency level at a time (async)"""
+        files = analysis_results['files']
+        number_of_files = len(files)
+        graph, levels = self._migration_schedule(files)
+        levels, done = self._pending_levels(levels)
+        if self.use_farm:
+            # The workers are separate processes, the event loop only waits for their outcomes
+            print(f"   🔄 Migrating {number_of_files - len(done)} files on the worker farm...")
+            await asyncio.to_thread(self._farm_migration, graph, levels, files, len(done))
+        else:
+            print(f"   🔄 Migrating {number_of_files - len(done)} files asynchronously...")
+
+        async def migrate_batch(batch: List[str]):
+            # Files of a cycle go one after the other, so each sees the others' new names
+            for file_path_to_read in batch:
+                async with semaphore:
+                    await self._amigrate_file(graph, file_path_to_read, files[file_path_to_read])
+
+        async def migrate_group(group: List[str]):
+            async with semaphore:
+                await self._amigrate_file_group(graph, group, files)
+
+        for batches in ([] if self.use_farm else levels):
+            groups, batches = self._pack_small_files(batches)
+            await asyncio.gather(
+                *(migrate_group(group) for group in groups),
+                *(migrate_batch(batch) for batch in batches)
+            )
+
+        succeeded = sum(1 for r in self.results['migration'].values() if r['status'] == 'success')
+        print(f"   ✓ Migration completed for {succeeded}/{number_of_files} files")
+        self._report_local_rewrites()
+
+    async def _amigrate_file(
+        self,
+        graph: DependencyGraph,
+        file_path_to_read: str,
+        file_info: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Migrate a single file in its own agent session, recording success or failure without raising"""
+        session_id = "migration-" + hashlib.sha1(file_path_to_read.encode("utf-8")).hexdigest()[:16]
+        try:
+            summary = await self.migration_agent.amigrate_java_class(
+                file_path_to_read, file_info, session_id=session_id,
+                dependencies=self._migrated_dependencies(graph, file_path_to_read),
+                target_path=self.target_path
+            )
+            result = {"status": "success", "file_info": file_info, "summary": summary}
+        except Exception as e:
+            print(f"          ⚠️ Error migrating {file_path_to_read}: {str(e)}")
+            result = {"status": "error", "file_info": file_info, "error": str(e)}
+
+        print(f"      {result['status']}: {file_path_to_read}")
+        self._record_migration(file_path_to_read, result)
+        return result
+
+    async def _amigrate_file_group(
+        self,
+        graph: DependencyGraph,
+        group: List[str],
+        files: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Migrate small files with one prompt in its own agent session (async)"""
+        session_id = "migration-" + hashlib.sha1("\n".join(group).encode("utf-8")).hexdigest()[:16]
+        try:
+            summaries = await self.migration_agent.amigrate_file_batch(
+                group, {file_path_to_read: files[file_path_to_read] for file_path_to_read in group},
+                session_id=session_id,
+                dependencies=self._group_dependencies(graph, group),
+                target_path=self.target_path
+            )
+        except Exception as e:
+            print(f"          ⚠️ Error migrating {len(group)} small files together: {str(e)}")
+            summaries = {}
+
+        results = []
+        for file_path_to_read in group:
+            if file_path_to_read not in summaries:
+                get_telemetry().record_retry()
+                results.append(await self._amigrate_file(graph, file_path_to_read, files[file_path_to_read]))
+                continue
+            result = {"status": "success", "file_info": files[file_path_to_read], "summary": summaries[file_path_to_read]}
+            print(f"      {result['status']}: {file_path_to_read} (batched)")
+            self._record_migration(file_path_to_read, result)
+            results.append(result)
+        return results
+
+    def _phase_test_generation(self, files: Optional[List[str]] = None) -> bool:
+        """Phase 4: Generate tests, returning whether every step succeeded"""
+
+        print(f"   🧪 Generating tests" + (f" for {len(files)} changed files" if files else ""))
+
+        done = self._completed_tasks("tests")
+        try:
+            if "bdd_scenarios" in done:
+                print(f"          ⏭️  BDD scenarios already generated")
+            else:
+                print(f"          ⚙️  Generating BDD scenarios...")
+                self._record_task("tests", "bdd_scenarios", self._generate_tests_step("bdd_scenarios", files))
 
             # Generate unit tests
-            print(f"          ⚙️  Generating unit tests...")
-            self.test_generator.generate_unit_tests()
+            if "unit_tests" in done:
+                print(f"          ⏭️  Unit tests already generated")
+            elif self._unit_tests_per_class():
+                if not self._generate_class_unit_tests(files, done):
+                    return False
+            else:
+                print(f"          ⚙️  Generating unit tests...")
+                self._record_task("tests", "unit_tests", self._generate_tests_step("unit_tests", files))
+        except Exception as e:
+            print(f"          ⚠️  Error generating tests: {str(e)}")
+            return False
+
+        print(f"   ✓ Test generation completed")
+        return True
+
+    async def _aphase_test_generation(self, semaphore: asyncio.Semaphore, files: Optional[List[str]] = None) -> bool:
+        """Phase 4: Generate tests, returning whether every step succeeded (async)"""
+
+        print(f"   🧪 Generating tests" + (f" for {len(files)} changed files" if files else ""))
+
+        # Both prompts share the test generator session, so they run one after the other
+        done = self._completed_tasks("tests")
+        try:
+            if "bdd_scenarios" in done:
+                print(f"          ⏭️  BDD scenarios already generated")
+            else:
+                async with semaphore:
+                    print(f"          ⚙️  Generating BDD scenarios...")
+                    self._record_task("tests", "bdd_scenarios", await self._agenerate_tests_step("bdd_scenarios", files))
+
+            if "unit_tests" in done:
+                print(f"          ⏭️  Unit tests already generated")
+            elif self._unit_tests_per_class():
+                # Independent sessions: the classes run concurrently, up to unit_tests.max_parallel
+                if not await self._agenerate_class_unit_tests(files, done):
+                    return False
+            else:
+                async with semaphore:
+                    print(f"          ⚙️  Generating unit tests...")
+                    self._record_task("tests", "unit_tests", await self._agenerate_tests_step("unit_tests", files))
         except Exception as e:
             print(f"          ⚠️  Error generating tests: {str(e)}")
+            return False
 
         print(f"   ✓ Test generation completed")
+        return True
 
     def _generate_final_report(self) -> dict[str, Any]:
         """Phase 6: Generate final report"""
@@ -141,26 +1104,60 @@ class JavaMigrationTeam:
         return final_report
 
 def main():
-    """Example usage"""
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Migrate a legacy Java project with the multi-agent team")
+    parser.add_argument("-s", "--source", default="./legacy_java_project2", help="Path to legacy Java project")
+    parser.add_argument("-t", "--target", default="./modernized_java_project", help="Path for modernized project")
+    parser.add_argument(
+        "--phases",
+        nargs="+",
+        choices=ALL_PHASES,
+        default=list(ALL_PHASES),
+        help="Phases to run, e.g. '--phases analysis' or '--phases migration tests'"
+    )
+    parser.add_argument("--incremental", action="store_true", help="Only migrate sources changed since the last run")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the interrupted run recorded in the run journal, skipping completed phases and files"
+    )
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Run the asyncio pipeline")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write per-phase and per-call latency and token telemetry to migration_reports/run_profile.json"
+    )
+    parser.add_argument(
+        "--farm",
+        action="store_true",
+        default=None,
+        help="Run migration and test jobs on worker processes through a durable job queue (see farm in config.yml)"
+    )
+    args = parser.parse_args()
+
     print("\n" + "="*80)
     print("JAVA MIGRATION TEAM - Multi-Agent System")
     print("="*80 + "\n")
 
-    # Example configuration
-    source_path = "./legacy_java_project2"  # Replace with actual path
-    target_path = "./modernized_java_project"
+    source_path = args.source
+    target_path = args.target
 
     # Create team
     team = JavaMigrationTeam(
         source_path=source_path,
-        target_path=target_path
+        target_path=target_path,
+        profile=args.profile,
+        farm=args.farm
     )
 
     # Execute migration
-    team.execute_migration()
+    if args.use_async:
+        asyncio.run(team.aexecute_migration(incremental=args.incremental, phases=args.phases, resume=args.resume))
+    else:
+        team.execute_migration(incremental=args.incremental, phases=args.phases, resume=args.resume)
 
     print(f"\n✅ Migration completed!")
     print(f"📊 Results available in: {target_path}/migration_reports/")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
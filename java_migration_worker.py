@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Java Migration Worker - Runs migration and test jobs from the worker farm's queue
+
+Started by the farm supervisor of `java_migration_team.py --farm`, or by hand
+on another node to attach to a running farm through a shared filesystem:
+
+    python java_migration_worker.py --queue /shared/modernized/.migration_queue.db --model-host http://gpu2:11434
+
+Each worker owns its own agents and talks to one model endpoint. It leases a
+job, keeps the lease alive with heartbeats while working on it, and returns
+the result together with the outputs it staged, which the orchestrator
+commits with the rest of the phase.
+"""
+
+import argparse
+import os
+import socket
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, Optional
+
+from utils import get_config, reload_config
+from utils.job_queue import Job, JobQueue
+from utils.output_writer import get_output_writer
+from utils.response_cache import get_response_cache
+from utils.telemetry import get_telemetry
+
+IDLE_POLL_SECONDS = 0.05
+
+
+class MigrationWorker:
+    """Leases jobs from the queue and runs them with its own agents"""
+
+    def __init__(self, queue_file: str, worker_id: Optional[str] = None, model_host: str = ""):
+        """
+        Initialize migration worker
+
+        Args:
+            queue_file: SQLite job queue of the farm
+            worker_id: Name of the worker in the queue (default: node and pid)
+            model_host: Ollama endpoint of this worker's agents (default: model.host from config.yml)
+        """
+        config = get_config()
+        if model_host:
+            # Every agent of this process talks to its assigned endpoint
+            config.config.setdefault('model', {})['host'] = model_host
+        self.queue = JobQueue(queue_file)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.model_host = model_host
+        self.lease_seconds = config.get_farm_lease_seconds()
+        self.heartbeat_seconds = config.get_farm_heartbeat_seconds()
+        self.db_file = config.get_database_file()
+        self._agents: Dict[str, Any] = {}
+        self._stop = threading.Event()
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "migrate_file": self._migrate_file,
+            "migrate_group": self._migrate_group,
+            "generate_tests": self._generate_tests,
+            "generate_class_tests": self._generate_class_tests,
+        }
+
+    def _agent(self, name: str):
+        """Create an agent of this worker on first use"""
+        if name not in self._agents:
+            from agents import MigrationAgent, TestGeneratorAgent
+            agent_class = {"migration_agent": MigrationAgent, "test_generator": TestGeneratorAgent}[name]
+            self._agents[name] = agent_class(self.db_file)
+        return self._agents[name]
+
+    def _migrate_file(self, payload: Dict[str, Any]) -> Any:
+        return self._agent("migration_agent").migrate_java_class(
+            payload['file_path'], payload['file_info'],
+            dependencies=payload.get('dependencies'),
+            target_path=payload['target_path']
+        )
+
+    def _migrate_group(self, payload: Dict[str, Any]) -> Any:
+        return self._agent("migration_agent").migrate_file_batch(
+            payload['file_paths'], payload['file_infos'],
+            dependencies=payload.get('dependencies'),
+            target_path=payload['target_path']
+        )
+
+    def _generate_tests(self, payload: Dict[str, Any]) -> Any:
+        generate = getattr(self._agent("test_generator"), f"generate_{payload['step']}")
+        return generate(payload.get('files'))
+
+    def _generate_class_tests(self, payload: Dict[str, Any]) -> Any:
+        return self._agent("test_generator").generate_class_unit_tests(payload['class_file'], payload['target_path'])
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.heartbeat_seconds):
+            try:
+                self.queue.heartbeat(self.worker_id, self.lease_seconds)
+            except Exception as e:
+                print(f"⚠️  Heartbeat failed: {str(e)}")
+
+    def run_job(self, job: Job):
+        """Run one leased job and report its outcome to the queue"""
+        telemetry = get_telemetry()
+        telemetry.reset()
+        print(f"⚙️  Job {job.id} {job.kind} (attempt {job.attempts})")
+        try:
+            value = self.handlers[job.kind](job.payload)
+        except Exception as e:
+            get_output_writer().discard()
+            traceback.print_exc()
+            self.queue.fail(job.id, self.worker_id, f"{type(e).__name__}: {str(e)}")
+            print(f"❌ Job {job.id} failed: {str(e)}")
+            return
+
+        result = {
+            "value": value,
+            "outputs": get_output_writer().drain(),
+            "calls": telemetry.summary(include_calls=True)["calls"],
+            "retries": sum(telemetry.retries.values()),
+            "routing": telemetry.summary().get("tiers", {}),
+            "worker": self.worker_id,
+        }
+        if self.queue.complete(job.id, self.worker_id, result):
+            print(f"✅ Job {job.id} done")
+        else:
+            print(f"⚠️  Job {job.id} was handed to another worker meanwhile, result dropped")
+
+    def run(self, exit_when_idle: bool = False):
+        """
+        Lease and run jobs until the farm shuts down
+
+        Args:
+            exit_when_idle: Also exit as soon as the queue is empty
+        """
+        self.queue.register_worker(self.worker_id, socket.gethostname(), os.getpid(), self.model_host)
+        print(f"👷 Worker {self.worker_id} attached to {self.queue.queue_file}"
+              + (f", model endpoint {self.model_host}" if self.model_host else ""))
+        heartbeat = threading.Thread(target=self._heartbeat, name="worker-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            while True:
+                job = self.queue.lease(self.worker_id, self.lease_seconds)
+                if job is not None:
+                    self.run_job(job)
+                elif exit_when_idle or self.queue.is_shutdown():
+                    break
+                else:
+                    time.sleep(IDLE_POLL_SECONDS)
+        finally:
+            self._stop.set()
+            self.queue.unregister_worker(self.worker_id)
+            self.queue.close()
+            cache = get_response_cache()
+            if cache is not None:
+                cache.flush()
+        print(f"👋 Worker {self.worker_id} stopped")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run migration and test jobs from a worker farm queue")
+    parser.add_argument("--queue", required=True, help="Job queue file of the farm")
+    parser.add_argument("--config", default="config.yml", help="Configuration file")
+    parser.add_argument("--model-host", default="", help="Ollama endpoint of this worker (default: model.host)")
+    parser.add_argument("--worker-id", default=None, help="Name of this worker in the queue (default: node:pid)")
+    parser.add_argument("--exit-when-idle", action="store_true", help="Exit as soon as the queue is empty")
+    args = parser.parse_args()
+
+    reload_config(args.config)
+    MigrationWorker(args.queue, args.worker_id, args.model_host).run(args.exit_when_idle)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Shared fixtures: run the migration team against the in-process fake model backend"""
+
+import os
+import sys
+
+import pytest
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from utils import reload_config  # noqa: E402
+from utils.telemetry import get_telemetry  # noqa: E402
+
+
+@pytest.fixture
+def fake_backend(tmp_path, monkeypatch):
+    """config.yml of the repository pointed at the fake model and a scratch dir"""
+    with open(os.path.join(REPO_ROOT, "config.yml"), 'r') as f:
+        config = yaml.safe_load(f)
+    config['model']['provider'] = 'fake'
+    config['database']['file'] = str(tmp_path / "agno.db")
+    config['response_cache']['enabled'] = False
+    config['analysis']['index_dir'] = str(tmp_path / ".java_index")
+    config['journal']['enabled'] = False
+    config['farm']['enabled'] = False
+    # One model call per file, so a test can fail a single file
+    config['batching']['enabled'] = False
+
+    # Agent YAML files are read relative to the repository root
+    monkeypatch.chdir(REPO_ROOT)
+    _apply_config(config, tmp_path)
+    get_telemetry().reset()
+    yield config
+    reload_config(os.path.join(REPO_ROOT, "config.yml"))
+
+
+@pytest.fixture
+def apply_config(fake_backend, tmp_path):
+    """Reload the fake backend's config after a test changed it"""
+    return lambda: _apply_config(fake_backend, tmp_path)
+
+
+def _apply_config(config, tmp_path):
+    config_path = tmp_path / "config.yml"
+    with open(config_path, 'w') as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    reload_config(str(config_path))
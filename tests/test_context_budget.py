@@ -0,0 +1,43 @@
+"""History window and prompt-size tracking of the context budget"""
+
+from agno.agent import Agent
+
+from utils.agent_config_loader import get_agent_config
+from utils.agent_runner import AgentRunner
+from utils.context_budget import ContextBudget, get_prompt_size_report
+from utils.resource_registry import create_model
+from utils.response_cache import ResponseCache
+
+
+def test_session_over_max_tokens_keeps_history_off():
+    budget = ContextBudget("Budget probe", {"max_turns": 2, "max_tokens": 1000})
+    budget.record("long", 1500)
+    # Back under the budget: history stays off instead of pushing the next prompt over again
+    budget.record("long", 200)
+    budget.record("short", 900)
+
+    assert budget.history_options("long") == {"add_history_to_context": False}
+    assert budget.history_options("short") == {}
+
+
+def test_apply_sets_the_history_window():
+    agent = Agent(name="Budget probe")
+    ContextBudget("Budget probe", {"max_turns": 2, "strategy": "summarize"}).apply(agent)
+
+    assert agent.num_history_runs == 2
+    assert agent.enable_session_summaries
+
+
+def test_cache_hits_record_an_estimated_prompt_size(fake_backend, tmp_path):
+    agent_config = get_agent_config('report_manager')
+    agent = Agent(name="Cache probe", model=create_model(), system_message="You write reports.")
+    runner = AgentRunner(agent, agent_config, cache=ResponseCache(str(tmp_path / "cache.db")))
+    runner.context_budget.agent_name = "Cache probe"
+
+    runner.run("Summarize the migration", session_id="cached")
+    response = runner.run("Summarize the migration", session_id="cached")
+
+    assert response.cache_hit
+    sizes = get_prompt_size_report()["Cache probe"]
+    assert sizes["calls"] == 2
+    assert sizes["last"] > 0
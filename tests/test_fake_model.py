@@ -0,0 +1,38 @@
+"""The fake model backend builds and answers on the installed agno"""
+
+import asyncio
+
+from agno.agent import Agent
+
+from utils.fake_model import FakeModel
+from utils.resource_registry import create_model
+
+
+def _agent():
+    return Agent(name="Probe", model=create_model(), markdown=False)
+
+
+def test_fake_provider_builds(fake_backend):
+    model = create_model()
+    assert isinstance(model, FakeModel)
+    assert model.id == f"fake:{fake_backend['model']['name']}"
+
+
+def test_fake_provider_answers_a_run(fake_backend):
+    response = _agent().run("Say hello")
+    assert response.content
+    assert response.metrics.input_tokens > 0
+    assert response.metrics.output_tokens > 0
+
+
+def test_fake_provider_streams(fake_backend):
+    pieces = [
+        event.content for event in _agent().run("Say hello", stream=True)
+        if isinstance(getattr(event, 'content', None), str)
+    ]
+    assert "".join(pieces)
+
+
+def test_fake_provider_answers_an_async_run(fake_backend):
+    response = asyncio.run(_agent().arun("Say hello"))
+    assert response.content
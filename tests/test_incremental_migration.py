@@ -0,0 +1,56 @@
+"""Incremental re-migration driven by the migration manifest"""
+
+import os
+
+from benchmarks.project_generator import generate_project
+from java_migration_team import JavaMigrationTeam
+from utils.telemetry import get_telemetry
+
+
+def _migrate(source, target, db_file, incremental):
+    get_telemetry().reset()
+    team = JavaMigrationTeam(str(source), str(target), db_file=db_file)
+    team.execute_migration(incremental=incremental, phases=["analysis", "migration"])
+    return team, get_telemetry().summary()["phases"]
+
+
+def test_unchanged_tree_makes_no_analysis_calls(fake_backend, tmp_path):
+    source, target = tmp_path / "legacy", tmp_path / "modernized"
+    generate_project(str(source), 12, large_every=0, seed=1)
+    # Never migrated: must not count as added on every incremental run
+    (source / "README.md").write_text("# Legacy project\n")
+    db_file = fake_backend['database']['file']
+
+    _, phases = _migrate(source, target, db_file, incremental=False)
+    assert phases["analysis"]["calls"] > 0
+
+    team, phases = _migrate(source, target, db_file, incremental=True)
+    assert team.results["changes"]["added"] == []
+    assert team.results["changes"]["changed"] == []
+    assert phases["analysis"]["calls"] == 0
+    assert team.results["migration"] == {}
+
+
+def test_failed_file_is_retried_without_analysis(fake_backend, tmp_path, monkeypatch):
+    source, target = tmp_path / "legacy", tmp_path / "modernized"
+    generate_project(str(source), 12, large_every=0, seed=1)
+    db_file = fake_backend['database']['file']
+
+    from agents.migration_agent import MigrationAgent
+    migrate = MigrationAgent.migrate_java_class
+
+    def model_down(self, file_path, *args, **kwargs):
+        if os.path.basename(file_path).endswith("Servlet.java"):
+            raise RuntimeError("model down")
+        return migrate(self, file_path, *args, **kwargs)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(MigrationAgent, "migrate_java_class", model_down)
+        team, _ = _migrate(source, target, db_file, incremental=False)
+    failed = sorted(path for path, result in team.results["migration"].items() if result["status"] == "error")
+    assert failed
+
+    team, phases = _migrate(source, target, db_file, incremental=True)
+    assert sorted(team.results["changes"]["changed"]) == sorted(os.path.normpath(path) for path in failed)
+    assert phases["analysis"]["calls"] == 0
+    assert all(result["status"] == "success" for result in team.results["migration"].values())
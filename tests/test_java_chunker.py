@@ -0,0 +1,97 @@
+"""Splitting oversized classes into chunks and reassembling the migrated pieces"""
+
+from utils.java_chunker import reassemble_java_class, split_java_class, top_level_types
+
+SOURCE = """package com.acme.legacy;
+
+import java.util.List;
+
+/** Orders of a customer */
+public class OrderService {
+    private static final String NAME = "orders {";
+    private final List<String> orders;
+
+    static {
+        System.out.println("loaded");
+    }
+
+    public OrderService(List<String> orders) {
+        this.orders = orders;
+    }
+
+    public int count() {
+        return orders.size();
+    }
+
+    public String first() {
+        // a brace in a comment }
+        return orders.get(0);
+    }
+}
+
+class OrderHelper {
+    static String upper(String value) {
+        return value.toUpperCase();
+    }
+}
+"""
+
+
+def test_split_keeps_members_in_order_within_budget():
+    chunked = split_java_class(SOURCE, max_chunk_tokens=20)
+
+    assert chunked.header.rstrip().endswith("public class OrderService {")
+    assert len(chunked.chunks) > 1
+    joined = "\n".join(chunk.text for chunk in chunked.chunks)
+    assert joined.index("NAME") < joined.index("static {") < joined.index("count()") < joined.index("first()")
+    assert chunked.chunks[0].start_line == 7
+    assert chunked.has_secondary_types
+    assert top_level_types(chunked.trailer) == ["OrderHelper"]
+
+
+def test_unmigrated_pieces_reassemble_to_the_same_types():
+    chunked = split_java_class(SOURCE, max_chunk_tokens=20)
+
+    code, issues = reassemble_java_class(
+        chunked.header, [chunk.text for chunk in chunked.chunks], chunked.trailer
+    )
+
+    assert issues == []
+    assert top_level_types(code) == ["OrderService", "OrderHelper"]
+    assert code.count("package com.acme.legacy;") == 1
+    assert split_java_class(code, max_chunk_tokens=20).chunks[-1].text.strip().endswith("}")
+
+
+def test_piece_imports_are_merged_behind_the_header():
+    code, issues = reassemble_java_class(
+        "package com.acme.modern;\n\nimport java.util.List;\n\n@Service\npublic class OrderService {",
+        ["import java.util.Map;\nprivate Map<String, String> names;", "import java.util.List;\npublic int count() { return 0; }"],
+        "import java.util.Locale;\nclass OrderHelper {\n}"
+    )
+
+    assert issues == []
+    header, _ = code.split("@Service", 1)
+    assert header.count("import java.util.List;") == 1
+    assert "import java.util.Map;" in header and "import java.util.Locale;" in header
+    assert code.rstrip().endswith("class OrderHelper {\n}")
+
+
+def test_consistency_pass_reports_broken_pieces():
+    _, issues = reassemble_java_class(
+        "package com.acme.modern;\npublic class OrderService {",
+        ["", "package com.acme.modern;\npublic class OrderService {\nint count;\n}", "void run() {"],
+        ""
+    )
+
+    assert "chunk 1 returned no code" in issues
+    assert "chunk 2 repeats the declaration of OrderService" in issues
+    assert "package declared 2 times in reassembled class" in issues
+    assert "unbalanced braces in reassembled class" in issues
+
+
+def test_chunk_closing_the_class_early_is_reported():
+    _, issues = reassemble_java_class(
+        "public class OrderService {", ["int count;\n}\n\nclass Stray {"]
+    )
+
+    assert issues == ["top-level types OrderService, Stray in reassembled class, expected OrderService"]
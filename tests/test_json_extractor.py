@@ -0,0 +1,73 @@
+"""Finding and repairing the JSON answer of a model response"""
+
+import pytest
+
+from utils.json_extractor import extract_json, extract_json_objects
+from utils.json_stream import JsonStreamScanner
+
+
+def test_prefers_the_fenced_object_over_braces_in_prose_and_code():
+    response = (
+        "Here is the class {for context}:\n"
+        "```java\npublic class A { void run() { } }\n```\n"
+        "```json\n{\"file\": \"A.java\", \"changes\": [\"moved\"]}\n```\n"
+        "Also {\"note\": 1}"
+    )
+
+    assert extract_json(response) == {"file": "A.java", "changes": ["moved"]}
+
+
+def test_braces_inside_strings_do_not_end_the_object():
+    assert extract_json('{"code": "if (a) { b(); }", "ok": true} trailing') == {"code": "if (a) { b(); }", "ok": True}
+
+
+def test_trailing_commas_are_repaired():
+    objects = extract_json_objects('{"changes": ["a", "b",], "count": 2,}')
+
+    assert objects[0].value == {"changes": ["a", "b"], "count": 2}
+    assert objects[0].repaired
+
+
+def test_raw_newline_inside_a_string_is_repaired():
+    assert extract_json('{"summary": "first line\nsecond line\tindented"}') == {
+        "summary": "first line\nsecond line\tindented"
+    }
+
+
+def test_object_cut_off_by_the_end_of_the_response_is_closed():
+    assert extract_json('```json\n{"files": [{"name": "A.java", "notes": "cut') == {
+        "files": [{"name": "A.java", "notes": "cut"}]
+    }
+
+
+def test_object_cut_off_by_the_closing_fence_is_closed():
+    assert extract_json('```json\n{"changes": ["a", "b"\n```\nDone.') == {"changes": ["a", "b"]}
+
+
+def test_stray_brace_falls_back_to_the_objects_inside_it():
+    assert extract_json('Result { see below: {"status": "ok"}') == {"status": "ok"}
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        extract_json("Sorry, I cannot help with that.")
+
+
+def test_stream_scanner_stops_at_the_first_complete_object():
+    scanner = JsonStreamScanner()
+    chunks = ['Sure. {"file": "A.ja', 'va", "code": "x { y }"', ', "n": 1}', ' and some trailing prose']
+
+    done = [scanner.feed(chunk) for chunk in chunks]
+
+    assert done == [False, False, True, True]
+    assert scanner.result == '{"file": "A.java", "code": "x { y }", "n": 1}'
+
+
+def test_stream_scanner_skips_java_blocks_and_waits_until_armed():
+    scanner = JsonStreamScanner(armed=False)
+    assert not scanner.feed('{"before": "tool call"}')
+
+    scanner.arm()
+    assert not scanner.feed("static { init(); } {}")
+    assert scanner.feed('{"after": "tool call"}')
+    assert scanner.result == '{"after": "tool call"}'
@@ -0,0 +1,109 @@
+"""Rule-based package mapping and local rewrites, the passes that run before any model call"""
+
+import os
+
+import pytest
+
+from benchmarks.project_generator import generate_project
+from utils.agent_config_loader import get_agent_config
+from utils.java_rewriter import RewriteEngine
+from utils.package_mapper import PackageMapper
+
+DEPENDENCIES = {
+    "com.acme.legacy.order.Order": "com.acme.model.Order",
+    "com.acme.legacy.order.OrderRemote": "com.acme.service.OrderService",
+}
+
+
+@pytest.fixture
+def legacy(fake_backend, tmp_path):
+    source = tmp_path / "legacy"
+    generate_project(str(source), 12, large_every=0, seed=1)
+    (source / "README.md").write_text("# Legacy project\n")
+    return source
+
+
+@pytest.fixture
+def rewriter(fake_backend):
+    return RewriteEngine(get_agent_config('migration_specialist').get_local_rewrites_config())
+
+
+def _relative(result, source):
+    return {os.path.relpath(path, source): info for path, info in result.files.items()}
+
+
+def test_package_mapper_places_files_by_kind(legacy):
+    result = PackageMapper(str(legacy)).map()
+    files = _relative(result, legacy)
+
+    order = "ejb-module/src/main/java/com/acme/legacy/order/"
+    assert files[order + "OrderBean.java"] == {
+        "file_name_suggestion": "OrderServiceImpl.java", "package_suggestion": "com.acme.service"
+    }
+    assert files[order + "OrderRemote.java"]["file_name_suggestion"] == "OrderService.java"
+    assert files[order + "Order.java"]["package_suggestion"] == "com.acme.model"
+    assert files["war-module/src/main/java/com/acme/legacy/web/OrderServlet.java"] == {
+        "file_name_suggestion": "OrderController.java", "package_suggestion": "com.acme.controller"
+    }
+    assert files["war-module/src/main/webapp/order.jsp"]["file_name_suggestion"] == "order.html"
+
+
+def test_package_mapper_reports_unmapped_and_skipped_files(legacy):
+    result = PackageMapper(str(legacy)).map()
+
+    assert [os.path.relpath(path, legacy) for path in result.skipped] == ["README.md"]
+    unmapped = {os.path.relpath(path, legacy) for path in result.unmapped}
+    assert "ejb-module/src/main/resources/META-INF/persistence.xml" in unmapped
+    assert not unmapped & set(_relative(result, legacy))
+
+
+def test_rewriter_turns_a_stateless_bean_into_a_service(legacy, rewriter):
+    bean = legacy / "ejb-module/src/main/java/com/acme/legacy/order/OrderBean.java"
+
+    rewrite = rewriter.rewrite(
+        str(bean), {"file_name_suggestion": "OrderServiceImpl.java", "package_suggestion": "com.acme.service"},
+        DEPENDENCIES
+    )
+
+    assert rewrite.complete
+    assert rewrite.content.startswith("package com.acme.service;")
+    assert "@Service\npublic class OrderServiceImpl implements OrderService {" in rewrite.content
+    assert "import com.acme.model.Order;" in rewrite.content
+    assert "javax.ejb" not in rewrite.content
+
+
+def test_rewriter_turns_a_mapped_servlet_into_a_controller(legacy, rewriter):
+    servlet = legacy / "war-module/src/main/java/com/acme/legacy/web/OrderServlet.java"
+
+    rewrite = rewriter.rewrite(
+        str(servlet), {"file_name_suggestion": "OrderController.java", "package_suggestion": "com.acme.controller"},
+        DEPENDENCIES
+    )
+
+    assert rewrite.complete
+    assert "@Controller\npublic class OrderController {" in rewrite.content
+    assert '@GetMapping("/order")' in rewrite.content
+    assert "@Autowired\n    private OrderService service;" in rewrite.content
+    assert "import jakarta.servlet.http.HttpServletRequest;" in rewrite.content
+    assert "HttpServlet;" not in rewrite.content
+
+
+def test_rewriter_leaves_residual_constructs_to_the_model(tmp_path, rewriter):
+    lookup = tmp_path / "Lookup.java"
+    lookup.write_text(
+        "package com.acme.legacy;\n\nimport javax.naming.InitialContext;\n\n"
+        "public class Lookup {\n    Object find() throws Exception {\n"
+        "        return new InitialContext().lookup(\"java:comp/env/jdbc/db\");\n    }\n}\n"
+    )
+
+    rewrite = rewriter.rewrite(str(lookup), {"file_name_suggestion": "Lookup.java", "package_suggestion": "com.acme"})
+
+    assert not rewrite.complete
+    assert rewrite.residual == ["JNDI lookup"]
+    assert rewrite.content.startswith("package com.acme;")
+
+
+def test_rewriter_drops_ejb_descriptors(legacy, rewriter):
+    rewrite = rewriter.rewrite(str(legacy / "ejb-module/src/main/resources/META-INF/ejb-jar.xml"), {})
+
+    assert rewrite.dropped and rewrite.complete
@@ -0,0 +1,69 @@
+"""Escalation of unusable answers across model tiers, and files no tier could migrate"""
+
+import os
+
+import pytest
+
+from benchmarks.project_generator import generate_project
+from java_migration_team import JavaMigrationTeam
+from utils import fake_model
+from utils.agent_config_loader import AgentConfigLoader
+from utils.java_rewriter import LocalRewrite, RewriteEngine
+from utils.migration_manifest import ENTRY_FAILED, MANIFEST_FILE_NAME, MigrationManifest
+from utils.telemetry import get_telemetry
+
+UNUSABLE = "Sorry, I cannot help with that."
+
+
+@pytest.fixture
+def legacy_project(fake_backend, tmp_path, monkeypatch):
+    source = tmp_path / "legacy"
+    generate_project(str(source), 12, large_every=0, seed=1)
+    # Every file goes to the model
+    monkeypatch.setattr(RewriteEngine, "rewrite", lambda self, file_path, *args, **kwargs: LocalRewrite(file_path))
+    return source
+
+
+def _answer_unusable(monkeypatch, when):
+    reply = fake_model.FakeModel._reply
+
+    def unusable_reply(self, messages):
+        content, metrics = reply(self, messages)
+        if when(self, fake_model._last_user_prompt(messages)):
+            content = UNUSABLE
+        return content, metrics
+    monkeypatch.setattr(fake_model.FakeModel, "_reply", unusable_reply)
+
+
+def _migrate(source, target, db_file):
+    team = JavaMigrationTeam(str(source), str(target), db_file=db_file)
+    team.execute_migration(phases=["analysis", "migration"])
+    return team
+
+
+def test_unusable_batch_answer_escalates(fake_backend, apply_config, legacy_project, tmp_path, monkeypatch):
+    fake_backend['routing']['enabled'] = True
+    fake_backend['batching']['enabled'] = True
+    apply_config()
+    small_model = fake_backend['routing']['tiers'][0]['model']
+    _answer_unusable(monkeypatch, lambda model, prompt: model.id == f"fake:{small_model}" and "### FILE:" in prompt)
+
+    team = _migrate(legacy_project, tmp_path / "modernized", fake_backend['database']['file'])
+    tiers = get_telemetry().summary()["tiers"]
+    assert tiers["large"]["escalated"] > 0
+    assert all(result["status"] == "success" for result in team.results["migration"].values())
+
+
+@pytest.mark.parametrize("inline_sources", [True, False])
+def test_unparseable_answer_is_recorded_as_failed(fake_backend, legacy_project, tmp_path, monkeypatch, inline_sources):
+    # Inline: no code block in the reply; otherwise: no JSON summary
+    monkeypatch.setattr(AgentConfigLoader, "get_inline_sources_config", lambda self: {"enabled": inline_sources})
+    _answer_unusable(monkeypatch, lambda model, prompt: "Servlet.java" in prompt and prompt.startswith("Migrate the file"))
+    target = tmp_path / "modernized"
+
+    team = _migrate(legacy_project, target, fake_backend['database']['file'])
+    failed = sorted(path for path, result in team.results["migration"].items() if result["status"] == "error")
+    assert failed
+    assert all(os.path.basename(path).endswith("Servlet.java") for path in failed)
+    manifest = MigrationManifest(os.path.join(str(target), MANIFEST_FILE_NAME))
+    assert all(manifest.entries[os.path.normpath(path)]["status"] == ENTRY_FAILED for path in failed)
@@ -0,0 +1,45 @@
+"""Responses served from the cache by AgentRunner"""
+
+from types import SimpleNamespace
+
+from agno.agent import Agent
+
+from utils.agent_config_loader import get_agent_config
+from utils.agent_runner import AgentRunner
+from utils.resource_registry import create_model
+from utils.response_cache import ResponseCache
+
+
+def _runner(tmp_path, answer):
+    agent = Agent(name="Cache probe", model=create_model())
+    runner = AgentRunner(agent, get_agent_config('code_analyzer'), cache=ResponseCache(str(tmp_path / "cache.db")))
+    runner.streaming = {'enabled': False}
+    calls = []
+
+    def run(prompt, **kwargs):
+        calls.append(prompt)
+        return answer
+    agent.run = run
+    return runner, calls
+
+
+def test_repeated_prompt_is_served_from_cache(fake_backend, tmp_path):
+    runner, calls = _runner(tmp_path, SimpleNamespace(content='{"modules": []}', tools=[]))
+
+    runner.run("Analyze the project")
+    response = runner.run("Analyze the project")
+
+    assert response.cache_hit
+    assert len(calls) == 1
+
+
+def test_answer_built_through_tools_is_not_cached(fake_backend, tmp_path):
+    # The tree the tool read may change between runs, the prompt would not
+    tool_call = SimpleNamespace(tool_name="get_project_structure")
+    runner, calls = _runner(tmp_path, SimpleNamespace(content='{"modules": []}', tools=[tool_call]))
+
+    runner.run("Analyze the project")
+    response = runner.run("Analyze the project")
+
+    assert not getattr(response, 'cache_hit', False)
+    assert len(calls) == 2
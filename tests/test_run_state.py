@@ -0,0 +1,142 @@
+"""Staged outputs, the run journal and the worker farm's job queue"""
+
+import os
+
+import pytest
+
+from utils.job_queue import JOB_DONE, JOB_FAILED, JOB_LEASED, JOB_PENDING, JobQueue
+from utils.output_writer import OutputWriter
+from utils.run_journal import TASK_DONE, TASK_ERROR, RunJournal
+
+
+def test_staged_writes_reach_disk_only_on_commit(tmp_path):
+    writer = OutputWriter()
+    output = tmp_path / "src" / "A.java"
+
+    writer.write(str(output), "class A {}\n")
+    assert not output.exists()
+    assert writer.read(str(output)) == "class A {}\n"
+
+    report = writer.commit()
+    assert output.read_text() == "class A {}\n"
+    assert report.written == [str(output)]
+
+    writer.write(str(output), "class A {}\n")
+    assert writer.commit().unchanged == [str(output)]
+
+
+def test_discard_rolls_back_staged_writes_and_deletions(tmp_path):
+    kept = tmp_path / "Kept.java"
+    kept.write_text("class Kept {}\n")
+    writer = OutputWriter()
+
+    writer.write(str(tmp_path / "New.java"), "class New {}\n")
+    writer.write(str(kept), "class Changed {}\n")
+    writer.delete(str(kept))
+    writer.discard()
+    report = writer.commit()
+
+    assert not (tmp_path / "New.java").exists()
+    assert kept.read_text() == "class Kept {}\n"
+    assert report.written == report.deleted == []
+
+
+def test_failed_commit_leaves_previous_outputs_untouched(tmp_path):
+    first = tmp_path / "A.java"
+    first.write_text("class A {}\n")
+    # A file where a directory is needed makes the second write fail
+    (tmp_path / "blocked").write_text("")
+    writer = OutputWriter()
+
+    writer.write(str(first), "class A { int changed; }\n")
+    writer.write(str(tmp_path / "blocked" / "B.java"), "class B {}\n")
+    with pytest.raises(OSError):
+        writer.commit()
+
+    assert first.read_text() == "class A {}\n"
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+def test_journal_resumes_from_the_last_recorded_task(tmp_path):
+    journal_file = str(tmp_path / "journal.db")
+    journal = RunJournal(journal_file)
+    journal.start({"source": "legacy", "phases": ["analysis", "migration"]})
+    journal.complete_phase("analysis", {"files": 3})
+    journal.record_task("migration", "A.java", {"file": "A.java"})
+    journal.record_task("migration", "B.java", "model down", TASK_ERROR)
+    writer = OutputWriter()
+    writer.attach_journal(journal)
+    writer.write(str(tmp_path / "out" / "A.java"), "class A {}\n")
+    journal.close()
+
+    # The process died here; a new one opens the same journal
+    resumed = RunJournal(journal_file)
+    assert resumed.is_resumable()
+    assert resumed.params() == {"source": "legacy", "phases": ["analysis", "migration"]}
+    assert resumed.is_phase_completed("analysis")
+    assert resumed.phase_result("analysis") == {"files": 3}
+    assert not resumed.is_phase_completed("migration")
+    assert resumed.task_results("migration", TASK_DONE) == {"A.java": {"file": "A.java"}}
+    assert resumed.task_results("migration", TASK_ERROR) == {"B.java": "model down"}
+
+    writer = OutputWriter()
+    writer.attach_journal(resumed)
+    writer.commit()
+    assert (tmp_path / "out" / "A.java").read_text() == "class A {}\n"
+    assert resumed.staged_outputs() == {}
+
+    resumed.finish()
+    assert not resumed.is_resumable()
+    resumed.close()
+
+
+def _status(queue, job_id):
+    return queue.counts(), queue.finished([job_id]).get(job_id)
+
+
+def test_expired_lease_puts_the_job_back_in_the_queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.db"))
+    queue.register_worker("w1", "node", 1)
+    queue.register_worker("w2", "node", 2)
+    job_id = queue.enqueue("migrate_file", {"file_path": "A.java"}, max_attempts=2)
+
+    job = queue.lease("w1", lease_seconds=-1)
+    assert job.id == job_id and job.attempts == 1
+    assert queue.counts() == {JOB_LEASED: 1}
+    assert queue.requeue_expired() == 1
+    assert queue.counts() == {JOB_PENDING: 1}
+
+    job = queue.lease("w2", lease_seconds=60)
+    assert job.attempts == 2
+    # The first worker lost its lease and cannot complete the job any more
+    assert not queue.complete(job_id, "w1", {"late": True})
+    assert queue.complete(job_id, "w2", {"file": "A.java"})
+    outcome = queue.finished([job_id])[job_id]
+    assert (outcome.status, outcome.result, outcome.attempts) == (JOB_DONE, {"file": "A.java"}, 2)
+    queue.close()
+
+
+def test_job_is_given_up_once_its_attempts_are_used(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.db"))
+    queue.register_worker("w1", "node", 1)
+    job_id = queue.enqueue("migrate_file", {"file_path": "A.java"}, max_attempts=1)
+
+    queue.lease("w1", lease_seconds=-1)
+    queue.requeue_expired()
+
+    outcome = queue.finished([job_id])[job_id]
+    assert (outcome.status, outcome.error) == (JOB_FAILED, "Lease expired")
+    assert queue.lease("w1", lease_seconds=60) is None
+    queue.close()
+
+
+def test_silent_worker_is_reaped_and_its_job_requeued(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.db"))
+    queue.register_worker("w1", "node", 1)
+    queue.enqueue("migrate_file", {"file_path": "A.java"})
+    queue.lease("w1", lease_seconds=60)
+
+    assert queue.reap_silent_workers(timeout=-1) == ["w1"]
+    assert queue.counts() == {JOB_PENDING: 1}
+    assert queue.workers() == []
+    queue.close()
@@ -3,6 +3,7 @@
 Agent Configuration Loader for Java Migration System
 """
 
+import hashlib
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -93,6 +94,34 @@ class AgentConfigLoader:
         """Get identity priming configuration"""
         return self.config.get('identity_priming', {})
     
+    def get_config_hash(self) -> str:
+        """Get content hash of the agent YAML configuration file"""
+        return hashlib.sha256(self.config_file.read_bytes()).hexdigest()
+    
+    def get_response_cache_config(self) -> Dict[str, Any]:
+        """Get response cache configuration (per-agent opt-out)"""
+        return self.config.get('response_cache', {})
+    
+    def get_streaming_config(self) -> Dict[str, Any]:
+        """Get response streaming configuration (enabled, early_stop, progress)"""
+        return self.config.get('streaming', {})
+    
+    def get_context_budget_config(self) -> Dict[str, Any]:
+        """Get conversation history budget (max_turns, max_tokens, strategy)"""
+        return self.config.get('context_budget', {})
+    
+    def get_inline_sources_config(self) -> Dict[str, Any]:
+        """Get inline source configuration (embed sources in prompts instead of FileTools reads)"""
+        return self.config.get('inline_sources', {})
+    
+    def get_local_rewrites_config(self) -> Dict[str, Any]:
+        """Get local rewrite rules applied before the model (drop_files, jakarta_packages, annotations, ...)"""
+        return self.config.get('local_rewrites', {})
+    
+    def get_unit_tests_config(self) -> Dict[str, Any]:
+        """Get unit test generation configuration (mode: per_class or project, max_parallel)"""
+        return self.config.get('unit_tests', {})
+    
     def get_all(self) -> Dict[str, Any]:
         """Get complete agent configuration"""
         return self.config
@@ -0,0 +1,307 @@
+"""
+Agent Runner for Java Migration System
+
+Single entry point used by the agent wrappers to send prompts to their agno
+Agent, with the response cache in front of the model and the agent's context
+budget applied to its conversation history. With streaming enabled, prompts
+that expect a JSON answer stop generation as soon as the object is complete.
+Answers the model built through tool calls are never cached. Every call,
+cached or not, is timed and recorded in the run telemetry.
+"""
+
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from agno.run.agent import RunEvent, RunOutput
+
+from .context_budget import ContextBudget
+from .java_chunker import estimate_tokens
+from .json_stream import JsonStreamScanner
+from .response_cache import ResponseCache, get_response_cache
+from .telemetry import CallRecord, get_telemetry
+
+
+@dataclass
+class CachedRunOutput:
+    """Minimal stand-in for agno's RunOutput when served from cache"""
+    content: str
+    cache_hit: bool = True
+
+
+@dataclass
+class StreamedRunOutput:
+    """Content of a streamed run stopped once its JSON answer was complete"""
+    content: str
+    stopped_early: bool = True
+    tool_calls: int = 0
+    first_token_ms: Optional[float] = None
+
+
+class StreamProgress:
+    """Live, throttled character count of a streaming response"""
+
+    INTERVAL = 0.5
+
+    def __init__(self, agent_name: str, enabled: bool):
+        self.agent_name = agent_name
+        self.enabled = enabled
+        self.chars = 0
+        self.tool_calls = 0
+        self.first_token_ms: Optional[float] = None
+        self._start = time.perf_counter()
+        self._last = 0.0
+
+    def update(self, chunk: str):
+        if self.first_token_ms is None:
+            self.first_token_ms = (time.perf_counter() - self._start) * 1000
+        self.chars += len(chunk)
+        now = time.monotonic()
+        if self.enabled and now - self._last >= self.INTERVAL:
+            self._last = now
+            sys.stdout.write(f"\r      ⏳ {self.agent_name}: {self.chars} chars received")
+            sys.stdout.flush()
+
+    def done(self, stopped_early: bool = False):
+        if self.enabled and self._last:
+            suffix = ", stopped at complete JSON" if stopped_early else ""
+            sys.stdout.write(f"\r      ⏳ {self.agent_name}: {self.chars} chars received{suffix}\n")
+            sys.stdout.flush()
+
+
+class AgentRunner:
+    """Run prompts against an agno Agent, serving repeated prompts from cache"""
+
+    def __init__(self, agent, agent_config, cache: Optional[ResponseCache] = None, tier: Optional[str] = None):
+        """
+        Initialize agent runner
+
+        Args:
+            agent: agno Agent to run prompts against
+            agent_config: AgentConfigLoader of the wrapped agent
+            cache: Response cache to use (default: global cache from config.yml)
+            tier: Model tier the agent belongs to, when model routing is enabled
+        """
+        self.agent = agent
+        self.agent_config = agent_config
+        self.tier = tier
+        cache_enabled = agent_config.get_response_cache_config().get('enabled', True)
+        self.cache = (cache or get_response_cache()) if cache_enabled else None
+        self.context_budget = ContextBudget(
+            agent_config.get_basic_config()['name'],
+            agent_config.get_context_budget_config()
+        )
+        self.context_budget.apply(agent)
+        self.streaming = agent_config.get_streaming_config()
+
+    def run(self, prompt: str, use_cache: bool = True, expect_json: bool = False, **kwargs) -> Any:
+        """
+        Run a prompt, returning a cached response when available
+
+        Args:
+            prompt: Prompt to send
+            use_cache: Serve and store the response through the response cache
+            expect_json: The answer is a JSON object, so a stream may stop once it is complete
+        """
+        start = time.perf_counter()
+        key = self._cache_key(prompt) if use_cache else None
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                response = CachedRunOutput(cached)
+                self._record_call(prompt, start, response)
+                self.context_budget.record(kwargs.get('session_id'), self._prompt_tokens(prompt, response))
+                return response
+
+        kwargs = {**self.context_budget.history_options(kwargs.get('session_id')), **kwargs}
+        try:
+            if self.streaming.get('enabled', False):
+                response = self._run_stream(prompt, expect_json, **kwargs)
+            else:
+                response = self.agent.run(prompt, **kwargs)
+        except Exception as e:
+            self._record_call(prompt, start, error=e)
+            raise
+        self._record_call(prompt, start, response)
+        self.context_budget.record(kwargs.get('session_id'), self._prompt_tokens(prompt, response))
+        self._store(key, response)
+        return response
+
+    async def arun(self, prompt: str, use_cache: bool = True, expect_json: bool = False, **kwargs) -> Any:
+        """Async twin of run"""
+        start = time.perf_counter()
+        key = self._cache_key(prompt) if use_cache else None
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                response = CachedRunOutput(cached)
+                self._record_call(prompt, start, response)
+                self.context_budget.record(kwargs.get('session_id'), self._prompt_tokens(prompt, response))
+                return response
+
+        kwargs = {**self.context_budget.history_options(kwargs.get('session_id')), **kwargs}
+        try:
+            if self.streaming.get('enabled', False):
+                response = await self._arun_stream(prompt, expect_json, **kwargs)
+            else:
+                response = await self.agent.arun(prompt, **kwargs)
+        except Exception as e:
+            self._record_call(prompt, start, error=e)
+            raise
+        self._record_call(prompt, start, response)
+        self.context_budget.record(kwargs.get('session_id'), self._prompt_tokens(prompt, response))
+        self._store(key, response)
+        return response
+
+    def run_many(self, prompts: List[str], max_parallel: int, session_prefix: str, **kwargs) -> List[Any]:
+        """
+        Run independent prompts concurrently, each in its own session
+
+        Args:
+            prompts: Prompts to run
+            max_parallel: Prompts in flight at the same time
+            session_prefix: Prefix of the per-prompt session ids
+
+        Returns:
+            Responses in prompt order
+        """
+        with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(prompts)))) as executor:
+            futures = [
+                executor.submit(self.run, prompt, session_id=f"{session_prefix}-{number}", **kwargs)
+                for number, prompt in enumerate(prompts)
+            ]
+            return [future.result() for future in futures]
+
+    async def arun_many(self, prompts: List[str], max_parallel: int, session_prefix: str, **kwargs) -> List[Any]:
+        """Async twin of run_many"""
+        semaphore = asyncio.Semaphore(max(1, max_parallel))
+
+        async def run_one(number: int, prompt: str) -> Any:
+            async with semaphore:
+                return await self.arun(prompt, session_id=f"{session_prefix}-{number}", **kwargs)
+
+        return await asyncio.gather(*(run_one(number, prompt) for number, prompt in enumerate(prompts)))
+
+    def _stream_state(self, expect_json: bool):
+        early_stop = self.streaming.get('early_stop', True) if expect_json else False
+        # after_tools: a tool-using agent's answer only counts once its tools have run
+        scanner = JsonStreamScanner(armed=early_stop is True) if early_stop else None
+        progress = StreamProgress(self.agent.name, self.streaming.get('progress', False))
+        return scanner, progress
+
+    @staticmethod
+    def _consume(event: Any, scanner: Optional[JsonStreamScanner], progress: StreamProgress) -> bool:
+        """Handle one stream event, returning True once the JSON answer is complete"""
+        event_type = getattr(event, 'event', None)
+        if event_type == RunEvent.tool_call_started.value:
+            progress.tool_calls += 1
+            if scanner:
+                # Text before a tool call is not the final answer
+                scanner.reset()
+        elif event_type == RunEvent.tool_call_completed.value and scanner:
+            scanner.arm()
+        elif event_type == RunEvent.run_content.value and isinstance(event.content, str):
+            progress.update(event.content)
+            return bool(scanner and scanner.feed(event.content))
+        return False
+
+    def _run_stream(self, prompt: str, expect_json: bool, **kwargs) -> Any:
+        scanner, progress = self._stream_state(expect_json)
+        stream = self.agent.run(prompt, stream=True, stream_events=True, yield_run_response=True, **kwargs)
+        try:
+            for event in stream:
+                if isinstance(event, RunOutput):
+                    progress.done()
+                    return event
+                if self._consume(event, scanner, progress):
+                    # Closing the stream closes the HTTP response, which stops generation
+                    progress.done(stopped_early=True)
+                    return StreamedRunOutput(scanner.result, tool_calls=progress.tool_calls,
+                                             first_token_ms=progress.first_token_ms)
+        finally:
+            stream.close()
+        raise RuntimeError(f"{self.agent.name} stream ended without a response")
+
+    async def _arun_stream(self, prompt: str, expect_json: bool, **kwargs) -> Any:
+        scanner, progress = self._stream_state(expect_json)
+        stream = self.agent.arun(prompt, stream=True, stream_events=True, yield_run_response=True, **kwargs)
+        try:
+            async for event in stream:
+                if isinstance(event, RunOutput):
+                    progress.done()
+                    return event
+                if self._consume(event, scanner, progress):
+                    progress.done(stopped_early=True)
+                    return StreamedRunOutput(scanner.result, tool_calls=progress.tool_calls,
+                                             first_token_ms=progress.first_token_ms)
+        finally:
+            await stream.aclose()
+        raise RuntimeError(f"{self.agent.name} stream ended without a response")
+
+    def _cache_key(self, prompt: str) -> Optional[str]:
+        if self.cache is None:
+            return None
+
+        model = self.agent.model
+        options = getattr(model, 'options', None) or {}
+        return ResponseCache.make_key(
+            model=getattr(model, 'id', ''),
+            temperature=options.get('temperature'),
+            system_message=self.agent.system_message,
+            instructions=self.agent.instructions,
+            prompt=prompt
+        )
+
+    def _prompt_tokens(self, prompt: str, response: Any) -> int:
+        """Prompt tokens the model reported, estimated when it reported none (cache hit, stream stopped early)"""
+        metrics = getattr(response, 'metrics', None)
+        reported = getattr(metrics, 'input_tokens', 0) if metrics else 0
+        if reported:
+            return reported
+        # The history is not known here, only the parts every prompt of the agent carries
+        texts = [prompt]
+        for part in (self.agent.system_message, self.agent.instructions):
+            texts.extend(part if isinstance(part, list) else [part])
+        for message in self.agent.additional_input or []:
+            texts.append(message.get('content') if isinstance(message, dict) else getattr(message, 'content', None))
+        return sum(estimate_tokens(text) for text in texts if isinstance(text, str))
+
+    def _record_call(self, prompt: str, start: float, response: Any = None, error: Optional[Exception] = None):
+        """Record a call in the run telemetry, estimating tokens the model did not report"""
+        telemetry = get_telemetry()
+        cache_hit = getattr(response, 'cache_hit', False)
+        metrics = getattr(response, 'metrics', None)
+        content = getattr(response, 'content', None)
+        first_token = getattr(metrics, 'time_to_first_token', None) if metrics else None
+        first_token_ms = first_token * 1000 if first_token is not None else getattr(response, 'first_token_ms', None)
+        telemetry.record_call(CallRecord(
+            agent=self.context_budget.agent_name,
+            phase=telemetry.current_phase,
+            wall_ms=round((time.perf_counter() - start) * 1000, 1),
+            prompt_tokens=0 if cache_hit else (getattr(metrics, 'input_tokens', 0) or estimate_tokens(prompt)),
+            completion_tokens=0 if cache_hit else (
+                getattr(metrics, 'output_tokens', 0)
+                or (estimate_tokens(content) if isinstance(content, str) else 0)
+            ),
+            tool_calls=self._tool_calls(response),
+            first_token_ms=round(first_token_ms, 1) if first_token_ms is not None else None,
+            cache_hit=cache_hit,
+            stopped_early=getattr(response, 'stopped_early', False),
+            error=f"{type(error).__name__}: {error}" if error else None,
+            tier=self.tier
+        ))
+
+    @staticmethod
+    def _tool_calls(response: Any) -> int:
+        tools = getattr(response, 'tools', None)
+        return len(tools) if isinstance(tools, list) else getattr(response, 'tool_calls', 0)
+
+    def _store(self, key: Optional[str], response: Any):
+        content = getattr(response, 'content', None)
+        # An answer built from tool calls depends on files the key does not cover, and a cache
+        # hit would skip the files those calls write
+        if key and isinstance(content, str) and content and not self._tool_calls(response):
+            self.cache.put(key, content)
@@ -100,6 +100,33 @@ class CodeAnalysisVisualizer:
         
         return "\n".join(table)
     
+    def generate_source_index_summary(self, index_summary: Dict[str, Any]) -> str:
+        """Generate per-package overview from the Java source index summary"""
+        summary = []
+        summary.append("# Source Index")
+        summary.append("")
+        summary.append(f"- **Java Files**: {index_summary.get('files', 0)}")
+        summary.append(f"- **Lines of Code**: {index_summary.get('lines', 0)}")
+        summary.append("")
+        
+        packages = index_summary.get('packages', {})
+        if packages:
+            summary.append("## Packages")
+            summary.append(self._generate_table(
+                ["Package", "Files", "Types", "Lines"],
+                [[package, stats['files'], stats['types'], stats['lines']]
+                 for package, stats in packages.items()]
+            ))
+            summary.append("")
+        
+        annotations = index_summary.get('annotations', {})
+        if annotations:
+            summary.append("## Annotation Usage")
+            summary.append(self._generate_bar_chart(dict(list(annotations.items())[:10]), "Files per Annotation"))
+            summary.append("")
+        
+        return "\n".join(summary)
+    
     def generate_quality_metrics_table(self, quality_data: Dict[str, Any]) -> str:
         """Generate code quality metrics visualization"""
         table = []
@@ -35,6 +35,10 @@ class ConfigLoader:
         """Get configured model name"""
         return self.config.get('model', {}).get('name', 'gpt-oss:120b-cloud')
     
+    def get_model_provider(self) -> str:
+        """Get configured model backend (ollama, openai or fake)"""
+        return self.config.get('model', {}).get('provider', 'ollama') or 'ollama'
+    
     def get_model_api_key(self) -> str:
         """Get configured API key"""
         return self.config.get('model', {}).get('api_key', '')
@@ -47,10 +51,118 @@ class ConfigLoader:
         """Get configured model temperature"""
         return self.config.get('model', {}).get('temperature', 0.7)
     
+    def get_model_host(self) -> str:
+        """Get configured native Ollama endpoint"""
+        return self.config.get('model', {}).get('host', '') or ''
+    
+    def get_model_timeout(self) -> float:
+        """Get model request timeout in seconds"""
+        return float(self.config.get('model', {}).get('timeout', 600))
+    
+    def get_model_pool_max_connections(self) -> int:
+        """Get maximum HTTP connections per model endpoint"""
+        return int(self.config.get('model', {}).get('pool', {}).get('max_connections', 64))
+    
+    def get_model_pool_max_keepalive(self) -> int:
+        """Get maximum idle keep-alive HTTP connections per model endpoint"""
+        return int(self.config.get('model', {}).get('pool', {}).get('max_keepalive_connections', 32))
+    
+    def get_model_pool_keepalive_expiry(self) -> float:
+        """Get seconds an idle keep-alive HTTP connection is kept open"""
+        return float(self.config.get('model', {}).get('pool', {}).get('keepalive_expiry', 30))
+    
+    def get_fake_model_first_token_ms(self) -> float:
+        """Get simulated time to first token of the fake model"""
+        return float(self.config.get('model', {}).get('fake', {}).get('first_token_ms', 0))
+    
+    def get_fake_model_tokens_per_second(self) -> float:
+        """Get simulated generation rate of the fake model (0 = instant)"""
+        return float(self.config.get('model', {}).get('fake', {}).get('tokens_per_second', 0))
+    
+    def get_fake_model_chunk_tokens(self) -> int:
+        """Get tokens per streamed delta of the fake model"""
+        return int(self.config.get('model', {}).get('fake', {}).get('chunk_tokens', 16))
+    
     def get_database_file(self) -> str:
         """Get configured database file"""
         return self.config.get('database', {}).get('file', 'agno.db')
     
+    def get_database_pool_size(self) -> int:
+        """Get connection pool size of the shared agent database handle"""
+        return int(self.config.get('database', {}).get('pool_size', 8))
+    
+    def is_response_cache_enabled(self) -> bool:
+        """Check if the model response cache is enabled"""
+        return self.config.get('response_cache', {}).get('enabled', False)
+    
+    def get_response_cache_file(self) -> str:
+        """Get response cache database file"""
+        return self.config.get('response_cache', {}).get('file', 'llm_cache.db')
+    
+    def get_response_cache_max_entries(self) -> int:
+        """Get maximum number of cached responses"""
+        return int(self.config.get('response_cache', {}).get('max_entries', 10000))
+    
+    def get_response_cache_max_bytes(self) -> int:
+        """Get maximum total size of cached responses in bytes"""
+        return int(self.config.get('response_cache', {}).get('max_size_mb', 256)) * 1024 * 1024
+    
+    def use_local_package_mapper(self) -> bool:
+        """Check if files are placed by the local rule-based mapper before asking the model"""
+        return self.config.get('analysis', {}).get('local_mapper', True)
+    
+    def get_base_package(self) -> str:
+        """Get root package of the migrated app (empty = derived from legacy packages)"""
+        return self.config.get('analysis', {}).get('base_package', '') or ''
+    
+    def get_analysis_max_retries(self) -> int:
+        """Get maximum model attempts for the project structure analysis"""
+        return max(1, int(self.config.get('analysis', {}).get('max_retries', 3)))
+    
+    def get_source_index_dir(self) -> str:
+        """Get directory of the on-disk Java source index"""
+        return self.config.get('analysis', {}).get('index_dir', '.java_index')
+    
+    def get_source_index_workers(self) -> int:
+        """Get number of processes building the Java source index (0 = one per CPU)"""
+        return max(0, int(self.config.get('analysis', {}).get('index_workers', 0)))
+    
+    def get_chunking_file_threshold(self) -> int:
+        """Get estimated token size above which Java files are processed in chunks"""
+        return int(self.config.get('chunking', {}).get('file_token_threshold', 6000))
+    
+    def get_chunking_max_chunk_tokens(self) -> int:
+        """Get token budget of one chunk of an oversized Java file"""
+        return int(self.config.get('chunking', {}).get('max_chunk_tokens', 2000))
+    
+    def get_chunking_max_parallel(self) -> int:
+        """Get number of chunks of one file processed concurrently"""
+        return max(1, int(self.config.get('chunking', {}).get('max_parallel_chunks', 4)))
+    
+    def is_batching_enabled(self) -> bool:
+        """Check if small files are packed into batched migration prompts"""
+        return bool(self.config.get('batching', {}).get('enabled', False))
+    
+    def get_batching_small_file_tokens(self) -> int:
+        """Get estimated token size up to which a file may be batched"""
+        return int(self.config.get('batching', {}).get('small_file_tokens', 400))
+    
+    def get_batching_max_tokens(self) -> int:
+        """Get token budget of the files packed into one prompt"""
+        return int(self.config.get('batching', {}).get('max_batch_tokens', 3000))
+    
+    def get_batching_max_files(self) -> int:
+        """Get most files packed into one prompt"""
+        return max(1, int(self.config.get('batching', {}).get('max_batch_files', 8)))
+    
+    def use_staged_output(self) -> bool:
+        """Check if generated files are staged and committed per phase"""
+        return bool(self.config.get('output', {}).get('staged_writes', True))
+    
+    def is_journal_enabled(self) -> bool:
+        """Check if runs are journaled so they can be resumed after a crash"""
+        return bool(self.config.get('journal', {}).get('enabled', True))
+    
     def get_default_java_version(self) -> str:
         """Get default Java version"""
         return self.config.get('migration', {}).get('default_java_version', '17')
@@ -63,6 +175,76 @@ class ConfigLoader:
         """Get default coverage target"""
         return self.config.get('migration', {}).get('default_coverage_target', 80)
     
+    def get_migration_workers(self) -> int:
+        """Get number of parallel migration workers"""
+        return max(1, int(self.config.get('migration', {}).get('workers', 1)))
+    
+    def get_migration_max_in_flight(self) -> int:
+        """Get maximum concurrent model requests for the async pipeline"""
+        return max(1, int(self.config.get('migration', {}).get('max_in_flight', 8)))
+    
+    def is_routing_enabled(self) -> bool:
+        """Check if per-file calls are routed to model tiers by complexity"""
+        return bool(self.config.get('routing', {}).get('enabled', False))
+    
+    def get_routing_tiers(self) -> list:
+        """Get model tiers from cheapest to strongest (name, model, host, max_score)"""
+        tiers = []
+        for number, tier in enumerate(self.config.get('routing', {}).get('tiers') or []):
+            max_score = tier.get('max_score')
+            tiers.append({
+                'name': tier.get('name') or f"tier-{number}",
+                'model': tier.get('model') or self.get_model_name(),
+                'host': tier.get('host') or '',
+                'max_score': float(max_score) if max_score is not None else None
+            })
+        return tiers
+    
+    def get_routing_weights(self) -> dict:
+        """Get weights of the file complexity score"""
+        weights = {
+            'tokens_per_point': 100,
+            'per_type': 3,
+            'annotation_density': 0.5,
+            'kinds': {'ejb': 15, 'jsp': 8, 'xml': 4, 'java': 0, 'other': 0}
+        }
+        configured = self.config.get('routing', {}).get('weights') or {}
+        weights.update({key: value for key, value in configured.items() if key != 'kinds'})
+        weights['kinds'] = {**weights['kinds'], **(configured.get('kinds') or {})}
+        return weights
+    
+    def is_farm_enabled(self) -> bool:
+        """Check if migration and test jobs run on the worker farm"""
+        return bool(self.config.get('farm', {}).get('enabled', False))
+    
+    def get_farm_processes(self) -> int:
+        """Get number of local worker processes (0 = one per CPU)"""
+        return int(self.config.get('farm', {}).get('processes', 0)) or (os.cpu_count() or 1)
+    
+    def get_farm_model_hosts(self) -> list:
+        """Get Ollama endpoints handed out round-robin to the local workers"""
+        return list(self.config.get('farm', {}).get('model_hosts') or [])
+    
+    def get_farm_queue_file(self) -> str:
+        """Get job queue file of the worker farm (empty = in the target directory)"""
+        return self.config.get('farm', {}).get('queue_file', '') or ''
+    
+    def get_farm_lease_seconds(self) -> float:
+        """Get seconds a job stays leased to a worker without heartbeat"""
+        return float(self.config.get('farm', {}).get('lease_seconds', 120))
+    
+    def get_farm_heartbeat_seconds(self) -> float:
+        """Get seconds between worker heartbeats"""
+        return float(self.config.get('farm', {}).get('heartbeat_seconds', 10))
+    
+    def get_farm_max_attempts(self) -> int:
+        """Get leases granted to a job before it is recorded as failed"""
+        return int(self.config.get('farm', {}).get('max_attempts', 3))
+    
+    def get_farm_max_restarts(self) -> int:
+        """Get replacement processes started for local workers that die"""
+        return int(self.config.get('farm', {}).get('max_restarts', 8))
+    
     def is_agent_enabled(self, agent_name: str) -> bool:
         """Check if a specific agent is enabled"""
         agents = self.config.get('agents', {})
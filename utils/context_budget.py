@@ -0,0 +1,92 @@
+"""
+Context Budget for Java Migration System
+
+Keeps the conversation history an agent sends with every prompt bounded.
+Only the last max_turns runs are kept in the context (older ones are rolled
+into an agno session summary with the summarize strategy). A session whose
+prompt exceeds max_tokens even so runs without its raw history for the rest
+of the session, keeping its summary with the summarize strategy; switching
+the history back on would only push the next prompt over again. agno reads
+the history depth from the Agent, which the async pipeline shares across
+concurrent sessions, so the budget is tracked per session and never changes
+the Agent itself. The prompt size of every call, measured or estimated, is
+recorded per agent so a run can confirm they stay flat.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+_prompt_sizes: Dict[str, List[int]] = {}
+_prompt_sizes_lock = threading.Lock()
+
+
+class ContextBudget:
+    """History window and prompt-size tracking for one agent"""
+
+    def __init__(self, agent_name: str, budget_config: Dict[str, Any]):
+        """
+        Initialize context budget
+
+        Args:
+            agent_name: Name the prompt sizes are reported under
+            budget_config: context_budget section of the agent YAML
+        """
+        self.agent_name = agent_name
+        self.max_turns = budget_config.get('max_turns')
+        self.max_tokens = budget_config.get('max_tokens')
+        self.strategy = budget_config.get('strategy', 'truncate')
+        self._over_budget: Set[Optional[str]] = set()
+        self._lock = threading.Lock()
+
+    def apply(self, agent):
+        """Configure the agno Agent's history window"""
+        if self.max_turns is not None:
+            agent.num_history_runs = int(self.max_turns)
+        if self.strategy == 'summarize':
+            agent.enable_session_summaries = True
+            agent.add_session_summary_to_context = True
+
+    def history_options(self, session_id: Optional[str]) -> Dict[str, Any]:
+        """Run options of a session, leaving its history out once it went over max_tokens"""
+        with self._lock:
+            over_budget = session_id in self._over_budget
+        return {'add_history_to_context': False} if over_budget else {}
+
+    def record(self, session_id: Optional[str], prompt_tokens: int):
+        """
+        Record the prompt size of a call and track whether its session went over max_tokens
+
+        Args:
+            session_id: Session the call ran in
+            prompt_tokens: Prompt tokens reported by the model, or estimated when it reported none
+        """
+        if not prompt_tokens:
+            return
+
+        with _prompt_sizes_lock:
+            _prompt_sizes.setdefault(self.agent_name, []).append(prompt_tokens)
+
+        if self.max_tokens and prompt_tokens > self.max_tokens:
+            with self._lock:
+                self._over_budget.add(session_id)
+
+
+def get_prompt_size_report() -> Dict[str, Dict[str, int]]:
+    """
+    Get per-agent prompt size statistics in tokens
+
+    Returns:
+        Agent name -> calls, first, last, min, max and average prompt tokens
+    """
+    with _prompt_sizes_lock:
+        return {
+            agent_name: {
+                "calls": len(sizes),
+                "first": sizes[0],
+                "last": sizes[-1],
+                "min": min(sizes),
+                "max": max(sizes),
+                "avg": sum(sizes) // len(sizes)
+            }
+            for agent_name, sizes in _prompt_sizes.items() if sizes
+        }
@@ -0,0 +1,427 @@
+"""
+Fake Model for Java Migration System
+
+Local stand-in for the model (`model.provider: fake`). Every prompt is
+matched against the templates in agents_config/*/config.yml and answered with
+a canned response in the shape that template asks for: JSON objects with the
+requested keys, migrated files echoing the legacy code in a code block, one
+"### FILE:" section per batched file, file placements for every listed file.
+Replies are delayed by a time to first token and a token rate, so
+concurrency, caching and scheduling can be load-tested on a plain machine.
+The fake never calls tools.
+"""
+
+import asyncio
+import json
+import os
+import re
+import string
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.metrics import Metrics
+from agno.models.response import ModelResponse
+
+from .agent_config_loader import MultiAgentConfigManager
+from .file_batcher import FILE_HEADING_PATTERN, SKIPPED_MARKER, fence_language
+from .java_chunker import estimate_tokens
+
+CODE_BLOCK_PATTERN = re.compile(r'```([\w+-]*)\n(.*?)```', re.DOTALL)
+LISTED_FILE_PATTERN = re.compile(r'^\s*- (\S+)\s*$', re.MULTILINE)
+METHOD_PATTERN = re.compile(r'^\s*(?:public|protected|private)[\w<>\[\],\s]*?\s(\w+)\s*\([^;{]*\)\s*(?:throws[\w.,\s]+)?\{', re.MULTILINE)
+IMPORT_PATTERN = re.compile(r'^\s*import\s+(?:static\s+)?([\w.]+(?:\.\*)?)\s*;', re.MULTILINE)
+SKIPPED_DIRECTORIES = {'target', 'build', 'node_modules', '__pycache__'}
+
+
+@dataclass
+class LatencyProfile:
+    """Simulated model speed"""
+    first_token_ms: float = 0.0
+    tokens_per_second: float = 0.0
+    chunk_tokens: int = 16
+
+    def delay(self, tokens: int) -> float:
+        """Seconds needed to generate this many tokens"""
+        return tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def pieces(self, content: str) -> Iterator[str]:
+        """Content split into the deltas of a stream"""
+        size = max(1, self.chunk_tokens * 4)
+        for start in range(0, len(content), size):
+            yield content[start:start + size]
+
+
+def _code_blocks(text: str) -> List[Tuple[str, str]]:
+    return CODE_BLOCK_PATTERN.findall(text)
+
+
+def _fenced(language: str, code: str) -> str:
+    return f"```{language}\n{code.rstrip()}\n```"
+
+
+def _listed_files(text: str) -> List[str]:
+    return LISTED_FILE_PATTERN.findall(text)
+
+
+def _placement(file_path: str) -> Dict[str, str]:
+    """Keep the file name (JSPs become HTML) in a resources directory named after its parent"""
+    parent, _, name = file_path.replace('\\', '/').rpartition('/')
+    if name.endswith('.jsp'):
+        name = name[:-len('.jsp')] + '.html'
+    return {"file_name_suggestion": name, "package_suggestion": f"resources/{parent.rpartition('/')[2] or 'root'}"}
+
+
+def _business_logic(code: str) -> List[Dict[str, Any]]:
+    return [
+        {"method": method, "purpose": f"Business logic of {method}", "lines": []}
+        for method in METHOD_PATTERN.findall(code)
+    ]
+
+
+def _class_analysis(code: str) -> Dict[str, Any]:
+    methods = _business_logic(code)
+    return {
+        "complexity": "HIGH" if len(methods) > 20 else "MEDIUM" if len(methods) > 5 else "LOW",
+        "rationale": f"{len(methods)} methods found by the fake model",
+        "method": "Method count",
+        "business_logic": {"methods": methods},
+        "details": {"imports": IMPORT_PATTERN.findall(code)},
+    }
+
+
+def _project_structure(values: Dict[str, str]) -> str:
+    files = {}
+    for root, dirs, names in os.walk(values['src']):
+        dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIRECTORIES and not d.startswith('.'))
+        for name in sorted(names):
+            file_path = os.path.join(root, name)
+            files[file_path] = _placement(file_path)
+    return json.dumps({"files": files})
+
+
+def _unmapped_files(values: Dict[str, str]) -> str:
+    return json.dumps({"files": {file_path: _placement(file_path) for file_path in _listed_files(values['files'])}})
+
+
+def _analyze_java_class(values: Dict[str, str]) -> str:
+    return json.dumps(_class_analysis(values['code_content']))
+
+
+def _analyze_java_class_chunk(values: Dict[str, str]) -> str:
+    analysis = _class_analysis(values['code_content'])
+    return json.dumps({
+        "complexity": analysis['complexity'],
+        "business_logic": analysis['business_logic']['methods'],
+        "dependencies": IMPORT_PATTERN.findall(values['header']),
+        "issues": [],
+    })
+
+
+def _merge_java_class_analyses(values: Dict[str, str]) -> str:
+    methods = re.findall(r'"method":\s*"([^"]+)"', values['analyses'])
+    return json.dumps({
+        "complexity": "HIGH" if len(methods) > 20 else "MEDIUM",
+        "rationale": f"Merged from the analyses of {values['analyses'].count('complexity')} pieces",
+        "method": "Method count",
+        "business_logic": {"methods": [{"method": method, "purpose": "", "lines": []} for method in methods]},
+        "details": {},
+    })
+
+
+def _analyze_dependencies(values: Dict[str, str]) -> str:
+    try:
+        dependencies = json.loads(values['dependencies'])
+    except ValueError:
+        dependencies = {}
+    imports = dependencies.get('imports', []) if isinstance(dependencies, dict) else []
+    return json.dumps({
+        "external": [name for name in imports if name.startswith(('javax.', 'java.'))],
+        "internal": [name for name in imports if not name.startswith(('javax.', 'java.'))],
+        "deprecated": [name for name in imports if name.startswith('javax.')],
+        "recommended_updates": [],
+    })
+
+
+def _migrate_java_class(values: Dict[str, str]) -> str:
+    return json.dumps({"changes": ["Migration left to the file tools (not called by the fake model)"]})
+
+
+def _migrate_java_class_inline(values: Dict[str, str]) -> str:
+    return _fenced(values['language'], values['code']) + "\n\n" + json.dumps({"changes": ["Echoed by the fake model"]})
+
+
+def _migrate_class_piece(values: Dict[str, str]) -> str:
+    return _fenced("java", values['code'])
+
+
+def _migrate_file_batch(values: Dict[str, str]) -> str:
+    text = values['files']
+    headings = list(FILE_HEADING_PATTERN.finditer(text))
+    sections = []
+    for number, heading in enumerate(headings):
+        end = headings[number + 1].start() if number + 1 < len(headings) else len(text)
+        blocks = _code_blocks(text[heading.end():end])
+        language = fence_language(heading.group(1))
+        body = _fenced(language, blocks[0][1]) if blocks else SKIPPED_MARKER
+        sections.append(f"### FILE: {heading.group(1)}\n{body}")
+    return "\n\n".join(sections)
+
+
+def _unit_tests_for_class(values: Dict[str, str]) -> str:
+    methods = sorted(set(METHOD_PATTERN.findall(values['code'])))
+    package = values['package'] if not values['package'].startswith('(') else ''
+    tests = "\n".join(
+        f"    @Test\n    void {method}Works() {{\n        assertNotNull({values['class_name']}.class);\n    }}\n"
+        for method in methods
+    ) or f"    @Test\n    void loads() {{\n        assertNotNull({values['class_name']}.class);\n    }}\n"
+    code = (
+        (f"package {package};\n\n" if package else "")
+        + "import org.junit.jupiter.api.Test;\n\n"
+        + "import static org.junit.jupiter.api.Assertions.assertNotNull;\n\n"
+        + f"class {values['test_class_name']} {{\n\n{tests}}}"
+    )
+    return _fenced("java", code) + "\n\n" + json.dumps({"test_methods": max(len(methods), 1), "covered_methods": methods})
+
+
+def _json(payload: Dict[str, Any]) -> Callable[[Dict[str, str]], str]:
+    return lambda values: json.dumps(payload)
+
+
+def _markdown(title: str) -> Callable[[Dict[str, str]], str]:
+    return lambda values: f"# {title}\n\nGenerated by the fake model.\n"
+
+
+# Prompt name -> canned response built from the values filled into its template
+RESPONDERS: Dict[str, Callable[[Dict[str, str]], str]] = {
+    # code_analyzer
+    "analyze_project_structure": _project_structure,
+    "analyze_unmapped_files": _unmapped_files,
+    "analyze_java_class": _analyze_java_class,
+    "analyze_java_class_chunk": _analyze_java_class_chunk,
+    "merge_java_class_analyses": _merge_java_class_analyses,
+    "analyze_dependencies": _analyze_dependencies,
+    # migration_specialist
+    "migrate_java_class": _migrate_java_class,
+    "migrate_java_class_inline": _migrate_java_class_inline,
+    "migrate_class_header": _migrate_class_piece,
+    "migrate_class_chunk": _migrate_class_piece,
+    "migrate_secondary_types": _migrate_class_piece,
+    "migrate_file_batch": _migrate_file_batch,
+    "refactor_method": lambda values: _fenced("java", values['method_code']),
+    "update_dependencies": _json({"updated": [], "deprecated": [], "new": [], "breaking_changes": [], "notes": []}),
+    "apply_design_pattern": lambda values: _fenced("java", values['code']) + f"\n\n{values['pattern_name']} applied.",
+    "migrate_configuration": lambda values: json.dumps({
+        "configuration": values['config_content'], "changes": [], "format": values['config_type'],
+        "best_practices": [], "removed_settings": []
+    }),
+    "create_migration_summary": _markdown("Migration Summary"),
+    "validate_business_logic": lambda values: json.dumps({
+        "rules": [{"rule": rule, "preserved": True} for rule in values['business_rules'].splitlines() if rule.strip()],
+        "logic_preserved": True
+    }),
+    # report_manager
+    "synthesize_results": _markdown("Migration Report"),
+    # test_generator
+    "generate_bdd_scenarios": _json({"feature_files": [], "scenarios": 0, "summary": "Generated by the fake model"}),
+    "generate_bdd_scenarios_for_files": lambda values: json.dumps({
+        "feature_files": [], "files": _listed_files(values['files']), "summary": "Generated by the fake model"
+    }),
+    "generate_unit_tests": _json({"test_classes": [], "summary": "Generated by the fake model"}),
+    "generate_unit_tests_for_files": lambda values: json.dumps({
+        "test_classes": [], "files": _listed_files(values['files']), "summary": "Generated by the fake model"
+    }),
+    "generate_unit_tests_for_class": _unit_tests_for_class,
+    "generate_integration_tests": _json({
+        "test_classes": [], "configuration": "", "test_data": {}, "setup_instructions": [], "dependencies": []
+    }),
+    "generate_test_data": _json({"valid": [], "invalid": [], "boundary": [], "null_and_empty": [], "large": []}),
+    "generate_mock_configurations": lambda values: json.dumps({
+        "mocks": [{"dependency": dependency, "initialization": "", "stubbing": [], "verification": []}
+                  for dependency in re.findall(r'"([^"]+)"', values['dependencies'])]
+    }),
+    "calculate_test_coverage": lambda values: json.dumps({
+        "line_coverage": 0, "branch_coverage": 0,
+        "methods_covered": [], "methods_not_covered": [m['method'] for m in _business_logic(values['source_code'])],
+        "gaps": [], "recommendations": []
+    }),
+    "generate_test_suite_report": _markdown("Test Suite Report"),
+}
+
+
+@dataclass
+class PromptTemplate:
+    """A prompt of an agent YAML compiled into a pattern recovering its values"""
+    name: str
+    prefix: str
+    pattern: "re.Pattern"
+    literal_chars: int
+
+
+def _compile_template(name: str, template: str) -> PromptTemplate:
+    """Turn a str.format template into a regex with one group per field"""
+    parts, seen, literal_chars, prefix = [], set(), 0, None
+    for literal, field_name, _, _ in string.Formatter().parse(template.rstrip()):
+        if prefix is None:
+            prefix = literal
+        parts.append(re.escape(literal))
+        literal_chars += len(literal)
+        if field_name is None:
+            continue
+        if field_name in seen:
+            parts.append(f"(?P={field_name})")
+        else:
+            seen.add(field_name)
+            parts.append(f"(?P<{field_name}>.*?)")
+    if parts and parts[-1].endswith(".*?)"):
+        # A field closing the template takes the rest of the prompt, not the empty string
+        parts[-1] = parts[-1][:-len(".*?)")] + ".*)"
+    return PromptTemplate(name, prefix or '', re.compile("".join(parts), re.DOTALL), literal_chars)
+
+
+class FakeResponder:
+    """Canned answers to the prompts of every agent in agents_config"""
+
+    def __init__(self, config_dir: str = "agents_config"):
+        """
+        Initialize fake responder
+
+        Args:
+            config_dir: Directory containing agent configurations
+        """
+        self.templates: List[PromptTemplate] = []
+        self.priming_messages = set()
+        for agent_config in MultiAgentConfigManager(config_dir).get_all_agent_configs().values():
+            for name, template in agent_config.get_prompts().items():
+                self.templates.append(_compile_template(name, template))
+            for layer in agent_config.get_identity_priming_config().get('layers', []):
+                self.priming_messages.add(layer.get('message', '').strip())
+        # The most specific template wins when several match the same prompt
+        self.templates.sort(key=lambda template: -template.literal_chars)
+
+    def match(self, prompt: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """Name of the template a prompt was built from and the values filled into it"""
+        for template in self.templates:
+            if not prompt.startswith(template.prefix):
+                continue
+            found = template.pattern.match(prompt)
+            if found:
+                return template.name, found.groupdict()
+        return None
+
+    def respond(self, prompt: str) -> str:
+        """
+        Canned answer to a prompt
+
+        Args:
+            prompt: Last user message
+
+        Returns:
+            Response in the shape the prompt asks for
+        """
+        matched = self.match(prompt)
+        if matched:
+            name, values = matched
+            responder = RESPONDERS.get(name)
+            if responder is not None:
+                return responder(values)
+            return json.dumps({"status": "ok"}) if "JSON" in prompt else "Done."
+        if prompt.strip() in self.priming_messages:
+            return "I am the agent described by my system message and instructions."
+        return "This is a canned answer of the fake model."
+
+
+_responders: Dict[str, FakeResponder] = {}
+_responders_lock = threading.Lock()
+
+
+def get_fake_responder(config_dir: str = "agents_config") -> FakeResponder:
+    """Get the shared fake responder of an agents_config directory"""
+    with _responders_lock:
+        if config_dir not in _responders:
+            _responders[config_dir] = FakeResponder(config_dir)
+        return _responders[config_dir]
+
+
+def canned_response(prompt: str) -> str:
+    """Canned answer of the fake model to a prompt"""
+    return get_fake_responder().respond(prompt)
+
+
+def _last_user_prompt(messages: List[Message]) -> str:
+    for message in reversed(messages):
+        if message.role == "user":
+            return message.get_content_string()
+    return ""
+
+
+@dataclass
+class FakeModel(Model):
+    """agno Model answering every prompt locally with canned responses"""
+    id: str = "fake"
+    name: str = "FakeModel"
+    provider: str = "Fake"
+    profile: LatencyProfile = field(default_factory=LatencyProfile)
+
+    def _reply(self, messages: List[Message]) -> Tuple[str, Metrics]:
+        content = canned_response(_last_user_prompt(messages))
+        metrics = Metrics()
+        metrics.input_tokens = sum(estimate_tokens(message.get_content_string()) for message in messages)
+        metrics.output_tokens = estimate_tokens(content)
+        metrics.total_tokens = metrics.input_tokens + metrics.output_tokens
+        return content, metrics
+
+    @staticmethod
+    def _first_token(run_response):
+        if run_response is not None and run_response.metrics:
+            run_response.metrics.set_time_to_first_token()
+
+    def invoke(self, messages: List[Message], assistant_message: Message, run_response=None, **kwargs) -> ModelResponse:
+        assistant_message.metrics.start_timer()
+        content, usage = self._reply(messages)
+        time.sleep(self.profile.first_token_ms / 1000 + self.profile.delay(usage.output_tokens))
+        self._first_token(run_response)
+        assistant_message.metrics.stop_timer()
+        return ModelResponse(role="assistant", content=content, response_usage=usage)
+
+    async def ainvoke(self, messages: List[Message], assistant_message: Message, run_response=None,
+                      **kwargs) -> ModelResponse:
+        assistant_message.metrics.start_timer()
+        content, usage = self._reply(messages)
+        await asyncio.sleep(self.profile.first_token_ms / 1000 + self.profile.delay(usage.output_tokens))
+        self._first_token(run_response)
+        assistant_message.metrics.stop_timer()
+        return ModelResponse(role="assistant", content=content, response_usage=usage)
+
+    def invoke_stream(self, messages: List[Message], assistant_message: Message, run_response=None,
+                      **kwargs) -> Iterator[ModelResponse]:
+        assistant_message.metrics.start_timer()
+        content, usage = self._reply(messages)
+        time.sleep(self.profile.first_token_ms / 1000)
+        self._first_token(run_response)
+        for piece in self.profile.pieces(content):
+            time.sleep(self.profile.delay(estimate_tokens(piece)))
+            yield ModelResponse(content=piece)
+        yield ModelResponse(response_usage=usage)
+        assistant_message.metrics.stop_timer()
+
+    async def ainvoke_stream(self, messages: List[Message], assistant_message: Message, run_response=None,
+                             **kwargs) -> AsyncIterator[ModelResponse]:
+        assistant_message.metrics.start_timer()
+        content, usage = self._reply(messages)
+        await asyncio.sleep(self.profile.first_token_ms / 1000)
+        self._first_token(run_response)
+        for piece in self.profile.pieces(content):
+            await asyncio.sleep(self.profile.delay(estimate_tokens(piece)))
+            yield ModelResponse(content=piece)
+        yield ModelResponse(response_usage=usage)
+        assistant_message.metrics.stop_timer()
+
+    def _parse_provider_response(self, response: Any, **kwargs) -> ModelResponse:
+        return response
+
+    def _parse_provider_response_delta(self, response: Any) -> ModelResponse:
+        return response
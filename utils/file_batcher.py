@@ -0,0 +1,121 @@
+"""
+File Batcher for Java Migration System
+
+Packs small source files (remote interfaces, error pages, deployment
+descriptors, stylesheets) into one migration prompt up to a token budget,
+so each of them no longer costs a full model round trip, and splits the
+structured multi-file response back into one output per source file.
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+from .java_chunker import CHARS_PER_TOKEN
+
+# Reply for a file the migration rules say to leave out (e.g. EJB descriptors)
+SKIPPED_MARKER = 'SKIPPED'
+
+FILE_HEADING_PATTERN = re.compile(r'^[ \t]*#{1,6}[ \t]*FILE:[ \t]*(.+?)[ \t]*$', re.MULTILINE)
+CODE_BLOCK_PATTERN = re.compile(r'```[^\n]*\n(.*?)(?:\n[ \t]*```|$)', re.DOTALL)
+
+FENCE_LANGUAGES = {
+    '.java': 'java',
+    '.jsp': 'jsp',
+    '.xml': 'xml',
+    '.css': 'css',
+    '.js': 'javascript',
+    '.html': 'html',
+    '.properties': 'properties',
+    '.sql': 'sql',
+}
+
+
+def estimate_file_tokens(file_path: str) -> int:
+    """Estimated token count of a file, from its size on disk"""
+    try:
+        return os.path.getsize(file_path) // CHARS_PER_TOKEN + 1
+    except OSError:
+        return 0
+
+
+def fence_language(file_path: str) -> str:
+    """Code fence language of a file"""
+    return FENCE_LANGUAGES.get(os.path.splitext(file_path)[1].lower(), '')
+
+
+def pack_small_files(
+    file_paths: Iterable[str],
+    small_file_tokens: int,
+    max_batch_tokens: int,
+    max_batch_files: int
+) -> List[List[str]]:
+    """
+    Group small files into batches within a token budget
+
+    Files above small_file_tokens (or missing) are not batched. Batches keep
+    the order the files were given in; a batch of one file is returned as is
+    so the caller can migrate it on the regular path.
+
+    Args:
+        file_paths: Candidate files
+        small_file_tokens: Largest estimated file size that may be batched
+        max_batch_tokens: Token budget of the files of one batch
+        max_batch_files: Most files in one batch
+
+    Returns:
+        List of batches
+    """
+    batches: List[List[str]] = []
+    batch: List[str] = []
+    batch_tokens = 0
+    for file_path in file_paths:
+        tokens = estimate_file_tokens(file_path)
+        if not 0 < tokens <= small_file_tokens:
+            continue
+        if batch and (batch_tokens + tokens > max_batch_tokens or len(batch) >= max_batch_files):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(file_path)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def render_file_section(file_path: str, content: str, note: str = '') -> str:
+    """A source file as it appears in a batched prompt, with an optional line of instructions"""
+    note = f"{note}\n" if note else ''
+    return f"### FILE: {file_path}\n{note}```{fence_language(file_path)}\n{content.rstrip()}\n```"
+
+
+def split_batch_response(text: str, file_paths: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Split a batched migration response into the migrated content of each file
+
+    Every file is introduced by a "### FILE: <source path>" heading followed by
+    one code block, or by the SKIPPED marker for files that are left out.
+
+    Args:
+        text: Model response
+        file_paths: Source files of the batch
+
+    Returns:
+        Source path -> migrated content (None if skipped); files the response
+        does not cover are missing
+    """
+    expected = {os.path.normpath(path): path for path in file_paths}
+    headings = list(FILE_HEADING_PATTERN.finditer(text or ''))
+    sections: Dict[str, Optional[str]] = {}
+    for number, heading in enumerate(headings):
+        file_path = expected.get(os.path.normpath(heading.group(1).strip('`*"\' ')))
+        if file_path is None or file_path in sections:
+            continue
+        end = headings[number + 1].start() if number + 1 < len(headings) else len(text)
+        body = text[heading.end():end]
+        block = CODE_BLOCK_PATTERN.search(body)
+        if block:
+            sections[file_path] = block.group(1).strip('\n') + '\n'
+        elif body.strip().upper().startswith(SKIPPED_MARKER):
+            sections[file_path] = None
+    return sections
@@ -0,0 +1,263 @@
+"""
+Java Chunker for Java Migration System
+
+Splits an oversized Java class into its header (package, imports,
+annotations and declaration) and runs of consecutive members, each within a
+token budget, so the pieces can be analyzed or migrated concurrently in
+bounded prompts. Secondary top-level types after the class form a trailer
+migrated as a piece of its own. Migrated pieces are reassembled
+deterministically: imports are merged behind the migrated header, members
+keep their source order, and a consistency pass checks the package line,
+the top-level declarations and the brace balance of the result.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from .source_index import STRUCTURE_PATTERN, blank_comments_and_literals
+
+# Rough size of a token in Java source, used for budgeting only
+CHARS_PER_TOKEN = 4
+
+ANNOTATION_USE_PATTERN = re.compile(r'@[\w.]+(\s*\([^()]*\))?')
+NESTED_TYPE_PATTERN = re.compile(r'\b(class|interface|enum|record)\b')
+CODE_BLOCK_PATTERN = re.compile(r'```[ \t]*(\w*)[^\n]*\n(.*?)(?:```|$)', re.DOTALL)
+IMPORT_LINE_PATTERN = re.compile(r'^\s*import\s+[\w.*\s]+;\s*$')
+PACKAGE_LINE_PATTERN = re.compile(r'^\s*package\s+[\w.]+\s*;\s*$')
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimated token count of a piece of source"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class JavaChunk:
+    """A run of consecutive class members: fields, methods or mixed members"""
+    kind: str
+    text: str
+    start_line: int
+    end_line: int
+    members: int = 0
+
+
+@dataclass
+class ChunkedClass:
+    """A Java class split for piecewise processing"""
+    header: str
+    chunks: List[JavaChunk] = field(default_factory=list)
+    # Source after the class: secondary top-level types, comments
+    trailer: str = ''
+
+    @property
+    def has_secondary_types(self) -> bool:
+        return bool(top_level_types(self.trailer))
+
+
+def top_level_types(code: str) -> List[str]:
+    """Names of the types declared outside any braces of a piece of Java source"""
+    names = []
+    depth = 0
+    for match in STRUCTURE_PATTERN.finditer(blank_comments_and_literals(code)):
+        token = match.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+        elif depth == 0:
+            names.append(match.group(2))
+    return names
+
+
+def _member_kind(code: str) -> str:
+    """Classify a class member from its comment- and literal-free text"""
+    head = code.split('{', 1)[0]
+    head = ANNOTATION_USE_PATTERN.sub(' ', head)
+    if NESTED_TYPE_PATTERN.search(head):
+        return 'methods'
+    paren, equals = head.find('('), head.find('=')
+    if paren >= 0 and (equals < 0 or paren < equals):
+        return 'methods'
+    return 'fields'
+
+
+def split_java_class(source: str, max_chunk_tokens: int) -> Optional[ChunkedClass]:
+    """
+    Split the first top-level type of a Java file into a header and member chunks
+
+    Members are never split or reordered, so static and instance initializers
+    keep their place among the fields; a single member larger than the budget
+    becomes a chunk of its own.
+
+    Args:
+        source: Java source
+        max_chunk_tokens: Token budget per chunk
+
+    Returns:
+        ChunkedClass, or None if no type body is found
+    """
+    code = blank_comments_and_literals(source)
+
+    body_open = None
+    depth = 0
+    for match in STRUCTURE_PATTERN.finditer(code):
+        token = match.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+        elif depth == 0:
+            body_open = code.find('{', match.end())
+            break
+    if body_open is None or body_open < 0:
+        return None
+
+    members: List[Tuple[int, int]] = []
+    member_start = body_open + 1
+    class_close = None
+    depth = 1
+    for i in range(body_open + 1, len(code)):
+        char = code[i]
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                class_close = i
+                break
+            if depth == 1:
+                members.append((member_start, i + 1))
+                member_start = i + 1
+        elif char == ';' and depth == 1:
+            if members and not code[member_start:i].strip():
+                # Terminator of a field initialized with a lambda or an anonymous class
+                members[-1] = (members[-1][0], i + 1)
+            else:
+                members.append((member_start, i + 1))
+            member_start = i + 1
+    if class_close is None:
+        return None
+
+    budget = max_chunk_tokens * CHARS_PER_TOKEN
+    chunked = ChunkedClass(header=source[:body_open + 1], trailer=source[class_close + 1:])
+    group: List[Tuple[int, int]] = []
+    for start, end in members:
+        if group and sum(e - s for s, e in group) + end - start > budget:
+            chunked.chunks.append(_chunk(source, code, group))
+            group = []
+        group.append((start, end))
+    if group:
+        chunked.chunks.append(_chunk(source, code, group))
+
+    return chunked
+
+
+def _chunk(source: str, code: str, members: List[Tuple[int, int]]) -> JavaChunk:
+    kinds = {_member_kind(code[start:end]) for start, end in members}
+    first = members[0][0]
+    first += len(source[first:members[0][1]]) - len(source[first:members[0][1]].lstrip())
+    return JavaChunk(
+        kind=kinds.pop() if len(kinds) == 1 else 'members',
+        text='\n'.join(source[start:end].strip('\n') for start, end in members),
+        start_line=source.count('\n', 0, first) + 1,
+        end_line=source.count('\n', 0, members[-1][1]) + 1,
+        members=len(members)
+    )
+
+
+def extract_code_block(text: str, language: str = 'java') -> str:
+    """Content of the last fenced code block of a response, preferring the language and skipping JSON"""
+    blocks = CODE_BLOCK_PATTERN.findall(text or '')
+    if not blocks:
+        return (text or '').strip()
+    preferred = (
+        [code for lang, code in blocks if lang.lower() == language]
+        or [code for lang, code in blocks if lang.lower() != 'json']
+        or [code for _, code in blocks]
+    )
+    return preferred[-1].strip('\n')
+
+
+def split_imports(code: str) -> Tuple[List[str], str]:
+    """Separate import lines from the rest of a migrated piece"""
+    imports, rest = [], []
+    for line in code.splitlines():
+        if IMPORT_LINE_PATTERN.match(line):
+            imports.append(line.strip())
+        else:
+            rest.append(line)
+    return imports, '\n'.join(rest).strip('\n')
+
+
+def reassemble_java_class(header: str, pieces: List[str], trailer: str = '') -> Tuple[str, List[str]]:
+    """
+    Reassemble a migrated class and check its consistency
+
+    The checks cover what piecewise migration gets wrong: empty pieces, a
+    package line repeated by a piece, the class declaration repeated by a
+    chunk, top-level types lost or added, and unbalanced braces.
+
+    Args:
+        header: Migrated header (package, imports, annotations, declaration with "{")
+        pieces: Migrated member chunks in chunk order, each optionally starting with imports
+        trailer: Migrated secondary top-level types following the class, optionally starting with imports
+
+    Returns:
+        Tuple of (class source, consistency issues)
+    """
+    issues = []
+    header_imports, header_rest = split_imports(header)
+    header_lines = header_rest.splitlines()
+    package = [line.strip() for line in header_lines if PACKAGE_LINE_PATTERN.match(line)]
+    declaration = '\n'.join(line for line in header_lines if not PACKAGE_LINE_PATTERN.match(line)).strip('\n')
+    if not declaration.rstrip().endswith('{'):
+        declaration = declaration.rstrip() + ' {'
+    class_names = top_level_types(declaration)[:1]
+
+    imports = list(header_imports)
+    bodies = []
+    for number, piece in enumerate(pieces, 1):
+        piece_imports, body = split_imports(piece)
+        imports.extend(piece_imports)
+        if not body.strip():
+            issues.append(f"chunk {number} returned no code")
+            continue
+        if class_names and class_names[0] in top_level_types(body):
+            issues.append(f"chunk {number} repeats the declaration of {class_names[0]}")
+        bodies.append(body)
+    trailer_imports, trailer_body = split_imports(trailer)
+    imports.extend(trailer_imports)
+
+    imports = sorted(dict.fromkeys(imports))
+    parts = []
+    if package:
+        parts.append(package[0])
+    if imports:
+        parts.append('\n'.join(imports))
+    parts.append(declaration + '\n\n' + '\n\n'.join(bodies) + '\n}')
+    if trailer_body.strip():
+        parts.append(trailer_body)
+    result = '\n\n'.join(parts) + '\n'
+
+    packages = sum(1 for line in result.splitlines() if PACKAGE_LINE_PATTERN.match(line))
+    if packages > 1:
+        issues.append(f"package declared {packages} times in reassembled class")
+    expected_types = class_names + top_level_types(trailer_body)
+    found_types = top_level_types(result)
+    if sorted(found_types) != sorted(expected_types):
+        issues.append(f"top-level types {', '.join(found_types) or 'none'} in reassembled class, "
+                      f"expected {', '.join(expected_types) or 'none'}")
+
+    balance = 0
+    for char in blank_comments_and_literals(result):
+        if char == '{':
+            balance += 1
+        elif char == '}':
+            balance -= 1
+            if balance < 0:
+                break
+    if balance != 0:
+        issues.append("unbalanced braces in reassembled class")
+
+    return result, issues
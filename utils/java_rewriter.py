@@ -0,0 +1,406 @@
+"""
+Java Rewriter for Java Migration System
+
+Local, deterministic pass over the mechanical part of a Java EE to Spring
+Boot migration, applied before any model call: javax -> jakarta imports,
+EJB annotations -> Spring stereotypes and injection, servlets mapped in
+web.xml -> controllers, the new package and type names from the analysis,
+and dropping EJB deployment descriptors. Rules come from the
+`local_rewrites` section of the Migration Specialist YAML. A file that
+still matches one of its residual patterns afterwards is left to the model.
+"""
+
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .source_index import blank_comments_and_literals
+
+IMPORT_PATTERN = re.compile(r'^[ \t]*import[ \t]+(static[ \t]+)?([\w.]+(?:\.\*)?)[ \t]*;[ \t]*\n?', re.MULTILINE)
+PACKAGE_PATTERN = re.compile(r'^[ \t]*package[ \t]+([\w.]+)[ \t]*;', re.MULTILINE)
+TYPE_PATTERN = re.compile(r'\b(class|interface|enum|record)\s+([A-Za-z_]\w*)')
+JAVAX_NAME_PATTERN = re.compile(r'(?<![\w.])javax((?:\.\w+)+)(\.\*)?')
+JAVA_PACKAGE_NAME = re.compile(r'^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*$')
+JAVA_IDENTIFIER = re.compile(r'^[A-Za-z_]\w*$')
+STRING_LITERAL = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+HTTP_SERVLET = 'javax.servlet.http.HttpServlet'
+SERVLET_METHOD_MAPPINGS = {
+    'doGet': 'org.springframework.web.bind.annotation.GetMapping',
+    'doPost': 'org.springframework.web.bind.annotation.PostMapping',
+    'doPut': 'org.springframework.web.bind.annotation.PutMapping',
+    'doDelete': 'org.springframework.web.bind.annotation.DeleteMapping',
+}
+CONTROLLER = 'org.springframework.stereotype.Controller'
+# Servlet API a controller has no direct equivalent for
+SERVLET_BLOCKERS = re.compile(
+    r'\bsuper\s*\.|\bgetServletContext\s*\(|\bgetServletConfig\s*\(|\bgetInitParameter\s*\('
+    r'|\bvoid\s+(init|destroy|service|doHead|doOptions|doTrace)\s*\('
+)
+
+
+@dataclass
+class LocalRewrite:
+    """Outcome of the local rewrite pass for one file"""
+    file_path: str
+    # Rewritten source, None when the file was not rewritten (or dropped)
+    content: Optional[str] = None
+    changes: List[str] = field(default_factory=list)
+    # Labels of the residual patterns still matching: work left for the model
+    residual: List[str] = field(default_factory=list)
+    dropped: bool = False
+
+    @property
+    def complete(self) -> bool:
+        """The file needs no model call"""
+        return self.dropped or (self.content is not None and not self.residual)
+
+
+def _replace_in_code(
+    source: str,
+    pattern: re.Pattern,
+    replacement: Union[str, Callable[[re.Match], str]]
+) -> Tuple[str, int]:
+    """Apply a substitution to code only, leaving comments and literals untouched"""
+    code = blank_comments_and_literals(source)
+    pieces, last, count = [], 0, 0
+    for match in pattern.finditer(code):
+        value = replacement(match) if callable(replacement) else match.expand(replacement)
+        if value == source[match.start():match.end()]:
+            continue
+        pieces.append(source[last:match.start()])
+        pieces.append(value)
+        last = match.end()
+        count += 1
+    pieces.append(source[last:])
+    return ''.join(pieces), count
+
+
+def _imports(source: str) -> List[str]:
+    return [match.group(2) for match in IMPORT_PATTERN.finditer(blank_comments_and_literals(source)) if not match.group(1)]
+
+
+def _uses(source: str, simple_name: str) -> bool:
+    """Whether a simple name is used outside import lines"""
+    code = IMPORT_PATTERN.sub('', blank_comments_and_literals(source))
+    return re.search(rf'(?<![\w.]){re.escape(simple_name)}\b', code) is not None
+
+
+def _resolves(source: str, qualified_name: str) -> bool:
+    """Whether the simple name of a type refers to it through the imports"""
+    package = qualified_name.rsplit('.', 1)[0]
+    imports = _imports(source)
+    return qualified_name in imports or f"{package}.*" in imports
+
+
+def _remove_import(source: str, qualified_name: str) -> str:
+    pattern = re.compile(rf'^[ \t]*import[ \t]+{re.escape(qualified_name)}[ \t]*;[ \t]*\n?', re.MULTILINE)
+    return _replace_in_code(source, pattern, '')[0]
+
+
+def _add_imports(source: str, qualified_names: List[str]) -> str:
+    existing = set(_imports(source))
+    missing = [name for name in dict.fromkeys(qualified_names) if name not in existing]
+    if not missing:
+        return source
+    block = ''.join(f"import {name};\n" for name in missing)
+    code = blank_comments_and_literals(source)
+    imports = list(IMPORT_PATTERN.finditer(code))
+    if imports:
+        end = imports[-1].end()
+        if not source[end - 1:end] == '\n':
+            block = '\n' + block
+        return source[:end] + block + source[end:]
+    package = PACKAGE_PATTERN.search(code)
+    if package:
+        end = package.end()
+        return source[:end] + '\n\n' + block.rstrip('\n') + source[end:]
+    return block + '\n' + source
+
+
+def _tidy_header(source: str, code: str) -> str:
+    """Collapse the blank lines removed imports leave before the type declaration"""
+    declared = TYPE_PATTERN.search(code)
+    end = declared.start() if declared else 0
+    return re.sub(r'\n{3,}', '\n\n', source[:end]) + source[end:]
+
+
+def read_servlet_mappings(web_xml: str) -> Dict[str, List[str]]:
+    """Servlet class -> URL patterns declared in a web.xml"""
+    def local(tag: str) -> str:
+        return tag.rsplit('}', 1)[-1]
+
+    def text(element, name: str) -> str:
+        for child in element:
+            if local(child.tag) == name:
+                return (child.text or '').strip()
+        return ''
+
+    try:
+        root = ET.parse(web_xml).getroot()
+    except (ET.ParseError, OSError):
+        return {}
+
+    classes, patterns = {}, {}
+    for element in root:
+        if local(element.tag) == 'servlet':
+            classes[text(element, 'servlet-name')] = text(element, 'servlet-class')
+        elif local(element.tag) == 'servlet-mapping':
+            patterns.setdefault(text(element, 'servlet-name'), []).extend(
+                (child.text or '').strip() for child in element if local(child.tag) == 'url-pattern'
+            )
+    return {
+        servlet_class: patterns.get(name, [])
+        for name, servlet_class in classes.items() if servlet_class
+    }
+
+
+def _spring_path(url_pattern: str) -> Optional[str]:
+    """Spring MVC path of a servlet URL pattern (None for extension mappings)"""
+    if url_pattern.startswith('*.'):
+        return None
+    if url_pattern.endswith('/*'):
+        return url_pattern[:-1] + '*'
+    return url_pattern
+
+
+class RewriteEngine:
+    """Apply the configured mechanical rewrites to a source file"""
+
+    def __init__(self, rules: Dict[str, Any]):
+        """
+        Initialize rewrite engine
+
+        Args:
+            rules: `local_rewrites` section of the Migration Specialist YAML
+        """
+        self.rules = rules
+        self.enabled = bool(rules.get('enabled', False))
+        self.drop_files = set(rules.get('drop_files', []))
+        self.jakarta_packages = list(rules.get('jakarta_packages', []))
+        self.annotations: Dict[str, Optional[str]] = dict(rules.get('annotations', {}))
+        self.servlets = bool(rules.get('servlet_controllers', False))
+        self.residual_patterns = {
+            label: re.compile(pattern) for label, pattern in rules.get('residual_patterns', {}).items()
+        }
+        self._web_xml_cache: Dict[str, Dict[str, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def rewrite(
+        self,
+        file_path: str,
+        file_info: Dict[str, Any],
+        dependencies: Optional[Dict[str, str]] = None
+    ) -> LocalRewrite:
+        """
+        Rewrite a file as far as the rules go
+
+        Args:
+            file_path: Legacy source file
+            file_info: Analysis suggestions (file_name_suggestion, package_suggestion)
+            dependencies: Legacy -> migrated qualified names of its migrated dependencies
+
+        Returns:
+            LocalRewrite; complete when no model call is needed
+        """
+        result = LocalRewrite(file_path)
+        if not self.enabled:
+            return result
+        if os.path.basename(file_path) in self.drop_files:
+            result.dropped = True
+            result.changes.append("EJB deployment descriptor dropped, no Spring Boot equivalent")
+            return result
+        if not file_path.endswith('.java'):
+            return result
+
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            source = f.read()
+
+        if self.servlets:
+            source = self._servlet_to_controller(file_path, source, result)
+        source = self._rewrite_annotations(source, result)
+        source = self._rename(source, file_info, dependencies or {}, result)
+        source = self._rewrite_jakarta(source, result)
+
+        code = blank_comments_and_literals(source)
+        result.residual = [label for label, pattern in self.residual_patterns.items() if pattern.search(code)]
+        result.content = _tidy_header(source, code)
+        return result
+
+    def _servlet_mappings(self, file_path: str) -> Dict[str, List[str]]:
+        """Servlet mappings of the web.xml of the module a source belongs to"""
+        directory = os.path.dirname(os.path.abspath(file_path))
+        while True:
+            web_xml = os.path.join(directory, 'src', 'main', 'webapp', 'WEB-INF', 'web.xml')
+            if os.path.isfile(web_xml):
+                with self._lock:
+                    if web_xml not in self._web_xml_cache:
+                        self._web_xml_cache[web_xml] = read_servlet_mappings(web_xml)
+                    return self._web_xml_cache[web_xml]
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return {}
+            directory = parent
+
+    def _servlet_to_controller(self, file_path: str, source: str, result: LocalRewrite) -> str:
+        code = blank_comments_and_literals(source)
+        extends = re.search(r'\s+extends\s+(?:javax\.servlet\.http\.)?HttpServlet\b', code)
+        declared = TYPE_PATTERN.search(code)
+        if not extends or not declared or SERVLET_BLOCKERS.search(code):
+            return source
+        if 'javax.servlet.http.HttpServlet' not in code[extends.start():extends.end()] and not _resolves(source, HTTP_SERVLET):
+            return source
+
+        package = PACKAGE_PATTERN.search(code)
+        servlet_class = f"{package.group(1)}.{declared.group(2)}" if package else declared.group(2)
+        url_patterns = list(self._servlet_mappings(file_path).get(servlet_class, []))
+
+        annotation = re.search(r'^[ \t]*@(?:javax\.servlet\.annotation\.)?WebServlet\b\s*(\([^)]*\))?[ \t]*\n?', code, re.MULTILINE)
+        if annotation:
+            url_patterns.extend(STRING_LITERAL.findall(source[annotation.start():annotation.end()]))
+        paths = [_spring_path(pattern) for pattern in dict.fromkeys(url_patterns)]
+        if not paths or None in paths:
+            return source
+
+        if annotation:
+            source = source[:annotation.start()] + source[annotation.end():]
+            source = _remove_import(source, 'javax.servlet.annotation.WebServlet')
+
+        mapping = f'"{paths[0]}"' if len(paths) == 1 else '{' + ', '.join(f'"{path}"' for path in paths) + '}'
+        used = []
+
+        def handler(match: re.Match) -> str:
+            used.append(SERVLET_METHOD_MAPPINGS[match.group(2)])
+            annotation_name = SERVLET_METHOD_MAPPINGS[match.group(2)].rsplit('.', 1)[1]
+            return f"{match.group(1)}@{annotation_name}({mapping})\n{match.group(1)}public void {match.group(2)}"
+
+        source, _ = _replace_in_code(
+            source,
+            re.compile(r'^([ \t]*)(?:@Override\s+)?(?:protected|public)\s+void\s+(doGet|doPost|doPut|doDelete)\b', re.MULTILINE),
+            handler
+        )
+        if not used:
+            return source
+        source, _ = _replace_in_code(source, re.compile(r'\s+extends\s+(?:javax\.servlet\.http\.)?HttpServlet\b'), '')
+        source, _ = _replace_in_code(
+            source,
+            re.compile(rf'^([ \t]*)((?:(?:public|abstract|final)\s+)*class\s+{declared.group(2)}\b)', re.MULTILINE),
+            r'\1@Controller\n\1\2'
+        )
+        if not _uses(source, 'HttpServlet'):
+            source = _remove_import(source, HTTP_SERVLET)
+        source = _add_imports(source, [CONTROLLER] + used)
+        result.changes.append(f"servlet -> @Controller mapped to {', '.join(paths)}")
+        return source
+
+    def _rewrite_annotations(self, source: str, result: LocalRewrite) -> str:
+        for legacy, target in self.annotations.items():
+            simple = legacy.rsplit('.', 1)[1]
+            names = re.escape(legacy) + (f"|{simple}" if _resolves(source, legacy) else '')
+            # Annotations with arguments are left to the model
+            pattern = re.compile(rf'@(?:{names})\b(?![\w.]|\s*\()' + ('[ \t]*\n?[ \t]*' if target is None else ''))
+            if target is None:
+                source, count = _replace_in_code(source, pattern, '')
+            else:
+                source, count = _replace_in_code(source, pattern, '@' + target.rsplit('.', 1)[1])
+            if not count:
+                continue
+            if not _uses(source, simple):
+                source = _remove_import(source, legacy)
+            if target is None:
+                result.changes.append(f"removed @{simple}")
+            else:
+                source = _add_imports(source, [target])
+                result.changes.append(f"@{simple} -> @{target.rsplit('.', 1)[1]}")
+        return source
+
+    def _rename(
+        self,
+        source: str,
+        file_info: Dict[str, Any],
+        dependencies: Dict[str, str],
+        result: LocalRewrite
+    ) -> str:
+        code = blank_comments_and_literals(source)
+        package = PACKAGE_PATTERN.search(code)
+        legacy_package = package.group(1) if package else ''
+        new_package = (file_info.get('package_suggestion') or '').strip()
+        if not JAVA_PACKAGE_NAME.match(new_package):
+            new_package = legacy_package
+
+        renames = {}
+        declared = TYPE_PATTERN.search(code)
+        new_name = os.path.splitext(file_info.get('file_name_suggestion') or '')[0]
+        if declared and JAVA_IDENTIFIER.match(new_name) and new_name != declared.group(2):
+            renames[declared.group(2)] = new_name
+
+        qualified = {}
+        added_imports = []
+        for legacy, migrated in dependencies.items():
+            if '.' not in legacy or '.' not in migrated:
+                continue
+            qualified[legacy] = migrated
+            legacy_dependency_package, legacy_simple = legacy.rsplit('.', 1)
+            migrated_package, migrated_simple = migrated.rsplit('.', 1)
+            if legacy_simple != migrated_simple:
+                renames[legacy_simple] = migrated_simple
+            if legacy_dependency_package == legacy_package and migrated_package != new_package:
+                # Same package before the migration, a different one now
+                added_imports.append(migrated)
+
+        if qualified:
+            pattern = re.compile(r'(?<![\w.])(' + '|'.join(re.escape(name) for name in sorted(qualified, key=len, reverse=True)) + r')\b')
+            source, count = _replace_in_code(source, pattern, lambda match: qualified[match.group(1)])
+            if count:
+                result.changes.append(f"{count} reference(s) to migrated classes updated")
+        if renames:
+            pattern = re.compile(r'(?<![\w.])(' + '|'.join(re.escape(name) for name in renames) + r')\b')
+            source, count = _replace_in_code(source, pattern, lambda match: renames[match.group(1)])
+            if count:
+                result.changes.append("renamed " + ", ".join(f"{old} -> {new}" for old, new in sorted(renames.items())))
+
+        if new_package != legacy_package:
+            if package:
+                source = source[:package.start(1)] + new_package + source[package.end(1):]
+            else:
+                source = f"package {new_package};\n\n" + source
+            result.changes.append(f"package {legacy_package or '(default)'} -> {new_package}")
+
+        # Imports of classes now in the file's own package are redundant
+        for name in _imports(source):
+            if name.rsplit('.', 1)[0] == new_package:
+                source = _remove_import(source, name)
+        return _add_imports(source, [name for name in added_imports if _uses(source, name.rsplit('.', 1)[1])])
+
+    def _jakarta_package(self, package: str) -> bool:
+        for rule in self.jakarta_packages:
+            if rule.endswith('.*'):
+                if package == rule[:-2] or package.startswith(rule[:-1]):
+                    return True
+            elif package == rule:
+                return True
+        return False
+
+    def _rewrite_jakarta(self, source: str, result: LocalRewrite) -> str:
+        renamed = set()
+
+        def replacement(match: re.Match) -> str:
+            segments = ('javax' + match.group(1)).split('.')
+            package = []
+            for segment in segments:
+                if segment[:1].isupper():
+                    break
+                package.append(segment)
+            package = '.'.join(package)
+            if not self._jakarta_package(package):
+                return match.group()
+            renamed.add(package)
+            return 'jakarta' + match.group()[len('javax'):]
+
+        source, _ = _replace_in_code(source, JAVAX_NAME_PATTERN, replacement)
+        for package in sorted(renamed):
+            result.changes.append(f"{package} -> jakarta{package[len('javax'):]}")
+        return source
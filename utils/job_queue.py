@@ -0,0 +1,285 @@
+"""
+Job Queue for Java Migration System
+
+Durable SQLite queue shared by the orchestrator and the worker processes of
+the worker farm. A worker leases a job for a limited time and keeps the
+lease alive with heartbeats while it works on it. A lease that runs out (the
+worker died or hung) puts the job back in the queue, and a job that fails
+too often is given up. Workers only need the queue file, so processes on
+other nodes can attach through a shared filesystem.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+JOB_PENDING = "pending"
+JOB_LEASED = "leased"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+WORKER_ALIVE = "alive"
+WORKER_STOPPED = "stopped"
+WORKER_DEAD = "dead"
+
+
+@dataclass
+class Job:
+    """A leased unit of work"""
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+@dataclass
+class JobOutcome:
+    """Final state of a job"""
+    id: int
+    kind: str
+    status: str
+    result: Any = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+
+class JobQueue:
+    """SQLite-backed job queue with leases, retries and worker registration"""
+
+    def __init__(self, queue_file: str):
+        """
+        Initialize job queue
+
+        Args:
+            queue_file: SQLite file holding the queue (each process opens its own connection)
+        """
+        self.queue_file = queue_file
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(queue_file))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(queue_file, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " kind TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " max_attempts INTEGER NOT NULL,"
+            " worker TEXT,"
+            " lease_expires REAL,"
+            " result TEXT,"
+            " error TEXT,"
+            " updated_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);"
+            "CREATE TABLE IF NOT EXISTS workers ("
+            " id TEXT PRIMARY KEY,"
+            " node TEXT NOT NULL,"
+            " pid INTEGER NOT NULL,"
+            " model_host TEXT,"
+            " status TEXT NOT NULL,"
+            " jobs_done INTEGER NOT NULL DEFAULT 0,"
+            " started_at REAL NOT NULL,"
+            " heartbeat REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS control ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL);"
+        )
+
+    def _write(self, statements) -> Any:
+        """Run statements in one immediate transaction, so concurrent processes never lease the same job"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = statements(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def reset(self):
+        """Drop all jobs and workers and clear the shutdown flag, before a new run"""
+        def statements(conn):
+            for table in ("jobs", "workers", "control"):
+                conn.execute(f"DELETE FROM {table}")
+        self._write(statements)
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], max_attempts: int = 3) -> int:
+        """
+        Add a job
+
+        Args:
+            kind: Job handler name
+            payload: JSON-serializable arguments of the handler
+            max_attempts: Leases granted before the job is given up
+
+        Returns:
+            Job id
+        """
+        return self._write(lambda conn: conn.execute(
+            "INSERT INTO jobs (kind, payload, status, max_attempts, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (kind, json.dumps(payload), JOB_PENDING, max_attempts, time.time())
+        ).lastrowid)
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        """Lease the oldest pending job (None if there is none)"""
+        def statements(conn):
+            row = conn.execute(
+                "SELECT id, kind, payload, attempts FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (JOB_PENDING,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ?",
+                (JOB_LEASED, worker_id, now + lease_seconds, now, row[0])
+            )
+            conn.execute("UPDATE workers SET heartbeat = ? WHERE id = ?", (now, worker_id))
+            return Job(row[0], row[1], json.loads(row[2]), row[3] + 1)
+        return self._write(statements)
+
+    def heartbeat(self, worker_id: str, lease_seconds: float):
+        """Keep a worker registered as alive and extend the leases of the jobs it holds"""
+        def statements(conn):
+            now = time.time()
+            conn.execute("UPDATE workers SET heartbeat = ? WHERE id = ?", (now, worker_id))
+            conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE worker = ? AND status = ?",
+                (now + lease_seconds, worker_id, JOB_LEASED)
+            )
+        self._write(statements)
+
+    def complete(self, job_id: int, worker_id: str, result: Any) -> bool:
+        """
+        Store the result of a leased job
+
+        Returns:
+            False if the lease was lost (the job was handed to another worker meanwhile)
+        """
+        def statements(conn):
+            updated = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (JOB_DONE, json.dumps(result, default=str), time.time(), job_id, worker_id, JOB_LEASED)
+            ).rowcount
+            conn.execute("UPDATE workers SET jobs_done = jobs_done + ? WHERE id = ?", (updated, worker_id))
+            return updated == 1
+        return self._write(statements)
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """
+        Give a leased job back after an error; it is retried until its attempts are used up
+
+        Returns:
+            False if the lease was lost
+        """
+        def statements(conn):
+            return conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END, "
+                "worker = NULL, lease_expires = NULL, error = ?, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (JOB_PENDING, JOB_FAILED, error, time.time(), job_id, worker_id, JOB_LEASED)
+            ).rowcount == 1
+        return self._write(statements)
+
+    def requeue_expired(self) -> int:
+        """Put jobs whose lease ran out back in the queue (or give them up), returning how many"""
+        def statements(conn):
+            return conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END, "
+                "worker = NULL, lease_expires = NULL, error = COALESCE(error, 'Lease expired'), updated_at = ? "
+                "WHERE status = ? AND lease_expires < ?",
+                (JOB_PENDING, JOB_FAILED, time.time(), JOB_LEASED, time.time())
+            ).rowcount
+        return self._write(statements)
+
+    def register_worker(self, worker_id: str, node: str, pid: int, model_host: str = ""):
+        def statements(conn):
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO workers (id, node, pid, model_host, status, started_at, heartbeat) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (worker_id, node, pid, model_host, WORKER_ALIVE, now, now)
+            )
+        self._write(statements)
+
+    def unregister_worker(self, worker_id: str, status: str = WORKER_STOPPED) -> int:
+        """
+        Mark a worker stopped or dead and put the jobs it held back in the queue
+
+        Returns:
+            Number of jobs taken back from it
+        """
+        def statements(conn):
+            conn.execute("UPDATE workers SET status = ? WHERE id = ?", (status, worker_id))
+            return conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END, "
+                "worker = NULL, lease_expires = NULL, error = COALESCE(error, ?), updated_at = ? "
+                "WHERE worker = ? AND status = ?",
+                (JOB_PENDING, JOB_FAILED, f"Worker {worker_id} {status}", time.time(), worker_id, JOB_LEASED)
+            ).rowcount
+        return self._write(statements)
+
+    def reap_silent_workers(self, timeout: float) -> List[str]:
+        """Declare dead the workers without a heartbeat for this long and take their jobs back"""
+        with self._lock:
+            silent = [row[0] for row in self._conn.execute(
+                "SELECT id FROM workers WHERE status = ? AND heartbeat < ?", (WORKER_ALIVE, time.time() - timeout)
+            )]
+        for worker_id in silent:
+            self.unregister_worker(worker_id, WORKER_DEAD)
+        return silent
+
+    def workers(self, status: Optional[str] = WORKER_ALIVE) -> List[Dict[str, Any]]:
+        query, args = "SELECT id, node, pid, model_host, status, jobs_done, heartbeat FROM workers", ()
+        if status is not None:
+            query, args = query + " WHERE status = ?", (status,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY started_at", args).fetchall()
+        keys = ("id", "node", "pid", "model_host", "status", "jobs_done", "heartbeat")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def finished(self, job_ids: Iterable[int]) -> Dict[int, JobOutcome]:
+        """Outcomes of the given jobs that are done or given up"""
+        job_ids = list(job_ids)
+        outcomes = {}
+        # Stay below SQLite's limit on bound parameters
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, kind, status, result, error, attempts FROM jobs "
+                    f"WHERE id IN ({','.join('?' * len(chunk))}) AND status IN (?, ?)",
+                    (*chunk, JOB_DONE, JOB_FAILED)
+                ).fetchall()
+            for job_id, kind, status, result, error, attempts in rows:
+                outcomes[job_id] = JobOutcome(
+                    job_id, kind, status, json.loads(result) if result is not None else None, error, attempts
+                )
+        return outcomes
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs by status"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def shutdown(self):
+        """Ask the workers to exit once they are idle"""
+        self._write(lambda conn: conn.execute("INSERT OR REPLACE INTO control (key, value) VALUES ('shutdown', '1')"))
+
+    def is_shutdown(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM control WHERE key = 'shutdown'").fetchone() is not None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
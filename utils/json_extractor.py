@@ -0,0 +1,227 @@
+"""
+JSON Extractor for Java Migration System
+
+Finds the JSON objects in a model response in a single left-to-right pass.
+The scan knows about Markdown code fences (braces inside ```java blocks are
+not JSON) and about JSON string escaping, and collects every top-level
+object instead of grabbing from the first "{" to the last "}". Candidates
+that do not parse get cheap local repairs (raw newlines and tabs inside
+strings, trailing commas, objects cut off by an unterminated fence or the
+end of the response) before any caller falls back to re-prompting the model.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+FENCE = '```'
+JSON_FENCE_LANGUAGES = ('', 'json', 'json5', 'jsonc')
+
+
+@dataclass
+class JsonCandidate:
+    """Text of one top-level object found in a response"""
+    text: str
+    fenced: bool
+    complete: bool = True
+    closers: List[str] = field(default_factory=list)
+    in_string: bool = False
+    # Complete objects nested in an unterminated candidate, in case it is a stray brace
+    children: List['JsonCandidate'] = field(default_factory=list)
+
+
+@dataclass
+class ExtractedJson:
+    """A parsed top-level object and how it was obtained"""
+    value: Dict[str, Any]
+    fenced: bool
+    repaired: bool
+    size: int
+
+
+def scan_candidates(text: str) -> List[JsonCandidate]:
+    """
+    Collect top-level object candidates in one pass
+
+    A "{" that turns out not to open JSON (mismatched bracket, or a code fence
+    opening before it closes) is dropped and the largest complete objects
+    found inside it become candidates instead, so nothing is scanned twice.
+
+    Args:
+        text: Model response
+
+    Returns:
+        Candidates in order of appearance; unterminated ones keep the closers they miss
+    """
+    candidates: List[JsonCandidate] = []
+    fence: Optional[str] = None
+    stack: List[tuple] = []
+    children: List[tuple] = []
+    in_string = escaped = fenced = False
+    line_start = True
+    i, n = 0, len(text)
+
+    def nested() -> List[JsonCandidate]:
+        return [JsonCandidate(text[s:e + 1], fenced) for s, e in children]
+
+    while i < n:
+        if line_start and not in_string:
+            j = i
+            while j < n and text[j] in ' \t':
+                j += 1
+            if text.startswith(FENCE, j):
+                if stack:
+                    if fenced:
+                        # Object cut off by the closing fence
+                        candidates.append(JsonCandidate(
+                            text[stack[0][1]:i].rstrip(), fenced, False,
+                            [closer for closer, _ in reversed(stack)], False, nested()
+                        ))
+                    else:
+                        # A brace in prose that never closed before the fence
+                        candidates.extend(nested())
+                    stack, children = [], []
+                end_of_line = text.find('\n', j)
+                end_of_line = n if end_of_line < 0 else end_of_line
+                if fence is None:
+                    language = text[j + len(FENCE):end_of_line].strip().lower()
+                    fence = 'json' if language in JSON_FENCE_LANGUAGES else 'code'
+                else:
+                    fence = None
+                i = end_of_line
+                continue
+
+        char = text[i]
+        line_start = char == '\n'
+        i += 1
+
+        if fence == 'code':
+            continue
+        if not stack:
+            if char == '{':
+                stack, children, fenced = [('}', i - 1)], [], fence == 'json'
+                in_string = escaped = False
+        elif in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append(('}' if char == '{' else ']', i - 1))
+        elif char in '}]':
+            if stack[-1][0] != char:
+                # Mismatched bracket, not JSON
+                candidates.extend(nested())
+                stack, children = [], []
+                continue
+            _, opened = stack.pop()
+            if not stack:
+                candidates.append(JsonCandidate(text[opened:i], fenced))
+            elif char == '}':
+                # Keep only the outermost complete objects seen so far
+                while children and children[-1][0] > opened:
+                    children.pop()
+                children.append((opened, i - 1))
+
+    if stack:
+        candidates.append(JsonCandidate(
+            text[stack[0][1]:].rstrip(), fenced, False,
+            [closer for closer, _ in reversed(stack)], in_string, nested()
+        ))
+    return candidates
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """Drop commas directly before a closing bracket, outside strings"""
+    result = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '}]':
+            while result and result[-1] in ' \t\r\n':
+                result.pop()
+            if result and result[-1] == ',':
+                result.pop()
+        result.append(char)
+    return ''.join(result)
+
+
+def _parse(text: str, strict: bool = True) -> Optional[Dict[str, Any]]:
+    try:
+        # strict=False accepts control characters such as raw newlines inside strings
+        value = json.loads(text, strict=strict)
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def _repair(candidate: JsonCandidate) -> Optional[Dict[str, Any]]:
+    text = candidate.text
+    if not candidate.complete:
+        text = text.rstrip().rstrip(',') + ('"' if candidate.in_string else '') + ''.join(candidate.closers)
+    value = _parse(text, strict=False)
+    if value is not None:
+        return value
+    return _parse(_strip_trailing_commas(text), strict=False)
+
+
+def extract_json_objects(text: str) -> List[ExtractedJson]:
+    """
+    Parse every top-level JSON object of a response, repairing where cheap
+
+    Args:
+        text: Model response
+
+    Returns:
+        Parsed objects in order of appearance
+    """
+    objects = []
+    candidates = scan_candidates(text or '')
+    while candidates:
+        candidate = candidates.pop(0)
+        value = _parse(candidate.text) if candidate.complete else None
+        repaired = value is None
+        if repaired:
+            value = _repair(candidate)
+        if value is not None:
+            objects.append(ExtractedJson(value, candidate.fenced, repaired, len(candidate.text)))
+        elif candidate.children:
+            # Not truncated JSON but a stray brace: fall back to the objects inside it
+            candidates[:0] = candidate.children
+    return objects
+
+
+def extract_json(text: str) -> Dict[str, Any]:
+    """
+    Get the JSON answer of a response
+
+    Prefers objects in ```json fences, then objects that parsed without
+    repair, then the largest one.
+
+    Args:
+        text: Model response
+
+    Returns:
+        Parsed JSON object
+
+    Raises:
+        ValueError: If no JSON object can be found or repaired
+    """
+    objects = extract_json_objects(text)
+    if not objects:
+        raise ValueError("No valid JSON found in response")
+
+    best = min(objects, key=lambda o: (not o.fenced, o.repaired, -o.size))
+    return best.value
@@ -0,0 +1,103 @@
+"""
+JSON Stream Scanner for Java Migration System
+
+Incremental scanner fed with the text deltas of a streamed model response.
+It tracks string/escape state and brace depth across chunks and reports as
+soon as a balanced top-level JSON object that actually parses has been
+received, so the caller can stop generation instead of waiting for the
+trailing prose Ollama models tend to add after the JSON.
+"""
+
+import json
+from typing import Optional
+
+
+class JsonStreamScanner:
+    """Detect the first complete top-level JSON object in streamed text"""
+
+    def __init__(self, armed: bool = True):
+        """
+        Initialize scanner
+
+        Args:
+            armed: Look for the object right away (otherwise only after arm())
+        """
+        self.buffer = []
+        self.length = 0
+        self.armed = armed
+        self.reset()
+
+    def reset(self):
+        """Forget any partially received object (e.g. text before a tool call)"""
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.result: Optional[str] = None
+
+    def arm(self):
+        """Start looking for the object in the text received from now on"""
+        self.armed = True
+        self.reset()
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Consume the next chunk of streamed text
+
+        Args:
+            chunk: Text delta
+
+        Returns:
+            True once a complete JSON object has been received (see result)
+        """
+        offset = self.length
+        self.buffer.append(chunk)
+        self.length += len(chunk)
+        if self.result is not None:
+            return True
+        if not self.armed:
+            return False
+
+        for i, char in enumerate(chunk, offset):
+            if self._start is None:
+                if char == '{':
+                    self._start, self._depth = i, 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    candidate = self.text()[self._start:i + 1]
+                    if self._is_json(candidate):
+                        self.result = candidate
+                        return True
+                    # Balanced but not JSON (e.g. a Java block in prose), keep looking
+                    self.reset()
+
+        return False
+
+    def text(self) -> str:
+        """All text received so far"""
+        if len(self.buffer) > 1:
+            self.buffer = [''.join(self.buffer)]
+        return self.buffer[0] if self.buffer else ''
+
+    @staticmethod
+    def _is_json(candidate: str) -> bool:
+        try:
+            # An empty object is more likely a Java initializer block than the answer
+            parsed = json.loads(candidate, strict=False)
+            return isinstance(parsed, dict) and bool(parsed)
+        except ValueError:
+            return False
@@ -0,0 +1,174 @@
+"""
+Migration Manifest for Java Migration System
+
+Persists, for every migrated source file, its content hash, the analysis
+suggestions it was migrated with and the output files it produced, so that
+later runs only need to migrate what changed. Files the analysis could not
+place (or that are never migrated) are kept with their hash only, and files
+whose migration failed with their suggestions, so an unchanged tree needs no
+new analysis.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MANIFEST_FILE_NAME = ".migration_manifest.json"
+
+# Status of a manifest entry
+ENTRY_MIGRATED = "migrated"
+ENTRY_FAILED = "failed"
+ENTRY_SKIPPED = "skipped"
+
+# Build output and tooling directories never migrated
+IGNORED_DIRECTORIES = {"target", "build", ".git", ".idea", "node_modules", "__pycache__"}
+
+
+def normalize_source_path(path: str) -> str:
+    """Normalize a source path so analysis keys and scanned paths compare equal"""
+    return os.path.normpath(path)
+
+
+def expected_output_path(target_path: str, file_info: Dict[str, Any]) -> str:
+    """
+    Resolve where a migrated file is written from its analysis suggestions
+
+    Java packages (dotted names) map under src/main/java, directory-style
+    suggestions map under src/main, and an empty suggestion means the root
+    of the target project.
+    """
+    file_name = file_info.get('file_name_suggestion', '')
+    if file_name.endswith('.jsp'):
+        file_name = file_name[:-len('.jsp')] + '.html'
+
+    package = (file_info.get('package_suggestion') or '').strip().strip('/')
+    if not package or package == '.':
+        return os.path.join(target_path, file_name)
+    if '/' in package or '\\' in package:
+        return os.path.join(target_path, 'src', 'main', package, file_name)
+    return os.path.join(target_path, 'src', 'main', 'java', *package.split('.'), file_name)
+
+
+class MigrationManifest:
+    """Source path -> content hash, analysis suggestions and output files"""
+
+    VERSION = 1
+
+    def __init__(self, manifest_file: str):
+        """
+        Initialize migration manifest
+
+        Args:
+            manifest_file: JSON file holding the manifest
+        """
+        self.manifest_file = Path(manifest_file)
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load manifest entries from disk"""
+        if not self.manifest_file.exists():
+            return {}
+
+        with open(self.manifest_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != self.VERSION:
+            return {}
+        return data.get('files', {})
+
+    def save(self):
+        """Write the manifest atomically"""
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.manifest_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.VERSION, "files": self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.manifest_file)
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        """Get the SHA-256 content hash of a file"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @classmethod
+    def scan(cls, source_path: str) -> Dict[str, str]:
+        """Hash every migratable file under source_path"""
+        hashes = {}
+        for root, dirs, files in os.walk(source_path):
+            dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRECTORIES)
+            for file in sorted(files):
+                file_path = normalize_source_path(os.path.join(root, file))
+                hashes[file_path] = cls.hash_file(file_path)
+        return hashes
+
+    def diff(self, current_hashes: Dict[str, str]) -> Dict[str, List[str]]:
+        """
+        Classify current files against the manifest
+
+        Skipped files that changed count as added, since only a new analysis
+        can place them; failed files count as changed, so they are migrated
+        again with their recorded suggestions.
+        """
+        changes = {"added": [], "changed": [], "unchanged": [], "removed": []}
+        for file_path, file_hash in current_hashes.items():
+            entry = self.entries.get(file_path)
+            status = entry.get('status', ENTRY_MIGRATED) if entry else None
+            if entry is None or (status == ENTRY_SKIPPED and entry['hash'] != file_hash):
+                changes["added"].append(file_path)
+            elif status == ENTRY_FAILED or entry['hash'] != file_hash:
+                changes["changed"].append(file_path)
+            else:
+                changes["unchanged"].append(file_path)
+
+        changes["removed"] = sorted(set(self.entries) - set(current_hashes))
+        return changes
+
+    def get_file_info(self, source_path: str) -> Optional[Dict[str, Any]]:
+        """Get the analysis suggestions a file was last migrated with"""
+        entry = self.entries.get(normalize_source_path(source_path))
+        if entry is None or entry.get('status') == ENTRY_SKIPPED:
+            return None
+        return {
+            "file_name_suggestion": entry['file_name_suggestion'],
+            "package_suggestion": entry['package_suggestion']
+        }
+
+    def record(
+        self,
+        source_path: str,
+        file_hash: str,
+        file_info: Dict[str, Any],
+        outputs: List[str],
+        status: str = ENTRY_MIGRATED
+    ):
+        """Record a migrated file, or one whose migration failed (status ENTRY_FAILED, no outputs)"""
+        self.entries[normalize_source_path(source_path)] = {
+            "hash": file_hash,
+            "status": status,
+            "file_name_suggestion": file_info.get('file_name_suggestion', ''),
+            "package_suggestion": file_info.get('package_suggestion', ''),
+            "outputs": outputs
+        }
+
+    def record_skipped(self, source_path: str, file_hash: str):
+        """Record a file that is not migrated (unplaced by the analysis or ignored)"""
+        self.entries[normalize_source_path(source_path)] = {
+            "hash": file_hash,
+            "status": ENTRY_SKIPPED,
+            "outputs": []
+        }
+
+    def is_skipped(self, source_path: str) -> bool:
+        """Whether a file is recorded as not migrated"""
+        entry = self.entries.get(normalize_source_path(source_path))
+        return entry is not None and entry.get('status') == ENTRY_SKIPPED
+
+    def remove(self, source_path: str) -> List[str]:
+        """Forget a file, returning the outputs it produced"""
+        entry = self.entries.pop(normalize_source_path(source_path), None)
+        return entry['outputs'] if entry else []
@@ -0,0 +1,204 @@
+"""
+Model Router for Java Migration System
+
+Complexity-aware routing of per-file model calls. Every file is scored
+locally from its size, the number of types it declares, its kind (EJB
+component, JSP, XML descriptor, plain Java) and its annotation density, and
+sent to the cheapest tier of models in config.yml whose max_score covers it,
+so a trivial remote interface does not cost a call to the largest model. An
+answer that cannot be parsed is retried on the next tier up. Decisions are
+printed and counted, and every call is attributed to its tier in the run
+telemetry.
+"""
+
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from .config_loader import get_config
+from .java_chunker import estimate_tokens
+from .package_mapper import EJB_COMPONENT_ANNOTATIONS
+from .source_index import ANNOTATION_PATTERN, STRUCTURE_PATTERN, blank_comments_and_literals
+from .telemetry import get_telemetry
+
+T = TypeVar("T")
+
+EJB_INTERFACE_PATTERN = re.compile(r'\b(?:SessionBean|EntityBean|MessageDrivenBean)\b')
+# Short files would otherwise get an inflated density from a single annotation
+MIN_DENSITY_LINES = 50
+
+
+@dataclass
+class ModelTier:
+    """Model serving the files scored up to max_score (None = every score)"""
+    name: str
+    model: str
+    host: str = ""
+    max_score: Optional[float] = None
+
+
+@dataclass
+class FileScore:
+    """Complexity of a file as seen by the router"""
+    file_path: str
+    kind: str
+    tokens: int
+    types: int
+    annotations: int
+    score: float
+
+
+def file_kind(file_path: str, code: str = "") -> str:
+    """Kind of a file: ejb, java, jsp, xml or other"""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.java':
+        annotations = {name.rsplit('.', 1)[-1] for name in ANNOTATION_PATTERN.findall(code)}
+        if annotations & set(EJB_COMPONENT_ANNOTATIONS) or EJB_INTERFACE_PATTERN.search(code):
+            return 'ejb'
+        return 'java'
+    if extension in ('.jsp', '.jspf', '.jspx'):
+        return 'jsp'
+    if extension == '.xml':
+        return 'xml'
+    return 'other'
+
+
+def score_file(file_path: str, weights: Optional[Dict[str, Any]] = None) -> FileScore:
+    """
+    Score the complexity of a file without a model call
+
+    Args:
+        file_path: File to score (a missing file scores 0)
+        weights: Score weights (default: routing.weights from config.yml)
+    """
+    weights = weights or get_config().get_routing_weights()
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            source = f.read()
+    except OSError:
+        return FileScore(file_path, 'other', 0, 0, 0, 0.0)
+
+    code = blank_comments_and_literals(source) if file_path.endswith('.java') else ""
+    kind = file_kind(file_path, code)
+    tokens = estimate_tokens(source)
+    types = sum(1 for match in STRUCTURE_PATTERN.finditer(code) if match.group(1))
+    annotations = len(ANNOTATION_PATTERN.findall(code))
+    lines = max(source.count('\n') + 1, MIN_DENSITY_LINES)
+
+    score = (
+        tokens / max(float(weights['tokens_per_point']), 1.0)
+        + float(weights['per_type']) * max(types - 1, 0)
+        + float(weights['annotation_density']) * annotations * 100 / lines
+        + float(weights['kinds'].get(kind, 0))
+    )
+    return FileScore(file_path, kind, tokens, types, annotations, round(score, 1))
+
+
+class ModelRouter:
+    """Send per-file calls of an agent wrapper to the model tier matching the files' complexity"""
+
+    def __init__(
+        self,
+        create_runner: Callable[[ModelTier], Any],
+        tiers: Optional[List[ModelTier]] = None,
+        weights: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize model router
+
+        Args:
+            create_runner: Builds the AgentRunner of a tier, called on the tier's first use
+            tiers: Tiers from cheapest to strongest (default: routing.tiers from config.yml)
+            weights: Score weights (default: routing.weights from config.yml)
+
+        Raises:
+            ValueError: If no tier is configured
+        """
+        config = get_config()
+        self.tiers = tiers or [ModelTier(**tier) for tier in config.get_routing_tiers()]
+        if not self.tiers:
+            raise ValueError("Model routing is enabled but routing.tiers is empty")
+        self.weights = weights or config.get_routing_weights()
+        self.create_runner = create_runner
+        self._runners: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def route(self, file_paths: List[str]) -> int:
+        """Index of the cheapest tier covering the most complex of the files"""
+        scores = [score_file(file_path, self.weights) for file_path in file_paths]
+        top = max(scores, key=lambda score: score.score)
+        index = next(
+            (number for number, tier in enumerate(self.tiers[:-1])
+             if tier.max_score is None or top.score <= tier.max_score),
+            len(self.tiers) - 1
+        )
+        tier = self.tiers[index]
+        get_telemetry().record_routing(tier.name, count=len(file_paths))
+        top_file = f"{os.path.basename(top.file_path)}: " if len(file_paths) > 1 else ""
+        print(f"          🧭 {self._label(file_paths)} -> {tier.name} ({tier.model}), score {top.score} "
+              f"({top_file}{top.kind}, {top.tokens} tokens, {top.types} types, {top.annotations} annotations)")
+        return index
+
+    def runner(self, index: int) -> Any:
+        """AgentRunner of a tier, created on first use"""
+        tier = self.tiers[index]
+        with self._lock:
+            if tier.name not in self._runners:
+                self._runners[tier.name] = self.create_runner(tier)
+            return self._runners[tier.name]
+
+    def run(self, file_paths: List[str], call: Callable[[Any], Optional[T]]) -> Optional[T]:
+        """
+        Run a call on the tier routed for the files, escalating while its answer cannot be parsed
+
+        Args:
+            file_paths: Files the call is about
+            call: Sends the prompt through the given AgentRunner and parses the answer;
+                  returning None or raising ValueError means the answer was unusable
+
+        Returns:
+            Result of the call (None if the strongest tier's answer was unusable too)
+        """
+        index = self.route(file_paths)
+        while True:
+            try:
+                result = call(self.runner(index))
+            except ValueError as e:
+                if index == len(self.tiers) - 1:
+                    raise
+                self._escalate(file_paths, index, e)
+            else:
+                if result is not None or index == len(self.tiers) - 1:
+                    return result
+                self._escalate(file_paths, index)
+            index += 1
+
+    async def arun(self, file_paths: List[str], call: Callable[[Any], Awaitable[Optional[T]]]) -> Optional[T]:
+        """Async twin of run"""
+        index = self.route(file_paths)
+        while True:
+            try:
+                result = await call(self.runner(index))
+            except ValueError as e:
+                if index == len(self.tiers) - 1:
+                    raise
+                self._escalate(file_paths, index, e)
+            else:
+                if result is not None or index == len(self.tiers) - 1:
+                    return result
+                self._escalate(file_paths, index)
+            index += 1
+
+    def _escalate(self, file_paths: List[str], index: int, error: Optional[Exception] = None):
+        current, bigger = self.tiers[index], self.tiers[index + 1]
+        get_telemetry().record_routing(bigger.name, escalated=True, count=len(file_paths))
+        reason = f": {error}" if error else ""
+        print(f"          ⤴️  {self._label(file_paths)}: unusable answer from {current.name}{reason}, "
+              f"retrying on {bigger.name} ({bigger.model})")
+
+    @staticmethod
+    def _label(file_paths: List[str]) -> str:
+        label = os.path.basename(file_paths[0])
+        return label + (f" (+{len(file_paths) - 1} more)" if len(file_paths) > 1 else "")
@@ -0,0 +1,274 @@
+"""
+Output Writer for Java Migration System
+
+Stages the files a run produces (migrated sources, tests, summaries) in
+memory and commits them together: every staged file is compared by hash
+with the file already on disk, only changed ones are written, each through
+a temporary file renamed into place, and nothing is renamed until every
+temporary file has been written. Unchanged outputs keep their timestamps,
+so IDE and Maven incremental builds downstream are not invalidated.
+
+With a run journal attached, every staged write is also kept in the journal
+until it is committed, so outputs of tasks finished before a crash are not
+lost and a resumed run commits them with the rest of the phase.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+from agno.tools.file import FileTools
+from agno.utils.log import log_error, log_info
+
+from .config_loader import get_config
+
+if TYPE_CHECKING:
+    from .run_journal import RunJournal
+
+
+@dataclass
+class WriteReport:
+    """Outcome of committing staged outputs"""
+    written: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return f"{len(self.written)} written, {len(self.unchanged)} unchanged, {len(self.deleted)} deleted"
+
+
+def _file_mode() -> int:
+    """Permissions of a newly created file under the current umask"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+class OutputWriter:
+    """Stage output files and commit them atomically, skipping identical content"""
+
+    def __init__(self, staged: bool = True):
+        """
+        Initialize output writer
+
+        Args:
+            staged: Hold writes until commit() (otherwise each write is committed right away)
+        """
+        self.staged = staged
+        self._files: Dict[str, bytes] = {}
+        self._deleted: Set[str] = set()
+        self._lock = threading.Lock()
+        self._mode = _file_mode()
+        self._journal: Optional["RunJournal"] = None
+
+    def attach_journal(self, journal: Optional["RunJournal"]):
+        """
+        Keep staged outputs in a run journal until they are committed
+
+        Outputs the journal still holds from an interrupted run are staged
+        again, so they are committed with the resumed phase.
+
+        Args:
+            journal: Journal of the current run (None to detach)
+        """
+        with self._lock:
+            self._journal = journal
+            if journal is None:
+                return
+            for key, data in journal.staged_outputs().items():
+                if data is None:
+                    self._files.pop(key, None)
+                    self._deleted.add(key)
+                else:
+                    self._files[key] = data
+                    self._deleted.discard(key)
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    def write(self, path: str, content: str) -> str:
+        """
+        Stage the content of an output file
+
+        Args:
+            path: Output file
+            content: Its content
+
+        Returns:
+            The path, for convenience
+        """
+        key = self._key(path)
+        data = content.encode('utf-8')
+        with self._lock:
+            self._files[key] = data
+            self._deleted.discard(key)
+            if self._journal is not None and self.staged:
+                self._journal.stage_output(key, data)
+        if not self.staged:
+            self.commit()
+        return path
+
+    def delete(self, path: str):
+        """Stage the deletion of an output file"""
+        key = self._key(path)
+        with self._lock:
+            self._files.pop(key, None)
+            self._deleted.add(key)
+            if self._journal is not None and self.staged:
+                self._journal.stage_output(key, None)
+        if not self.staged:
+            self.commit()
+
+    def read(self, path: str) -> Optional[str]:
+        """Content of a file as of the staged writes (None if missing or staged for deletion)"""
+        key = self._key(path)
+        with self._lock:
+            if key in self._files:
+                return self._files[key].decode('utf-8')
+            if key in self._deleted:
+                return None
+        try:
+            with open(key, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @property
+    def pending(self) -> int:
+        """Number of staged writes and deletions"""
+        with self._lock:
+            return len(self._files) + len(self._deleted)
+
+    def discard(self):
+        """Drop everything staged since the last commit (an attached journal keeps its copy for resume)"""
+        with self._lock:
+            self._files, self._deleted = {}, set()
+
+    def drain(self) -> Dict[str, Optional[str]]:
+        """
+        Take everything staged since the last commit without writing it
+
+        Returns:
+            Output path -> staged content (None for a staged deletion)
+        """
+        with self._lock:
+            files, deleted = self._files, self._deleted
+            self._files, self._deleted = {}, set()
+        drained: Dict[str, Optional[str]] = {path: data.decode('utf-8') for path, data in files.items()}
+        drained.update((path, None) for path in deleted)
+        return drained
+
+    def commit(self) -> WriteReport:
+        """
+        Write the staged files that differ from disk and apply staged deletions
+
+        Every changed file is first written to a temporary file next to it;
+        only once all of them exist are they renamed into place, so a failure
+        while writing leaves the previous outputs untouched.
+
+        Returns:
+            WriteReport with the written, unchanged and deleted paths
+        """
+        with self._lock:
+            files, deleted = self._files, self._deleted
+            self._files, self._deleted = {}, set()
+            journal = self._journal
+
+        report = WriteReport()
+        renames = []
+        try:
+            for path, data in sorted(files.items()):
+                if self._unchanged(path, data):
+                    report.unchanged.append(path)
+                    continue
+                directory = os.path.dirname(path)
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+                renames.append((tmp_path, path))
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else self._mode)
+        except BaseException:
+            for tmp_path, _ in renames:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            raise
+
+        for tmp_path, path in renames:
+            os.replace(tmp_path, path)
+            report.written.append(path)
+        for path in sorted(deleted):
+            if os.path.exists(path):
+                os.remove(path)
+                report.deleted.append(path)
+        if journal is not None and (files or deleted):
+            journal.clear_staged_outputs()
+        return report
+
+    @staticmethod
+    def _unchanged(path: str, data: bytes) -> bool:
+        try:
+            if os.path.getsize(path) != len(data):
+                return False
+            with open(path, 'rb') as f:
+                return hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest()
+        except OSError:
+            return False
+
+
+class StagedFileTools(FileTools):
+    """agno FileTools whose saves go through the output writer instead of straight to disk"""
+
+    def __init__(self, writer: Optional[OutputWriter] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = writer or get_output_writer()
+
+    def save_file(self, contents: str, file_name: str, overwrite: bool = True) -> str:
+        """Saves the contents to a file called `file_name` and returns the file name if successful.
+
+        :param contents: The contents to save.
+        :param file_name: The name of the file to save to.
+        :param overwrite: Overwrite the file if it already exists.
+        :return: The file name if successful, otherwise returns an error message.
+        """
+        file_path = str(Path(self.base_dir).joinpath(file_name))
+        if not overwrite and self.writer.read(file_path) is not None:
+            return f"File {file_name} already exists"
+        self.writer.write(file_path, contents)
+        log_info(f"Staged: {file_path}")
+        return str(file_name)
+
+    def read_file(self, file_name: str) -> str:
+        """Reads the contents of the file `file_name` and returns the contents if successful.
+
+        :param file_name: The name of the file to read.
+        :return: The contents of the file if successful, otherwise returns an error message.
+        """
+        contents = self.writer.read(str(Path(self.base_dir).joinpath(file_name)))
+        if contents is None:
+            log_error(f"Error reading file: {file_name} not found")
+            return f"Error reading file: {file_name} not found"
+        return contents
+
+
+_output_writer = None
+_output_writer_lock = threading.Lock()
+
+
+def get_output_writer() -> OutputWriter:
+    """
+    Get global output writer instance
+
+    Returns:
+        OutputWriter shared by all agents, staged unless disabled in config.yml
+    """
+    global _output_writer
+    with _output_writer_lock:
+        if _output_writer is None:
+            _output_writer = OutputWriter(staged=get_config().use_staged_output())
+    return _output_writer
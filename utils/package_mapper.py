@@ -0,0 +1,246 @@
+"""
+Package Mapper for Java Migration System
+
+Rule-based mapping of a legacy Java EE project onto a Spring Boot layout.
+Reads Java package declarations and types from the source index, Maven
+module packaging (war/ejb/ear) and file kinds (JSP, web.xml, ejb-jar.xml, ...) to produce the same
+file_name_suggestion/package_suggestion map the code analyzer prompt asks the
+model for, without a model call. Files no rule can place are reported as
+unmapped so only those need to be sent to the model; files the migration
+never takes (.md documentation) are reported as skipped and sent nowhere.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .migration_manifest import IGNORED_DIRECTORIES
+from .source_index import JavaSourceIndex, get_source_index
+
+PACKAGING_PATTERN = re.compile(r'<packaging>\s*(\w+)\s*</packaging>')
+
+EJB_COMPONENT_ANNOTATIONS = ('Stateless', 'Stateful', 'Singleton', 'MessageDriven')
+EJB_VIEW_ANNOTATIONS = ('Remote', 'Local')
+STATIC_EXTENSIONS = ('.css', '.js', '.html', '.htm', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico')
+RESOURCE_EXTENSIONS = ('.properties', '.yml', '.yaml', '.sql')
+EAR_DESCRIPTORS = ('application.xml', 'ejb-jar.xml', 'jboss.xml', 'weblogic-ejb-jar.xml', 'glassfish-ejb-jar.xml')
+# The migration prompt ignores these files
+SKIPPED_EXTENSIONS = ('.md',)
+
+
+@dataclass
+class MappingResult:
+    """Files placed by the rules, which rule placed each, files left for the model and files not migrated"""
+    files: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    rules: Dict[str, str] = field(default_factory=dict)
+    unmapped: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+
+
+class PackageMapper:
+    """Map legacy project files onto a Spring Boot package layout"""
+
+    def __init__(self, source_path: str, base_package: Optional[str] = None,
+                 index: Optional[JavaSourceIndex] = None):
+        """
+        Initialize package mapper
+
+        Args:
+            source_path: Path to legacy Java project, used as root of the returned keys
+            base_package: Root package of the Spring Boot app (default: common prefix of legacy packages)
+            index: Source index of the project (default: refreshed on-disk index)
+        """
+        self.source_path = source_path
+        self.base_package = base_package
+        self.index = index
+        self._java_entries: Dict[str, Dict[str, Any]] = {}
+
+    def map(self) -> MappingResult:
+        """Place every file of the project, collecting the ones no rule applies to"""
+        result = MappingResult()
+        files = self._list_files()
+
+        self.index = self.index or get_source_index(self.source_path)
+        self._java_entries = dict(self.index.entries())
+
+        if not self.base_package:
+            self.base_package = self._common_base_package()
+        interface_names = self._ejb_view_interfaces()
+
+        targets = set()
+        for file_path in files:
+            if file_path.lower().endswith(SKIPPED_EXTENSIONS):
+                result.skipped.append(file_path)
+                continue
+
+            placement = self._place(file_path, interface_names)
+            if placement is None:
+                result.unmapped.append(file_path)
+                continue
+
+            rule, package, file_name = placement
+            target = (package, file_name)
+            if target in targets:
+                # Two files would land on the same output, let the model decide
+                result.unmapped.append(file_path)
+                continue
+
+            targets.add(target)
+            result.files[file_path] = {
+                "file_name_suggestion": file_name,
+                "package_suggestion": package
+            }
+            result.rules[file_path] = rule
+
+        return result
+
+    def _list_files(self) -> List[str]:
+        files = []
+        for root, dirs, names in os.walk(self.source_path):
+            dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRECTORIES)
+            files.extend(os.path.join(root, name) for name in sorted(names))
+        return files
+
+    @staticmethod
+    def _read(file_path: str) -> str:
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read()
+        except OSError:
+            return ''
+
+    def _common_base_package(self) -> str:
+        """Longest package prefix shared by all legacy Java sources"""
+        packages = [
+            entry['package'].split('.') for entry in self._java_entries.values() if entry['package']
+        ]
+        if not packages:
+            return 'com.example'
+
+        prefix = packages[0]
+        for package in packages[1:]:
+            common = 0
+            while common < min(len(prefix), len(package)) and prefix[common] == package[common]:
+                common += 1
+            prefix = prefix[:common]
+
+        # Keep the shared prefix above the module-specific segment (com.example.ejb + com.example.web -> com.example)
+        if len(packages) == 1 and len(prefix) > 2:
+            prefix = prefix[:-1]
+        prefix = [segment for segment in prefix if 'legacy' not in segment.lower()]
+        return '.'.join(prefix) or 'com.example'
+
+    def _ejb_view_interfaces(self) -> Dict[str, str]:
+        """Simple names of @Remote/@Local business interfaces mapped to their bean base name"""
+        interfaces = {}
+        for entry in self._java_entries.values():
+            if not entry['types'] or entry['types'][0]['kind'] != 'interface':
+                continue
+            name = entry['types'][0]['name']
+            if _has_annotation(entry, EJB_VIEW_ANNOTATIONS) or name.endswith(('Remote', 'Local')):
+                interfaces[name] = re.sub(r'(Remote|Local)$', '', name)
+        return interfaces
+
+    def _module_packaging(self, file_path: str) -> str:
+        """Packaging of the nearest enclosing Maven module (war, ejb, ear, jar, pom)"""
+        directory = os.path.dirname(file_path)
+        root = os.path.normpath(self.source_path)
+        while True:
+            pom = os.path.join(directory, 'pom.xml')
+            if os.path.exists(pom):
+                match = PACKAGING_PATTERN.search(self._read(pom))
+                return match.group(1) if match else 'jar'
+
+            if os.path.normpath(directory) == root or os.path.dirname(directory) == directory:
+                break
+            directory = os.path.dirname(directory)
+
+        name = os.path.basename(os.path.dirname(file_path)).lower()
+        for packaging in ('war', 'ejb', 'ear'):
+            if packaging in name:
+                return packaging
+        return 'jar'
+
+    def _place(self, file_path: str, interface_names: Dict[str, str]):
+        """Return (rule, package_suggestion, file_name_suggestion) or None"""
+        file_name = os.path.basename(file_path)
+        rel_path = os.path.relpath(file_path, self.source_path).replace(os.sep, '/')
+
+        if file_name.endswith('.java'):
+            return self._place_java(file_path, file_name, interface_names)
+
+        if file_name.endswith('.jsp'):
+            return 'jsp', 'resources/templates', file_name[:-len('.jsp')] + '.html'
+
+        if file_name == 'web.xml':
+            return 'web.xml', f'{self.base_package}.config', 'WebConfig.java'
+
+        if file_name in EAR_DESCRIPTORS:
+            return 'ee-descriptor', '', file_name
+
+        if file_name == 'pom.xml':
+            if rel_path == 'pom.xml':
+                return 'root-pom', '', file_name
+            return None
+
+        if '/webapp/' in f'/{rel_path}' and file_name.lower().endswith(STATIC_EXTENSIONS):
+            static_dir = os.path.dirname(rel_path.split('webapp/', 1)[1])
+            return 'static', '/'.join(filter(None, ['resources/static', static_dir])), file_name
+
+        if '/src/main/resources/' in f'/{rel_path}' and file_name.lower().endswith(RESOURCE_EXTENSIONS):
+            resource_dir = os.path.dirname(rel_path.split('src/main/resources/', 1)[1])
+            return 'resource', '/'.join(filter(None, ['resources', resource_dir])), file_name
+
+        return None
+
+    def _place_java(self, file_path: str, file_name: str, interface_names: Dict[str, str]):
+        entry = self._java_entries.get(file_path)
+        if not entry or not entry['types']:
+            return None
+
+        declared = entry['types'][0]
+        kind, name = declared['kind'], declared['name']
+        extends = [_simple_name(t) for t in declared['extends']]
+        implements = [_simple_name(t) for t in declared['implements']]
+        base = self.base_package
+        packaging = self._module_packaging(file_path)
+
+        if kind == 'interface' and name in interface_names:
+            return 'ejb-business-interface', f'{base}.service', f'{interface_names[name]}Service.java'
+
+        if _has_annotation(entry, EJB_COMPONENT_ANNOTATIONS) or (packaging == 'ejb' and name.endswith('Bean')):
+            bean_name = re.sub(r'(Bean|EJB|Ejb)$', '', name)
+            implements_view = any(view in implements for view in interface_names)
+            suffix = 'ServiceImpl' if implements_view else 'Service'
+            return 'ejb-component', f'{base}.service', f'{bean_name}{suffix}.java'
+
+        if 'HttpServlet' in extends or _has_annotation(entry, ('WebServlet',)):
+            return 'servlet', f'{base}.controller', re.sub(r'Servlet$', '', name) + 'Controller.java'
+
+        if 'Filter' in implements or _has_annotation(entry, ('WebFilter',)):
+            return 'servlet-filter', f'{base}.filter', file_name
+
+        if any(t.endswith('Listener') for t in implements) or _has_annotation(entry, ('WebListener',)):
+            return 'servlet-listener', f'{base}.config', file_name
+
+        if _has_annotation(entry, ('Entity',)):
+            return 'entity', f'{base}.model', file_name
+
+        if re.search(r'(Dao|DAO|Repository)$', name):
+            return 'repository', f'{base}.repository', re.sub(r'(Dao|DAO)$', 'Repository', name) + '.java'
+
+        if entry['package']:
+            segments = [s for s in entry['package'].split('.') if 'legacy' not in s.lower()]
+            return 'package-declaration', '.'.join(segments) or base, file_name
+
+        return 'default-package', base, file_name
+
+
+def _simple_name(type_name: str) -> str:
+    return type_name.rsplit('.', 1)[-1]
+
+
+def _has_annotation(entry: Dict[str, Any], names) -> bool:
+    """Whether an indexed file uses any of the annotations, by simple or qualified name"""
+    return any(_simple_name(annotation) in names for annotation in entry['annotations'])
@@ -0,0 +1,122 @@
+"""
+Identity Priming Snapshots for Java Migration System
+
+Identity priming sends every configured identity_priming layer to the model
+before an agent does any work. The primed conversation depends on the
+agent's YAML configuration and on the model answering it, so it is stored per
+agent, model (id and endpoint) and configuration hash in the agent SQLite db
+and replayed on later startups instead of paying the model round trips again.
+"""
+
+import json
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+from .telemetry import record_agent_run
+
+SNAPSHOT_TABLE = "identity_priming_snapshots"
+
+
+class PrimingSnapshotStore:
+    """Primed identity conversations keyed by agent name, model and config hash"""
+
+    def __init__(self, db_file: str):
+        """
+        Initialize snapshot store
+
+        Args:
+            db_file: SQLite database file shared with the agents
+        """
+        self.db_file = db_file
+        with self._connect() as conn:
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({SNAPSHOT_TABLE})")]
+            if columns and 'model' not in columns:
+                # Snapshots from before they were keyed by model are primed again once
+                conn.execute(f"DROP TABLE {SNAPSHOT_TABLE}")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {SNAPSHOT_TABLE} ("
+                " agent_name TEXT NOT NULL,"
+                " model TEXT NOT NULL,"
+                " config_hash TEXT NOT NULL,"
+                " messages TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " PRIMARY KEY (agent_name, model, config_hash))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_file, timeout=30)
+
+    def load(self, agent_name: str, model: str, config_hash: str) -> Optional[List[Dict[str, str]]]:
+        """Get the primed conversation for this exact model and configuration"""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT messages FROM {SNAPSHOT_TABLE} WHERE agent_name = ? AND model = ? AND config_hash = ?",
+                (agent_name, model, config_hash)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, agent_name: str, model: str, config_hash: str, messages: List[Dict[str, str]]):
+        """Store the primed conversation, replacing the model's snapshots of older configurations"""
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM {SNAPSHOT_TABLE} WHERE agent_name = ? AND model = ?", (agent_name, model))
+            conn.execute(
+                f"INSERT INTO {SNAPSHOT_TABLE} (agent_name, model, config_hash, messages, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (agent_name, model, config_hash, json.dumps(messages), time.time())
+            )
+
+
+def model_key(model) -> str:
+    """Model id and endpoint of an agno model, e.g. qwen2.5-coder:7b@http://localhost:11434"""
+    endpoint = getattr(model, 'host', None) or getattr(model, 'base_url', None) or ''
+    return f"{getattr(model, 'id', '')}@{endpoint}"
+
+
+def prime_identity(agent, agent_config, db_file: str) -> bool:
+    """
+    Prime an agent's identity, reusing a stored snapshot when its config is unchanged
+
+    Args:
+        agent: agno Agent to prime
+        agent_config: AgentConfigLoader of the agent
+        db_file: SQLite database file holding the snapshots
+
+    Returns:
+        True if the agent is primed (or priming is disabled)
+    """
+    agent_name = agent_config.get_basic_config()['name']
+    try:
+        priming_config = agent_config.get_identity_priming_config()
+
+        if not priming_config.get('enabled', True):
+            return True
+
+        store = PrimingSnapshotStore(db_file)
+        model = model_key(agent.model)
+        config_hash = agent_config.get_config_hash()
+        messages = store.load(agent_name, model, config_hash)
+        if messages is not None:
+            # Replay the primed conversation in front of every run instead of re-priming
+            agent.additional_input = messages
+            print(f"✅ {agent_name} identity restored from snapshot!")
+            return True
+
+        messages = []
+        for layer in priming_config.get('layers', []):
+            message = layer.get('message', '')
+            if message:
+                response = agent.run(message)
+                record_agent_run(response, agent)
+                messages.append({"role": "user", "content": message})
+                messages.append({"role": "assistant", "content": response.content})
+
+        store.save(agent_name, model, config_hash, messages)
+        # Keep the identity in context once the history window has moved past the priming runs
+        agent.additional_input = messages
+        print(f"✅ {agent_name} identity successfully established!")
+        return True
+
+    except Exception as e:
+        print(f"❌ {agent_name} priming failed: {e}")
+        return False
@@ -0,0 +1,186 @@
+"""
+Resource Registry for Java Migration System
+
+Process-wide registry handing out one pooled, keep-alive HTTP client per
+model endpoint (per event loop for the async client) and one tuned SQLite
+handle per database file, so every agent in the process shares connections
+instead of opening its own.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from agno.db.sqlite import SqliteDb
+from agno.models.base import Model
+from agno.models.ollama import Ollama
+from ollama import AsyncClient, Client
+from sqlalchemy import create_engine, event
+
+from .config_loader import get_config
+
+_lock = threading.Lock()
+_ollama_clients: Dict[str, Client] = {}
+# An httpx pool is bound to the event loop that opened it, so async clients are kept per loop
+_ollama_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_sqlite_dbs: Dict[str, SqliteDb] = {}
+
+
+def _ollama_client_params(host: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+    """Registry key and client parameters of an Ollama endpoint"""
+    config = get_config()
+    api_key = config.get_model_api_key()
+    host = host or config.get_model_host() or ("https://ollama.com" if api_key else None)
+    client_params = {
+        "host": host,
+        "timeout": config.get_model_timeout(),
+        "headers": {"authorization": f"Bearer {api_key}"} if api_key else None,
+        "limits": httpx.Limits(
+            max_connections=config.get_model_pool_max_connections(),
+            max_keepalive_connections=config.get_model_pool_max_keepalive(),
+            keepalive_expiry=config.get_model_pool_keepalive_expiry()
+        )
+    }
+    return host or "default", client_params
+
+
+def get_ollama_client(host: Optional[str] = None) -> Client:
+    """
+    Get the shared sync Ollama client for an endpoint
+
+    Args:
+        host: Ollama endpoint (default: model.host from config.yml)
+    """
+    key, client_params = _ollama_client_params(host)
+    with _lock:
+        if key not in _ollama_clients:
+            _ollama_clients[key] = Client(**client_params)
+        return _ollama_clients[key]
+
+
+def get_ollama_async_client(host: Optional[str] = None) -> AsyncClient:
+    """
+    Get the async Ollama client for an endpoint on the running event loop
+
+    Each event loop gets its own client, so a later asyncio.run (the async
+    pipeline after priming, the benchmarks) never reuses a pool bound to a
+    closed loop. Called outside a running loop, it returns a new client.
+
+    Args:
+        host: Ollama endpoint (default: model.host from config.yml)
+    """
+    key, client_params = _ollama_client_params(host)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return AsyncClient(**client_params)
+    with _lock:
+        clients = _ollama_async_clients.setdefault(loop, {})
+        if key not in clients:
+            clients[key] = AsyncClient(**client_params)
+        return clients[key]
+
+
+class SharedClientOllama(Ollama):
+    """Ollama model resolving its clients from the registry on every request"""
+
+    def get_client(self) -> Client:
+        return get_ollama_client(self.host)
+
+    def get_async_client(self) -> AsyncClient:
+        return get_ollama_async_client(self.host)
+
+
+def create_ollama_model(model_name: Optional[str] = None, host: Optional[str] = None) -> Ollama:
+    """
+    Create an Ollama model that uses the shared clients of its endpoint
+
+    Args:
+        model_name: Model id (default: model.name from config.yml)
+        host: Ollama endpoint (default: model.host from config.yml)
+    """
+    config = get_config()
+    return SharedClientOllama(
+        id=model_name or config.get_model_name(),
+        # Key of the registry clients, requests go through them
+        host=host,
+        api_key=config.get_model_api_key(),
+        options={"temperature": config.get_model_temperature()}
+    )
+
+
+def create_model(model_name: Optional[str] = None, host: Optional[str] = None) -> Model:
+    """
+    Create the model of the backend selected by model.provider in config.yml
+
+    Args:
+        model_name: Model id (default: model.name from config.yml)
+        host: Ollama endpoint of the ollama backend (default: model.host from config.yml)
+
+    Raises:
+        ValueError: If the provider is unknown
+    """
+    config = get_config()
+    provider = config.get_model_provider()
+    model_name = model_name or config.get_model_name()
+    if provider == "ollama":
+        return create_ollama_model(model_name, host)
+    if provider == "openai":
+        from agno.models.openai import OpenAIChat
+        return OpenAIChat(
+            id=model_name,
+            api_key=config.get_model_api_key() or 'ollama',
+            base_url=config.get_model_base_url(),
+            temperature=config.get_model_temperature()
+        )
+    if provider == "fake":
+        from .fake_model import FakeModel, LatencyProfile
+        return FakeModel(
+            id=f"fake:{model_name}",
+            profile=LatencyProfile(
+                config.get_fake_model_first_token_ms(),
+                config.get_fake_model_tokens_per_second(),
+                config.get_fake_model_chunk_tokens()
+            )
+        )
+    raise ValueError(f"Unknown model provider '{provider}' (expected ollama, openai or fake)")
+
+
+def _tune_sqlite_connection(dbapi_connection, connection_record):
+    """Let concurrent readers and a writer share the file without blocking each other"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=30000")
+    cursor.close()
+
+
+def get_sqlite_db(db_file: Optional[str] = None) -> SqliteDb:
+    """
+    Get the shared agno SqliteDb for a database file
+
+    Args:
+        db_file: SQLite database file (default: database.file from config.yml)
+    """
+    config = get_config()
+    db_file = db_file or config.get_database_file()
+
+    with _lock:
+        if db_file not in _sqlite_dbs:
+            engine = create_engine(
+                f"sqlite:///{db_file}",
+                pool_size=config.get_database_pool_size(),
+                max_overflow=config.get_database_pool_size(),
+                connect_args={"check_same_thread": False, "timeout": 30}
+            )
+            event.listen(engine, "connect", _tune_sqlite_connection)
+            db = SqliteDb(db_engine=engine)
+            # agno reflects the sessions table on first use; agents starting concurrent runs
+            # before that would race on the half-reflected table
+            db._get_table(table_type="sessions", create_table_if_not_found=True)
+            _sqlite_dbs[db_file] = db
+        return _sqlite_dbs[db_file]
@@ -0,0 +1,182 @@
+"""
+Response Cache for Java Migration System
+
+Persistent, content-addressed cache of model responses. Entries are keyed on
+everything that determines the model output (model, temperature, system
+message, instructions and prompt) and evicted least-recently-used once the
+configured entry count or size is exceeded. Cache hits only note their access
+time in memory; the times are written in one transaction with the next
+store, every TOUCH_BATCH hits, or on flush(), so hits never wait on a commit.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .config_loader import get_config
+
+
+class ResponseCache:
+    """SQLite-backed LRU cache of model responses"""
+
+    # Pending access times written per transaction
+    TOUCH_BATCH = 256
+
+    def __init__(self, cache_file: str, max_entries: int = 10000, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize response cache
+
+        Args:
+            cache_file: SQLite file holding cached responses
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached responses in bytes
+        """
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._conn = sqlite3.connect(cache_file, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " content TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        temperature: Any,
+        system_message: Any,
+        instructions: Any,
+        prompt: str
+    ) -> str:
+        """Build the content address for a model call"""
+        payload = json.dumps(
+            [model, temperature, system_message, instructions, prompt],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, refreshing its LRU position"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._touched[key] = time.time()
+            if len(self._touched) >= self.TOUCH_BATCH:
+                self._write_touched()
+                self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, content: str):
+        """Store a response and evict old entries if over budget"""
+        size = len(content.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, content, size, time.time())
+            )
+            self._touched.pop(key, None)
+            self._write_touched()
+            self._evict()
+            self._conn.commit()
+
+    def flush(self):
+        """Write the access times of cache hits not yet stored"""
+        with self._lock:
+            if self._touched:
+                self._write_touched()
+                self._conn.commit()
+
+    def _write_touched(self):
+        """Apply pending access times in the current transaction"""
+        self._conn.executemany(
+            "UPDATE responses SET last_access = ? WHERE key = ?",
+            [(last_access, key) for key, last_access in self._touched.items()]
+        )
+        self._touched.clear()
+
+    def _evict(self):
+        """Drop least recently used entries until within entry and size limits"""
+        entries, total_bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if entries <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+            if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            evicted.append((key,))
+            entries -= 1
+            total_bytes -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and current cache size"""
+        self.flush()
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": total_bytes
+        }
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+# Global cache instance
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get global response cache instance
+
+    Returns:
+        ResponseCache instance, or None when caching is disabled in config.yml
+    """
+    global _response_cache
+    config = get_config()
+    if not config.is_response_cache_enabled():
+        return None
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                config.get_response_cache_file(),
+                max_entries=config.get_response_cache_max_entries(),
+                max_bytes=config.get_response_cache_max_bytes()
+            )
+    return _response_cache
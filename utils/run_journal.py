@@ -0,0 +1,184 @@
+"""
+Run Journal for Java Migration System
+
+Crash-safe SQLite record of a migration run: the parameters it was started
+with, every completed phase with its result, every finished per-file task
+and the outputs staged but not yet written. Each record is committed before
+the run moves on, so a run killed at any point can be resumed from the last
+completed task instead of starting over.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+JOURNAL_FILE_NAME = ".migration_journal.db"
+
+TASK_DONE = "done"
+TASK_ERROR = "error"
+
+
+class RunJournal:
+    """SQLite journal of the phases, tasks and staged outputs of one migration run"""
+
+    VERSION = 1
+
+    def __init__(self, journal_file: str):
+        """
+        Initialize run journal
+
+        Args:
+            journal_file: SQLite file holding the journal
+        """
+        self.journal_file = journal_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(journal_file, check_same_thread=False)
+        # WAL with full sync: a record acknowledged before a crash or power loss is never lost
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS run ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS phases ("
+            " name TEXT PRIMARY KEY,"
+            " result TEXT,"
+            " completed_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " phase TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " result TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 1,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (phase, key));"
+            "CREATE TABLE IF NOT EXISTS staged_outputs ("
+            " path TEXT PRIMARY KEY,"
+            " content BLOB);"
+        )
+        self._conn.commit()
+
+    def start(self, params: Dict[str, Any]):
+        """
+        Begin a new run, dropping everything recorded for the previous one
+
+        Args:
+            params: Run parameters (source, phases, ...) needed to resume it
+        """
+        with self._lock:
+            for table in ("run", "phases", "tasks", "staged_outputs"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.executemany(
+                "INSERT INTO run (key, value) VALUES (?, ?)",
+                [
+                    ("version", json.dumps(self.VERSION)),
+                    ("params", json.dumps(params)),
+                    ("started_at", json.dumps(time.time())),
+                    ("finished", json.dumps(False)),
+                ]
+            )
+            self._conn.commit()
+
+    def _run_value(self, key: str) -> Any:
+        row = self._conn.execute("SELECT value FROM run WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def params(self) -> Optional[Dict[str, Any]]:
+        """Parameters of the recorded run (None if there is none)"""
+        with self._lock:
+            if self._run_value("version") != self.VERSION:
+                return None
+            return self._run_value("params")
+
+    def is_resumable(self) -> bool:
+        """True if a run was started and never finished"""
+        with self._lock:
+            return self._run_value("version") == self.VERSION and self._run_value("finished") is False
+
+    def finish(self):
+        """Mark the run as completed, nothing is left to resume"""
+        with self._lock:
+            self._conn.execute("UPDATE run SET value = ? WHERE key = 'finished'", (json.dumps(True),))
+            self._conn.commit()
+
+    def complete_phase(self, name: str, result: Any = None):
+        """Record a phase as completed, with the result later phases need"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO phases (name, result, completed_at) VALUES (?, ?, ?)",
+                (name, json.dumps(result, default=str), time.time())
+            )
+            self._conn.commit()
+
+    def is_phase_completed(self, name: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM phases WHERE name = ?", (name,)).fetchone() is not None
+
+    def phase_result(self, name: str) -> Any:
+        """Result of a completed phase (None if the phase is not completed)"""
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM phases WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def record_task(self, phase: str, key: str, result: Any = None, status: str = TASK_DONE):
+        """
+        Record the outcome of a task of a phase
+
+        Args:
+            phase: Phase the task belongs to
+            key: Task identifier within the phase (e.g. the source file)
+            result: JSON-serializable outcome, restored on resume
+            status: TASK_DONE, or TASK_ERROR for a task to retry on resume
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO tasks (phase, key, status, result, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (phase, key) DO UPDATE SET status = excluded.status, result = excluded.result, "
+                "attempts = attempts + 1, updated_at = excluded.updated_at",
+                (phase, key, status, json.dumps(result, default=str), time.time())
+            )
+            self._conn.commit()
+
+    def task_results(self, phase: str, status: Optional[str] = None) -> Dict[str, Any]:
+        """Task key -> recorded result of a phase, optionally only tasks with this status"""
+        query, args = "SELECT key, result FROM tasks WHERE phase = ?", [phase]
+        if status is not None:
+            query += " AND status = ?"
+            args.append(status)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY updated_at", args).fetchall()
+        return {key: json.loads(result) if result is not None else None for key, result in rows}
+
+    def progress(self) -> Dict[str, Dict[str, int]]:
+        """Phase -> task counts by status, for reporting where a run stopped"""
+        with self._lock:
+            rows = self._conn.execute("SELECT phase, status, COUNT(*) FROM tasks GROUP BY phase, status").fetchall()
+        progress: Dict[str, Dict[str, int]] = {}
+        for phase, status, count in rows:
+            progress.setdefault(phase, {})[status] = count
+        return progress
+
+    def stage_output(self, path: str, content: Optional[bytes]):
+        """Keep a staged output (None = staged deletion) until it is committed to disk"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO staged_outputs (path, content) VALUES (?, ?)", (path, content)
+            )
+            self._conn.commit()
+
+    def staged_outputs(self) -> Dict[str, Optional[bytes]]:
+        """Outputs staged and not yet committed when the run stopped"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT path, content FROM staged_outputs").fetchall())
+
+    def clear_staged_outputs(self):
+        """Forget staged outputs once they are written to disk"""
+        with self._lock:
+            self._conn.execute("DELETE FROM staged_outputs")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
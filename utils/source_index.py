@@ -0,0 +1,266 @@
+"""
+Java Source Index for Java Migration System
+
+Reads every .java file of a legacy project exactly once, in parallel worker
+processes, and extracts its package, imports, static imports, top-level
+types (with their supertypes), annotations, referenced type names and line
+count. The result is
+persisted as a JSON index under analysis.index_dir so later phases and the
+visualizer can query it without touching the source tree again. Files
+whose size and modification time are unchanged are not re-read.
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config_loader import get_config
+from .migration_manifest import IGNORED_DIRECTORIES
+
+INDEX_VERSION = 2
+
+# Below this many files to (re)index, worker processes cost more than they save
+PARALLEL_THRESHOLD = 64
+
+COMMENT_OR_LITERAL_PATTERN = re.compile(
+    r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'',
+    re.DOTALL
+)
+PACKAGE_PATTERN = re.compile(r'^\s*package\s+([\w.]+)\s*;', re.MULTILINE)
+IMPORT_PATTERN = re.compile(r'^\s*import\s+(static\s+)?([\w.]+(?:\.\*)?)\s*;', re.MULTILINE)
+STRUCTURE_PATTERN = re.compile(r'[{}]|(?<![.\w])(class|interface|enum|record|@interface)\s+(\w+)')
+ANNOTATION_PATTERN = re.compile(r'@(?!interface\b)([A-Za-z_][\w.]*)')
+GENERIC_PATTERN = re.compile(r'<[^<>]*>')
+TYPE_REFERENCE_PATTERN = re.compile(r'\b[A-Z]\w*')
+
+
+def _blank(match: re.Match) -> str:
+    """Replace a comment or literal by spaces, keeping newlines"""
+    return re.sub(r'[^\n]', ' ', match.group())
+
+
+def blank_comments_and_literals(source: str) -> str:
+    """Java source with comments and string/char literals blanked out, offsets unchanged"""
+    return COMMENT_OR_LITERAL_PATTERN.sub(_blank, source)
+
+
+def _supertypes(header: str) -> Tuple[List[str], List[str]]:
+    """Extract extends/implements lists from a type declaration header"""
+    previous = None
+    while previous != header:
+        previous, header = header, GENERIC_PATTERN.sub('', header)
+
+    def names(clause: Optional[re.Match]) -> List[str]:
+        if not clause:
+            return []
+        return [name.strip() for name in clause.group(1).split(',') if name.strip()]
+
+    extends = names(re.search(r'\bextends\s+([\w.,\s]+?)(?=\bimplements\b|$)', header))
+    implements = names(re.search(r'\bimplements\s+([\w.,\s]+)', header))
+    return extends, implements
+
+
+def index_java_file(file_path: str) -> Dict[str, Any]:
+    """
+    Index a single Java source file in one read
+
+    Args:
+        file_path: Path to the .java file
+
+    Returns:
+        Index entry with package, imports, static_imports, types, annotations,
+        type_references and line_count
+    """
+    stat = os.stat(file_path)
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        source = f.read()
+
+    code = blank_comments_and_literals(source)
+    package = PACKAGE_PATTERN.search(code)
+
+    imports, static_imports = [], []
+    for match in IMPORT_PATTERN.finditer(code):
+        (static_imports if match.group(1) else imports).append(match.group(2))
+
+    types = []
+    depth = 0
+    for match in STRUCTURE_PATTERN.finditer(code):
+        token = match.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            body_start = code.find('{', match.end())
+            header = code[match.end():body_start if body_start >= 0 else len(code)]
+            extends, implements = _supertypes(header)
+            types.append({
+                "name": match.group(2),
+                "kind": match.group(1),
+                "extends": extends,
+                "implements": implements
+            })
+
+    return {
+        "package": package.group(1) if package else "",
+        "imports": imports,
+        "static_imports": static_imports,
+        "types": types,
+        "annotations": sorted(set(ANNOTATION_PATTERN.findall(code))),
+        # Capitalized simple names used in the code, to resolve same-package and wildcard references
+        "type_references": sorted(set(TYPE_REFERENCE_PATTERN.findall(code))),
+        "line_count": source.count('\n') + (1 if source and not source.endswith('\n') else 0),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns
+    }
+
+
+class JavaSourceIndex:
+    """Persisted per-file index of a Java source tree"""
+
+    def __init__(self, source_path: str, index_file: str):
+        """
+        Initialize source index
+
+        Args:
+            source_path: Root of the legacy Java project
+            index_file: JSON file holding the index
+        """
+        self.source_path = source_path
+        self.index_file = Path(index_file)
+        self.files: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load index entries from disk"""
+        if not self.index_file.exists():
+            return {}
+
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != INDEX_VERSION:
+            return {}
+        return data.get('files', {})
+
+    def save(self):
+        """Write the index atomically"""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "root": self.source_path, "files": self.files}, f)
+        os.replace(tmp_file, self.index_file)
+
+    def refresh(self, workers: int = 0) -> 'JavaSourceIndex':
+        """
+        Re-index new and modified files, drop deleted ones and save
+
+        Args:
+            workers: Worker processes (0 = one per CPU)
+        """
+        current = {}
+        for root, dirs, names in os.walk(self.source_path):
+            dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRECTORIES)
+            for name in names:
+                if name.endswith('.java'):
+                    file_path = os.path.join(root, name)
+                    current[os.path.relpath(file_path, self.source_path)] = os.stat(file_path)
+
+        stale = [
+            rel_path for rel_path, stat in current.items()
+            if rel_path not in self.files
+            or self.files[rel_path]['size'] != stat.st_size
+            or self.files[rel_path]['mtime_ns'] != stat.st_mtime_ns
+        ]
+        removed = set(self.files) - set(current)
+        if not stale and not removed:
+            return self
+
+        for rel_path in removed:
+            del self.files[rel_path]
+
+        paths = [os.path.join(self.source_path, rel_path) for rel_path in stale]
+        if len(paths) < PARALLEL_THRESHOLD:
+            entries = [index_java_file(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=workers or None) as executor:
+                entries = list(executor.map(index_java_file, paths, chunksize=32))
+
+        self.files.update(zip(stale, entries))
+        self.save()
+        return self
+
+    def _rel(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self.source_path)
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Get the index entry of a source file (path as joined with the source root)"""
+        return self.files.get(self._rel(file_path))
+
+    def entries(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate (file path joined with the source root, entry) pairs"""
+        for rel_path, entry in sorted(self.files.items()):
+            yield os.path.join(self.source_path, rel_path), entry
+
+    def types(self) -> Dict[str, str]:
+        """Fully qualified top-level type name -> file path"""
+        types = {}
+        for file_path, entry in self.entries():
+            for declared in entry['types']:
+                fqn = f"{entry['package']}.{declared['name']}" if entry['package'] else declared['name']
+                types[fqn] = file_path
+        return types
+
+    def imports(self) -> List[str]:
+        """Distinct imports across the project"""
+        return sorted({i for entry in self.files.values() for i in entry['imports']})
+
+    def static_imports(self) -> List[str]:
+        """Distinct static imports across the project"""
+        return sorted({i for entry in self.files.values() for i in entry['static_imports']})
+
+    def files_importing(self, name: str) -> List[str]:
+        """Files importing a type (or its package with a wildcard import)"""
+        package = name.rsplit('.', 1)[0]
+        return [
+            file_path for file_path, entry in self.entries()
+            if name in entry['imports'] or f"{package}.*" in entry['imports']
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-package file, line and type counts plus the most used annotations"""
+        packages: Dict[str, Dict[str, int]] = {}
+        annotations: Dict[str, int] = {}
+        for entry in self.files.values():
+            stats = packages.setdefault(entry['package'] or '(default)', {"files": 0, "lines": 0, "types": 0})
+            stats['files'] += 1
+            stats['lines'] += entry['line_count']
+            stats['types'] += len(entry['types'])
+            for annotation in entry['annotations']:
+                annotations[annotation] = annotations.get(annotation, 0) + 1
+
+        return {
+            "files": len(self.files),
+            "lines": sum(entry['line_count'] for entry in self.files.values()),
+            "packages": dict(sorted(packages.items())),
+            "annotations": dict(sorted(annotations.items(), key=lambda item: -item[1]))
+        }
+
+
+def get_source_index(source_path: str) -> JavaSourceIndex:
+    """
+    Get the up-to-date index of a Java source tree
+
+    Args:
+        source_path: Root of the legacy Java project
+
+    Returns:
+        JavaSourceIndex refreshed against the current tree
+    """
+    config = get_config()
+    key = hashlib.sha1(os.path.abspath(source_path).encode('utf-8')).hexdigest()[:12]
+    index_file = os.path.join(config.get_source_index_dir(), f"{key}.json")
+    return JavaSourceIndex(source_path, index_file).refresh(config.get_source_index_workers())
@@ -0,0 +1,256 @@
+"""
+Telemetry for Java Migration System
+
+Records every model call made through AgentRunner (wall time, time to first
+token, prompt and completion tokens, tool calls, cache hits, early stops,
+errors) and every phase of a run (wall time, retries), attributed to the
+phase running at the time, and to the model tier that served it when model
+routing is enabled. Runs that call the agno Agent directly (identity priming,
+AgentOS chats and Team delegation) are recorded by record_agent_run, which
+doubles as an agno post-hook. The data is exported as a JSON run summary
+(`--profile`) and in the Prometheus text format (`/metrics` on AgentOS).
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+NO_PHASE = "interactive"
+
+
+@dataclass
+class CallRecord:
+    """One model call"""
+    agent: str
+    phase: str
+    wall_ms: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    tool_calls: int = 0
+    first_token_ms: Optional[float] = None
+    cache_hit: bool = False
+    stopped_early: bool = False
+    error: Optional[str] = None
+    tier: Optional[str] = None
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 1) if ordered else 0.0
+
+
+def _totals(calls: List[CallRecord]) -> Dict[str, Any]:
+    latencies = [call.wall_ms for call in calls if not call.cache_hit]
+    first_tokens = [call.first_token_ms for call in calls if call.first_token_ms is not None]
+    return {
+        "calls": len(calls),
+        "cache_hits": sum(call.cache_hit for call in calls),
+        "errors": sum(call.error is not None for call in calls),
+        "stopped_early": sum(call.stopped_early for call in calls),
+        "prompt_tokens": sum(call.prompt_tokens for call in calls),
+        "completion_tokens": sum(call.completion_tokens for call in calls),
+        "tool_calls": sum(call.tool_calls for call in calls),
+        "model_ms": round(sum(latencies), 1),
+        "p50_ms": _percentile(latencies, 0.5),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p50_first_token_ms": _percentile(first_tokens, 0.5),
+    }
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Telemetry:
+    """Per-call and per-phase measurements of a run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self.started = time.time()
+            self.calls: List[CallRecord] = []
+            self.phases: Dict[str, Dict[str, float]] = {}
+            self.retries: Dict[str, int] = {}
+            # Tier -> files routed to it and answers escalated to it after a parse failure
+            self.routing: Dict[str, Dict[str, int]] = {}
+            # Phases run one after the other, so a plain attribute (visible to worker threads) is enough
+            self.current_phase = NO_PHASE
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase; model calls made meanwhile are attributed to it"""
+        previous, self.current_phase = self.current_phase, name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                phase = self.phases.setdefault(name, {"wall_ms": 0.0, "runs": 0})
+                phase["wall_ms"] = round(phase["wall_ms"] + elapsed, 1)
+                phase["runs"] += 1
+            self.current_phase = previous
+
+    def record_call(self, record: CallRecord):
+        """Record a finished model call"""
+        with self._lock:
+            self.calls.append(record)
+
+    def record_retry(self):
+        """Count a retried model call in the current phase"""
+        with self._lock:
+            self.retries[self.current_phase] = self.retries.get(self.current_phase, 0) + 1
+
+    def record_routing(self, tier: str, escalated: bool = False, count: int = 1):
+        """Count files routed to a model tier, or escalated to it after an unparseable answer"""
+        with self._lock:
+            counts = self.routing.setdefault(tier, {"routed": 0, "escalated": 0})
+            counts["escalated" if escalated else "routed"] += count
+
+    def summary(self, include_calls: bool = False) -> Dict[str, Any]:
+        """
+        Get the run summary
+
+        Args:
+            include_calls: Include every call record
+
+        Returns:
+            Totals per phase, per agent and per model tier (and the calls themselves)
+        """
+        with self._lock:
+            calls = list(self.calls)
+            phases = {name: dict(values) for name, values in self.phases.items()}
+            retries = dict(self.retries)
+            routing = {tier: dict(counts) for tier, counts in self.routing.items()}
+
+        for name in {call.phase for call in calls} | set(retries):
+            phases.setdefault(name, {"wall_ms": 0.0, "runs": 0})
+        for name, phase in phases.items():
+            phase.update(_totals([call for call in calls if call.phase == name]))
+            phase["retries"] = retries.get(name, 0)
+
+        summary = {
+            "started_at": self.started,
+            "wall_ms": round((time.time() - self.started) * 1000, 1),
+            "totals": dict(_totals(calls), retries=sum(retries.values())),
+            "phases": phases,
+            "agents": {
+                agent: _totals([call for call in calls if call.agent == agent])
+                for agent in sorted({call.agent for call in calls})
+            },
+        }
+        tiers = {call.tier for call in calls if call.tier} | set(routing)
+        if tiers:
+            summary["tiers"] = {
+                tier: dict(
+                    _totals([call for call in calls if call.tier == tier]),
+                    **routing.get(tier, {"routed": 0, "escalated": 0})
+                )
+                for tier in sorted(tiers)
+            }
+        if include_calls:
+            summary["calls"] = [asdict(call) for call in calls]
+        return summary
+
+    def write_summary(self, path: str) -> str:
+        """Write the run summary, with every call, as JSON"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(include_calls=True), f, indent=2)
+        return path
+
+    def prometheus(self) -> str:
+        """Render the counters in the Prometheus text exposition format"""
+        with self._lock:
+            calls = list(self.calls)
+            phases = {name: dict(values) for name, values in self.phases.items()}
+            retries = dict(self.retries)
+            routing = {tier: dict(counts) for tier, counts in self.routing.items()}
+
+        groups: Dict[tuple, List[CallRecord]] = {}
+        for call in calls:
+            groups.setdefault((call.agent, call.phase), []).append(call)
+
+        metrics = [
+            ("migration_model_calls_total", "counter", "Model calls", lambda group: len(group)),
+            ("migration_model_call_errors_total", "counter", "Model calls that raised",
+             lambda group: sum(call.error is not None for call in group)),
+            ("migration_model_cache_hits_total", "counter", "Model calls served from the response cache",
+             lambda group: sum(call.cache_hit for call in group)),
+            ("migration_model_call_seconds_total", "counter", "Wall time spent in model calls",
+             lambda group: round(sum(call.wall_ms for call in group) / 1000, 3)),
+            ("migration_prompt_tokens_total", "counter", "Prompt tokens sent",
+             lambda group: sum(call.prompt_tokens for call in group)),
+            ("migration_completion_tokens_total", "counter", "Completion tokens received",
+             lambda group: sum(call.completion_tokens for call in group)),
+            ("migration_tool_calls_total", "counter", "Tool calls made by the models",
+             lambda group: sum(call.tool_calls for call in group)),
+        ]
+        lines = []
+        for name, kind, help_text, value in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (agent, phase), group in sorted(groups.items()):
+                lines.append(f'{name}{{agent="{_label(agent)}",phase="{_label(phase)}"}} {value(group)}')
+
+        lines.append("# HELP migration_retries_total Retried model calls")
+        lines.append("# TYPE migration_retries_total counter")
+        for phase, count in sorted(retries.items()):
+            lines.append(f'migration_retries_total{{phase="{_label(phase)}"}} {count}')
+        lines.append("# HELP migration_phase_seconds_total Wall time spent in each phase")
+        lines.append("# TYPE migration_phase_seconds_total counter")
+        for phase, values in sorted(phases.items()):
+            lines.append(f'migration_phase_seconds_total{{phase="{_label(phase)}"}} {round(values["wall_ms"] / 1000, 3)}')
+        if routing:
+            lines.append("# HELP migration_routed_files_total Files sent to each model tier")
+            lines.append("# TYPE migration_routed_files_total counter")
+            for kind in ("routed", "escalated"):
+                for tier, counts in sorted(routing.items()):
+                    lines.append(f'migration_routed_files_total{{tier="{_label(tier)}",reason="{kind}"}} {counts[kind]}')
+        return "\n".join(lines) + "\n"
+
+
+_telemetry = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    """Get global telemetry instance"""
+    return _telemetry
+
+
+def record_agent_run(run_output: Any, agent: Any = None, team: Any = None):
+    """
+    Record an agno run made without AgentRunner
+
+    Usable as an agno Agent or Team post-hook, so runs started by AgentOS are
+    counted like the CLI's calls.
+
+    Args:
+        run_output: agno RunOutput (or TeamRunOutput) of the run
+        agent: Agent that ran it
+        team: Team that ran it, when used as a Team post-hook
+    """
+    metrics = getattr(run_output, 'metrics', None)
+    timer = getattr(metrics, 'timer', None)
+    # Post-hooks run before agno stops the run timer, so read it while running
+    seconds = getattr(metrics, 'duration', None) or (timer.elapsed if timer else 0.0)
+    first_token = getattr(metrics, 'time_to_first_token', None)
+    tools = getattr(run_output, 'tools', None)
+    owner = agent or team
+    _telemetry.record_call(CallRecord(
+        agent=getattr(owner, 'name', None) or getattr(run_output, 'agent_name', None) or 'unknown',
+        phase=_telemetry.current_phase,
+        wall_ms=round(seconds * 1000, 1),
+        prompt_tokens=getattr(metrics, 'input_tokens', 0) or 0,
+        completion_tokens=getattr(metrics, 'output_tokens', 0) or 0,
+        tool_calls=len(tools) if isinstance(tools, list) else 0,
+        first_token_ms=round(first_token * 1000, 1) if first_token is not None else None
+    ))
@@ -0,0 +1,157 @@
+"""
+Worker Farm for Java Migration System
+
+Supervisor of the queue-backed execution mode. The orchestrator submits
+per-file migration and test jobs to the durable job queue; local worker
+processes (`java_migration_worker.py`), each owning its own agents and
+pinned to one of the configured Ollama endpoints, lease and run them.
+While the orchestrator waits for outcomes the supervisor takes back jobs
+whose lease ran out, declares workers without heartbeat dead and starts
+replacements for local workers that exited.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .config_loader import get_config
+from .job_queue import WORKER_DEAD, JobOutcome, JobQueue
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "java_migration_worker.py")
+POLL_SECONDS = 0.05
+
+
+class WorkerFarm:
+    """Local worker processes serving a job queue"""
+
+    def __init__(
+        self,
+        queue_file: str,
+        processes: Optional[int] = None,
+        model_hosts: Optional[List[str]] = None,
+        log_dir: Optional[str] = None
+    ):
+        """
+        Initialize worker farm
+
+        Args:
+            queue_file: SQLite job queue shared with the workers
+            processes: Local worker processes (default: farm.processes from config.yml)
+            model_hosts: Ollama endpoints handed out round-robin (default: farm.model_hosts)
+            log_dir: Directory of the worker logs (default: next to the queue file)
+        """
+        config = get_config()
+        self.queue = JobQueue(queue_file)
+        self.processes = processes or config.get_farm_processes()
+        self.model_hosts = model_hosts if model_hosts is not None else config.get_farm_model_hosts()
+        self.log_dir = log_dir or os.path.join(os.path.dirname(os.path.abspath(queue_file)), "worker_logs")
+        self.lease_seconds = config.get_farm_lease_seconds()
+        self.max_attempts = config.get_farm_max_attempts()
+        self.restarts_left = config.get_farm_max_restarts()
+        self._workers: Dict[str, subprocess.Popen] = {}
+        self._slots: Dict[str, int] = {}
+        self._next_check = 0.0
+
+    def start(self) -> "WorkerFarm":
+        """Reset the queue and start the local workers"""
+        self.queue.reset()
+        os.makedirs(self.log_dir, exist_ok=True)
+        for slot in range(self.processes):
+            self._spawn(slot)
+        hosts = sorted(set(self.model_hosts)) or [get_config().get_model_host() or "default endpoint"]
+        print(f"   🏭 Worker farm: {self.processes} process(es) on {', '.join(hosts)}, queue {self.queue.queue_file}")
+        return self
+
+    def _spawn(self, slot: int):
+        model_host = self.model_hosts[slot % len(self.model_hosts)] if self.model_hosts else ""
+        worker_id = f"{socket.gethostname()}:farm-{slot}:{len(self._slots)}"
+        command = [
+            sys.executable, WORKER_SCRIPT,
+            "--queue", os.path.abspath(self.queue.queue_file),
+            "--config", os.path.abspath(get_config().config_path),
+            "--worker-id", worker_id,
+        ] + (["--model-host", model_host] if model_host else [])
+        with open(os.path.join(self.log_dir, f"worker-{slot}.log"), 'a') as log:
+            self._workers[worker_id] = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+        self._slots[worker_id] = slot
+
+    def submit(self, kind: str, payload: Dict) -> int:
+        """Queue a job for the workers"""
+        return self.queue.enqueue(kind, payload, self.max_attempts)
+
+    def wait(self, job_ids: Iterable[int], timeout: Optional[float] = None) -> Dict[int, JobOutcome]:
+        """
+        Wait until at least one of the jobs is done or given up, supervising the workers meanwhile
+
+        Args:
+            job_ids: Jobs to wait for
+            timeout: Seconds to wait at most (None = until an outcome arrives)
+
+        Returns:
+            Outcomes of the finished jobs among them (empty on timeout)
+
+        Raises:
+            RuntimeError: If no worker is left to run the jobs
+        """
+        job_ids = list(job_ids)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            outcomes = self.queue.finished(job_ids)
+            if outcomes or not job_ids:
+                return outcomes
+            self.supervise()
+            if deadline is not None and time.monotonic() >= deadline:
+                return {}
+            time.sleep(POLL_SECONDS)
+
+    def supervise(self):
+        """Take back expired leases and jobs of dead workers, and replace local workers that exited"""
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + 1.0
+
+        requeued = self.queue.requeue_expired()
+        if requeued:
+            print(f"      ♻️  {requeued} job(s) requeued after their lease expired")
+        for worker_id in self.queue.reap_silent_workers(self.lease_seconds):
+            print(f"      💀 Worker {worker_id} stopped sending heartbeats, its jobs are requeued")
+
+        for worker_id, process in list(self._workers.items()):
+            if process.poll() is None:
+                continue
+            del self._workers[worker_id]
+            requeued = self.queue.unregister_worker(worker_id, WORKER_DEAD)
+            print(f"      💀 Worker {worker_id} exited with status {process.returncode}"
+                  + (f", {requeued} job(s) requeued" if requeued else ""))
+            if self.restarts_left > 0:
+                self.restarts_left -= 1
+                self._spawn(self._slots[worker_id])
+
+        if not self._workers and not self.queue.workers():
+            raise RuntimeError(f"No worker left to run the queued jobs, see the logs in {self.log_dir}")
+
+    def stop(self, timeout: float = 30.0):
+        """Ask the workers to exit once idle and wait for them"""
+        self.queue.shutdown()
+        deadline = time.monotonic() + timeout
+        for process in self._workers.values():
+            try:
+                process.wait(max(deadline - time.monotonic(), 0.1))
+            except subprocess.TimeoutExpired:
+                process.terminate()
+                process.wait()
+        self._workers = {}
+
+    def close(self):
+        self.queue.close()
+
+    def __enter__(self) -> "WorkerFarm":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        self.close()